@@ -5,17 +5,17 @@ from app.api.v1.amenities import api as amenities_ns
 from app.api.v1.places import api as places_ns
 from app.api.v1.reviews import api as reviews_ns
 from app.services import facade
-from app.persistence.repository import InMemoryRepository
 
 
 def create_app(config_class="config.DevelopmentConfig"):
     app = Flask(__name__)
     app.config.from_object(config_class)
     
-    facade.user_repo = InMemoryRepository()
-    facade.place_repo = InMemoryRepository()
-    facade.review_repo = InMemoryRepository()
-    facade.amenity_repo = InMemoryRepository()
+    if app.config.get('DATA_DIR'):
+        facade.open_store(app.config['DATA_DIR'], sync_interval=app.config.get('LOG_SYNC_INTERVAL', 0.1),
+                          snapshot_every=app.config.get('SNAPSHOT_EVERY', 100000))
+    else:
+        facade.reset()
 
 
     @app.route('/')
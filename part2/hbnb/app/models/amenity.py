@@ -1,6 +1,10 @@
+import sys
+
 from .base_model import BaseModel
 
 class Amenity(BaseModel):
+	__slots__ = ('_name',)
+
 	def __init__(self, name):
 		"""Initialize an Amenity instance."""
 		super().__init__()
@@ -20,7 +24,8 @@ class Amenity(BaseModel):
 			raise ValueError("Name must be 100 characters or less")
 		if not value:
 			raise ValueError("Name cannot be empty")
-		self._name = value
+		# Few distinct names: share one string per name
+		self._name = sys.intern(value)
 
 	def to_dict(self):
 		"""Convert the Amenity instance to a dictionary."""
@@ -1,12 +1,85 @@
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
+
+# Timestamps are stored as integer microseconds since this (naive) instant
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _format_id(key):
+    """Format a 128-bit key as the canonical UUID string."""
+    digits = f'{key:032x}'
+    return f'{digits[:8]}-{digits[8:12]}-{digits[12:16]}-{digits[16:20]}-{digits[20:]}'
+
+
+def id_key(obj_id):
+    """Return the compact key of an id, or None if it cannot be the id of a model."""
+    if not isinstance(obj_id, str) or len(obj_id) != 36:
+        return None
+    try:
+        key = int(obj_id.replace('-', ''), 16)
+    except ValueError:
+        return None
+    # int() also accepts signs, underscores, upper case or misplaced dashes
+    return key if _format_id(key) == obj_id else None
 
 
 class BaseModel:
+    """Base of the domain models.
+
+    Models use __slots__ instead of a per-instance __dict__. The id is kept
+    as a 128-bit int (`key`) and the timestamps as integer microseconds;
+    `id`, `created_at` and `updated_at` still return a UUID string and
+    datetimes. Repositories and indexes use `key`, so that the id string
+    is only built when it is read.
+    """
+    __slots__ = ('_key', '_created_at', '_updated_at')
+
     def __init__(self):
-        self.id = str(uuid.uuid4())
+        self._key = uuid.uuid4().int
         self.created_at = datetime.now()
-        self.updated_at = datetime.now()
+        self._updated_at = self._created_at
+
+    @property
+    def key(self):
+        """Compact form of the id, used as the storage key."""
+        return self._key
+
+    @property
+    def id(self):
+        return _format_id(self._key)
+
+    @id.setter
+    def id(self, value):
+        key = id_key(value)
+        if key is None:
+            raise ValueError("Id must be a UUID string")
+        self._key = key
+
+    @property
+    def created_at(self):
+        return _EPOCH + self._created_at * _MICROSECOND
+
+    @created_at.setter
+    def created_at(self, value):
+        self._created_at = (value - _EPOCH) // _MICROSECOND
+
+    @property
+    def updated_at(self):
+        return _EPOCH + self._updated_at * _MICROSECOND
+
+    @updated_at.setter
+    def updated_at(self, value):
+        self._updated_at = (value - _EPOCH) // _MICROSECOND
+
+    def __getstate__(self):
+        """Slot values by name, for pickle and the durable store."""
+        return {name: getattr(self, name) for cls in type(self).__mro__
+                for name in getattr(cls, '__slots__', ()) if hasattr(self, name)}
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
 
     def save(self):
         """Update the updated_at timestamp whenever the object is modified"""
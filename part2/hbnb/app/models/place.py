@@ -3,6 +3,9 @@ from .user import User
 from .amenity import Amenity
 
 class Place(BaseModel):
+    __slots__ = ('_title', '_description', '_price', '_latitude', '_longitude', '_owner',
+                 '_reviews', '_amenities')
+
     def __init__(self, title, description, price, latitude, longitude, owner):
         """Initialize a Place instance."""
         super().__init__()
@@ -12,8 +15,9 @@ class Place(BaseModel):
         self.latitude = latitude
         self.longitude = longitude
         self.owner = owner
-        self.reviews = []  # List to store related reviews
-        self.amenities = []  # List to store related amenities
+        # Lists of related reviews and amenities, created on first use
+        self._reviews = None
+        self._amenities = None
 
     @property
     def title(self):
@@ -100,6 +104,30 @@ class Place(BaseModel):
             raise TypeError("Owner must be a User instance")
         self._owner = user
 
+    @property
+    def reviews(self):
+        """Get the reviews of the place."""
+        if self._reviews is None:
+            self._reviews = []
+        return self._reviews
+
+    @reviews.setter
+    def reviews(self, value):
+        """Set the reviews of the place."""
+        self._reviews = value
+
+    @property
+    def amenities(self):
+        """Get the amenities of the place."""
+        if self._amenities is None:
+            self._amenities = []
+        return self._amenities
+
+    @amenities.setter
+    def amenities(self, value):
+        """Set the amenities of the place."""
+        self._amenities = value
+
     def add_review(self, review):
         """Add a review to the place."""
         from .review import Review
@@ -3,6 +3,8 @@ from .user import User
 
 class Review(BaseModel):
 	"""Review class representing a review of a place."""
+	__slots__ = ('_text', '_rating', '_place', '_user')
+
 	def __init__(self, text, rating, place, user):
 		super().__init__()
 		self.text = text
@@ -0,0 +1,33 @@
+import pickle
+import uuid
+from datetime import datetime
+from app.models.amenity import Amenity
+from app.models.base_model import id_key
+from app.models.user import User
+
+def test_compact_fields_are_exposed_unchanged():
+    user = User(first_name="John", last_name="Doe", email="john.doe@example.com")
+    assert not hasattr(user, '__dict__')
+    assert str(uuid.UUID(user.id)) == user.id
+    assert id_key(user.id) == user.key
+    assert isinstance(user.created_at, datetime)
+    assert user.updated_at == user.created_at
+    stamp = datetime(2024, 2, 29, 23, 59, 59, 999999)
+    user.updated_at = stamp
+    assert user.updated_at == stamp
+    assert pickle.loads(pickle.dumps(user)).to_dict() == user.to_dict()
+    print("Compact fields test passed!")
+
+def test_only_canonical_ids_have_a_key():
+    user = User(first_name="John", last_name="Doe", email="john.doe@example.com")
+    for other in [user.id.upper(), user.id.replace('-', ''), '{' + user.id[1:-1] + '}', 'missing', None]:
+        assert id_key(other) is None
+    print("Id key test passed!")
+
+def test_amenity_names_are_shared():
+    assert Amenity(name="".join(["Wi", "-Fi"])).name is Amenity(name="Wi-Fi").name
+    print("Amenity name test passed!")
+
+test_compact_fields_are_exposed_unchanged()
+test_only_canonical_ids_have_a_key()
+test_amenity_names_are_shared()
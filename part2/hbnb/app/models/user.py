@@ -1,6 +1,8 @@
 from .base_model import BaseModel
 
 class User(BaseModel):
+    __slots__ = ('_first_name', '_last_name', '_email', '_is_admin')
+
     def __init__(self, first_name, last_name, email, is_admin=False):
         """Initialize a User instance."""
         super().__init__()
@@ -0,0 +1,312 @@
+"""Durability for InMemoryRepository: an append-only log plus snapshots.
+
+Every change made through an attached repository is appended to the
+current log segment as a record: the object's full state (put) or its key
+(delete). Replaying a put twice is harmless, so records never need to be
+written exactly once.
+
+A snapshot pickles the state of every object of every repository into one
+file, with references between objects stored as (class, key) and restored
+as references. The states are copied when a new log segment starts; once
+the snapshot is safely on disk, the older segments are deleted. Loading
+memory-maps the snapshot, unpickles it without running the model
+constructors, then replays the segments written since.
+
+Files in the store directory:
+- snapshot.pickle: {'segment': first segment not included, 'repositories': {name: [(class, state)]}}
+- log.<n>: pickled records, one after the other
+
+Snapshots and logs are pickles: only open directories this application wrote.
+"""
+import atexit
+import gc
+import io
+import logging
+import mmap
+import os
+import pickle
+import threading
+import time
+
+from app.models.base_model import BaseModel
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FILE = 'snapshot.pickle'
+LOG_PREFIX = 'log.'
+
+
+class _RecordPickler(pickle.Pickler):
+    """Pickles a record with the model objects it references stored as their key."""
+
+    def persistent_id(self, obj):
+        if isinstance(obj, BaseModel):
+            return obj.key
+        return None
+
+
+class _RecordUnpickler(pickle.Unpickler):
+    def __init__(self, file, resolve):
+        super().__init__(file)
+        self.resolve = resolve
+
+    def persistent_load(self, key):
+        return self.resolve(key)
+
+
+class _SnapshotPickler(pickle.Pickler):
+    """Pickles object states with the model objects they reference stored as (class, key)."""
+
+    def persistent_id(self, obj):
+        if isinstance(obj, BaseModel):
+            return type(obj), obj.key
+        return None
+
+
+class _SnapshotUnpickler(pickle.Unpickler):
+    """Creates every referenced object once, empty; _read_snapshot fills them from their state."""
+
+    def __init__(self, file):
+        super().__init__(file)
+        self.objects = {}
+
+    def persistent_load(self, pid):
+        cls, key = pid
+        obj = self.objects.get(key)
+        if obj is None:
+            obj = self.objects[key] = cls.__new__(cls)
+        return obj
+
+
+def _copy_state(obj):
+    """obj.__getstate__() with its lists copied, so that later changes to obj do not show in it."""
+    return {name: list(value) if isinstance(value, list) else value
+            for name, value in obj.__getstate__().items()}
+
+
+class DurableStore:
+    """Persists a set of named InMemoryRepository instances to a directory.
+
+    sync_interval: seconds between two fsyncs of the log, done by a
+    background thread; a crash loses at most that much. 0 fsyncs after
+    every record.
+    snapshot_every: number of records after which the background thread
+    takes a snapshot (None: only when snapshot() is called).
+    """
+
+    def __init__(self, directory, sync_interval=0.1, snapshot_every=100000):
+        self.directory = directory
+        self.sync_interval = sync_interval
+        self.snapshot_every = snapshot_every
+        self._repositories = {}
+        self._lock = threading.Lock()
+        self._snapshot_lock = threading.Lock()
+        self._file = None
+        self._segment = 0
+        self._dirty = False
+        self._records = 0
+        self._replaying = False
+        self._closed = threading.Event()
+        self._thread = None
+        os.makedirs(directory, exist_ok=True)
+
+    def attach(self, name, repository):
+        """Persist `repository` under `name`; call before load()."""
+        self._repositories[name] = repository
+        repository._store = self
+        repository._store_name = name
+
+    # --- Startup ------------------------------------------------------------
+
+    def load(self):
+        """Fill the attached repositories from disk and start logging their changes."""
+        start = time.perf_counter()
+        # Loading only allocates: collections would rescan the growing heap for nothing
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            replayed = self._read()
+        finally:
+            if gc_enabled:
+                gc.enable()
+        self._records = replayed
+        self._thread = threading.Thread(target=self._background, name='hbnb-store', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+        logger.info('Loaded %s from %s in %.2fs (%d log records)',
+                    ', '.join(f'{len(repo._storage)} {name}' for name, repo in self._repositories.items()),
+                    self.directory, time.perf_counter() - start, replayed)
+
+    def _read(self):
+        first_segment = 0
+        path = os.path.join(self.directory, SNAPSHOT_FILE)
+        if os.path.exists(path) and os.path.getsize(path):
+            first_segment = self._read_snapshot(path)
+        segments = [n for n in self._segments() if n >= first_segment]
+        replayed = sum(self._replay(n) for n in segments)
+        # Never append to a segment that may end with a torn record
+        self._segment = max(segments, default=first_segment - 1) + 1
+        self._file = open(self._segment_path(self._segment), 'ab')
+        return replayed
+
+    def _read_snapshot(self, path):
+        """Load the snapshot into the attached repositories; return its first segment."""
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            unpickler = _SnapshotUnpickler(mapped)
+            snapshot = unpickler.load()
+        filled = set()
+        for name, states in snapshot['repositories'].items():
+            objects = []
+            for cls, state in states:
+                obj = unpickler.objects.get(state['_key'])
+                if obj is None:
+                    obj = cls.__new__(cls)
+                obj.__setstate__(state)
+                filled.add(obj.key)
+                objects.append(obj)
+            if name in self._repositories:
+                self._repositories[name]._load(objects)
+        missing = unpickler.objects.keys() - filled
+        if missing:
+            raise LookupError(f"Snapshot references unknown object {min(missing):x}")
+        return snapshot['segment']
+
+    def _segments(self):
+        return sorted(int(name[len(LOG_PREFIX):]) for name in os.listdir(self.directory)
+                      if name.startswith(LOG_PREFIX) and name[len(LOG_PREFIX):].isdigit())
+
+    def _segment_path(self, segment):
+        return os.path.join(self.directory, f'{LOG_PREFIX}{segment}')
+
+    def _resolve(self, key):
+        for repository in self._repositories.values():
+            obj = repository.get_by_key(key)
+            if obj is not None:
+                return obj
+        # Not a torn record: the log is inconsistent, refuse to start on it
+        raise LookupError(f"Log record references unknown object {key:x}")
+
+    def _replay(self, segment):
+        """Apply the records of one segment; return how many were read.
+
+        A torn record at the end (a crash during a write) ends the replay.
+        """
+        count = 0
+        with open(self._segment_path(segment), 'rb') as f:
+            unpickler = _RecordUnpickler(f, self._resolve)
+            self._replaying = True
+            try:
+                while True:
+                    try:
+                        name, op, payload = unpickler.load()
+                    except EOFError:
+                        break
+                    except (pickle.UnpicklingError, ValueError, TypeError, AttributeError) as e:
+                        logger.warning('Ignoring the end of %s: %s', self._segment_path(segment), e)
+                        break
+                    repository = self._repositories[name]
+                    if op == 'put':
+                        cls, state = payload
+                        obj = repository.get_by_key(state['_key'])
+                        if obj is None:
+                            obj = cls.__new__(cls)
+                            obj.__setstate__(state)
+                            repository.add(obj)
+                        else:
+                            obj.__setstate__(state)
+                            repository.reindex(obj)
+                    else:
+                        repository.delete_key(payload)
+                    count += 1
+            finally:
+                self._replaying = False
+        return count
+
+    # --- Logging ------------------------------------------------------------
+
+    def record_put(self, name, obj):
+        self._append(name, 'put', (type(obj), obj.__getstate__()))
+
+    def record_delete(self, name, key):
+        self._append(name, 'delete', key)
+
+    def _append(self, name, op, payload):
+        if self._replaying or self._file is None:
+            return
+        buffer = io.BytesIO()
+        _RecordPickler(buffer, protocol=pickle.HIGHEST_PROTOCOL).dump((name, op, payload))
+        with self._lock:
+            self._file.write(buffer.getbuffer())
+            self._records += 1
+            if self.sync_interval:
+                self._dirty = True
+            else:
+                self._sync()
+
+    def _sync(self):
+        """Write the buffered records to disk. Caller holds the lock."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._dirty = False
+
+    def flush(self):
+        with self._lock:
+            if self._file is not None:
+                self._sync()
+
+    def _background(self):
+        while not self._closed.wait(self.sync_interval or 1):
+            if self._dirty:
+                self.flush()
+            if self.snapshot_every and self._records >= self.snapshot_every:
+                try:
+                    self.snapshot()
+                except Exception:
+                    logger.exception('Snapshot of %s failed; the log still has every record', self.directory)
+
+    # --- Snapshots ----------------------------------------------------------
+
+    def snapshot(self):
+        """Write every object to a new snapshot and delete the log segments it covers.
+
+        Writers are only blocked while the segment is switched and the object
+        states are copied. Request threads keep changing the objects while
+        the copies are dumped; those changes go to the new segment and are
+        replayed over the snapshot.
+        """
+        with self._snapshot_lock:
+            with self._lock:
+                self._sync()
+                self._file.close()
+                self._segment += 1
+                self._file = open(self._segment_path(self._segment), 'ab')
+                self._records = 0
+                states = {name: [(type(obj), _copy_state(obj)) for obj in repo._storage.values()]
+                          for name, repo in self._repositories.items()}
+            self._write_snapshot(self._segment, states)
+            for segment in self._segments():
+                if segment < self._segment:
+                    os.remove(self._segment_path(segment))
+
+    def _write_snapshot(self, segment, states):
+        path = os.path.join(self.directory, SNAPSHOT_FILE)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            _SnapshotPickler(f, protocol=pickle.HIGHEST_PROTOCOL).dump(
+                {'segment': segment, 'repositories': states})
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def close(self):
+        """Flush the log and stop the background thread."""
+        self._closed.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        with self._lock:
+            if self._file is not None:
+                self._sync()
+                self._file.close()
+                self._file = None
+        atexit.unregister(self.close)
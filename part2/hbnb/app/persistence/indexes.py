@@ -0,0 +1,161 @@
+"""Secondary indexes kept by InMemoryRepository.
+
+HashIndex answers `attr == value` in O(1). SortedIndex answers
+`low <= attr <= high` in O(log n + k): its entries are kept sorted in
+chunks of at most 2 * CHUNK_SIZE, so an insert or delete only shifts one
+chunk instead of the whole list.
+
+Both remember the value each object was indexed under, so an object can
+be removed or re-indexed after its attribute has changed. Objects are
+identified by their compact `key`.
+"""
+from bisect import bisect_left, insort
+
+# Target number of entries per SortedIndex chunk
+CHUNK_SIZE = 1000
+
+_MISSING = object()
+
+
+class HashIndex:
+    """Maps an attribute value to the objects having it, in insertion order."""
+
+    def __init__(self):
+        # value -> obj, or {obj key: obj} once several objects share the value
+        # (most indexed values, like emails, are unique: a dict each would
+        # cost more than the object)
+        self._buckets = {}
+        # obj key -> indexed value
+        self._values = {}
+
+    def __len__(self):
+        return len(self._values)
+
+    def indexed_value(self, obj):
+        return self._values.get(obj.key, _MISSING)
+
+    def clear(self):
+        self._buckets.clear()
+        self._values.clear()
+
+    def add(self, value, obj):
+        self._values[obj.key] = value
+        bucket = self._buckets.get(value)
+        if bucket is None:
+            self._buckets[value] = obj
+        elif isinstance(bucket, dict):
+            bucket[obj.key] = obj
+        else:
+            self._buckets[value] = {bucket.key: bucket, obj.key: obj}
+
+    def remove(self, obj):
+        value = self._values.pop(obj.key, _MISSING)
+        if value is _MISSING:
+            return
+        bucket = self._buckets[value]
+        if not isinstance(bucket, dict):
+            del self._buckets[value]
+            return
+        del bucket[obj.key]
+        if len(bucket) == 1:
+            self._buckets[value] = next(iter(bucket.values()))
+
+    def get(self, value):
+        """Return the objects whose attribute equals value."""
+        bucket = self._buckets.get(value)
+        if bucket is None:
+            return []
+        return list(bucket.values()) if isinstance(bucket, dict) else [bucket]
+
+    def first(self, value):
+        bucket = self._buckets.get(value)
+        return next(iter(bucket.values())) if isinstance(bucket, dict) else bucket
+
+
+class SortedIndex:
+    """Keeps (value, obj key, obj) entries sorted for range lookups.
+
+    Objects whose value is None are not indexed: None does not compare with
+    numbers or strings. Keys are unique, so objects are never compared.
+    """
+
+    def __init__(self, chunk_size=CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        # Sorted chunks of (value, obj key, obj); _maxes[i] is the last entry of _chunks[i]
+        self._chunks = []
+        self._maxes = []
+        # obj key -> indexed value
+        self._values = {}
+
+    def __len__(self):
+        return len(self._values)
+
+    def indexed_value(self, obj):
+        return self._values.get(obj.key)
+
+    def clear(self):
+        self._chunks = []
+        self._maxes = []
+        self._values = {}
+
+    def add(self, value, obj):
+        if value is None:
+            return
+        entry = (value, obj.key, obj)
+        self._values[obj.key] = value
+        if not self._chunks:
+            self._chunks.append([entry])
+            self._maxes.append(entry)
+            return
+        i = min(bisect_left(self._maxes, entry), len(self._chunks) - 1)
+        chunk = self._chunks[i]
+        insort(chunk, entry)
+        self._maxes[i] = chunk[-1]
+        if len(chunk) > 2 * self.chunk_size:
+            self._chunks[i:i + 1] = [chunk[:self.chunk_size], chunk[self.chunk_size:]]
+            self._maxes[i:i + 1] = [chunk[self.chunk_size - 1], chunk[-1]]
+
+    def add_many(self, pairs):
+        """Index (value, obj) pairs; into an empty index this is one sort instead of n inserts."""
+        if self._values:
+            for value, obj in pairs:
+                self.add(value, obj)
+            return
+        entries = [(value, obj.key, obj) for value, obj in pairs if value is not None]
+        entries.sort()
+        self._values = {obj_key: value for value, obj_key, _ in entries}
+        self._chunks = [entries[i:i + self.chunk_size] for i in range(0, len(entries), self.chunk_size)]
+        self._maxes = [chunk[-1] for chunk in self._chunks]
+
+    def remove(self, obj):
+        value = self._values.pop(obj.key, None)
+        if value is None:
+            return
+        # (value, key) sorts right before (value, key, obj)
+        key = (value, obj.key)
+        i = bisect_left(self._maxes, key)
+        chunk = self._chunks[i]
+        del chunk[bisect_left(chunk, key)]
+        if chunk:
+            self._maxes[i] = chunk[-1]
+        else:
+            del self._chunks[i]
+            del self._maxes[i]
+
+    def range(self, low=None, high=None):
+        """Yield the objects with low <= value <= high in value order; None bounds are open."""
+        chunks = self._chunks
+        if low is None:
+            i, j = 0, 0
+        else:
+            # (low,) sorts before every (low, key, obj)
+            i = bisect_left(self._maxes, (low,))
+            j = bisect_left(chunks[i], (low,)) if i < len(chunks) else 0
+        while i < len(chunks):
+            chunk = chunks[i]
+            for k in range(j, len(chunk)):
+                value, _, obj = chunk[k]
+                if high is not None and value > high:
+                    return
+                yield obj
+            i, j = i + 1, 0
@@ -1,4 +1,8 @@
 from abc import ABC, abstractmethod
+from itertools import islice
+
+from app.models.base_model import id_key
+from app.persistence.indexes import HashIndex, SortedIndex
 
 class Repository(ABC):
     @abstractmethod
@@ -27,14 +31,58 @@ class Repository(ABC):
 
 
 class InMemoryRepository(Repository):
-    def __init__(self):
+    """Dict-backed repository with optional secondary indexes.
+
+    `indexes` names attributes looked up by equality (e.g. 'email'):
+    get_by_attribute and get_all_by_attribute on them are O(1).
+    `sorted_indexes` names attributes queried by range (e.g. 'price'):
+    get_range on them is O(log n + k). Indexes are kept up to date by
+    add, update and delete; call reindex(obj) after changing an attribute
+    of a stored object directly.
+
+    Objects are stored under their compact `key` rather than their id
+    string; get and delete take the id string.
+
+    Attached to a DurableStore (app.persistence.durable), the repository
+    also logs every change so that it survives a restart.
+    """
+
+    def __init__(self, indexes=(), sorted_indexes=()):
         self._storage = {}
+        self._indexes = {attr: HashIndex() for attr in indexes}
+        self._sorted_indexes = {attr: SortedIndex() for attr in sorted_indexes}
+        # Set by DurableStore.attach
+        self._store = None
+        self._store_name = None
+
+    def _all_indexes(self):
+        return [*self._indexes.items(), *self._sorted_indexes.items()]
 
     def add(self, obj):
-        self._storage[obj.id] = obj
+        if obj.key in self._storage:
+            self._unindex(self._storage[obj.key])
+        self._storage[obj.key] = obj
+        for attr, index in self._all_indexes():
+            index.add(getattr(obj, attr), obj)
+        if self._store is not None:
+            self._store.record_put(self._store_name, obj)
+
+    def _load(self, objects):
+        """Replace the content with objects read from a snapshot, without logging them."""
+        self._storage = {obj.key: obj for obj in objects}
+        for attr, index in self._indexes.items():
+            index.clear()
+            for obj in objects:
+                index.add(getattr(obj, attr), obj)
+        for attr, index in self._sorted_indexes.items():
+            index.clear()
+            index.add_many((getattr(obj, attr), obj) for obj in objects)
 
     def get(self, obj_id):
-        return self._storage.get(obj_id)
+        return self._storage.get(id_key(obj_id))
+
+    def get_by_key(self, key):
+        return self._storage.get(key)
 
     def get_all(self):
         return list(self._storage.values())
@@ -43,11 +91,49 @@ class InMemoryRepository(Repository):
         obj = self.get(obj_id)
         if obj:
             obj.update(data)
+            self.reindex(obj)
+
+    def reindex(self, obj):
+        """Record a change made to obj: move it in the indexes whose attribute changed and log it."""
+        for attr, index in self._all_indexes():
+            value = getattr(obj, attr)
+            if index.indexed_value(obj) != value:
+                index.remove(obj)
+                index.add(value, obj)
+        if self._store is not None:
+            self._store.record_put(self._store_name, obj)
+
+    def _unindex(self, obj):
+        for _, index in self._all_indexes():
+            index.remove(obj)
 
     def delete(self, obj_id):
-        if obj_id in self._storage:
-            del self._storage[obj_id]
+        self.delete_key(id_key(obj_id))
+
+    def delete_key(self, key):
+        if key in self._storage:
+            self._unindex(self._storage.pop(key))
+            if self._store is not None:
+                self._store.record_delete(self._store_name, key)
 
     def get_by_attribute(self, attr_name, attr_value):
-        return next((obj for obj in self._storage.values() if getattr(obj, attr_name) == attr_value), None)
-    
\ No newline at end of file
+        index = self._indexes.get(attr_name)
+        if index is not None:
+            return index.first(attr_value)
+        return next(iter(self.get_all_by_attribute(attr_name, attr_value, limit=1)), None)
+
+    def get_all_by_attribute(self, attr_name, attr_value, limit=None):
+        """Return the objects whose attribute equals attr_value, in insertion order."""
+        index = self._indexes.get(attr_name)
+        if index is not None:
+            return index.get(attr_value)[:limit]
+        return list(islice((obj for obj in self._storage.values() if getattr(obj, attr_name) == attr_value), limit))
+
+    def get_range(self, attr_name, low=None, high=None):
+        """Return the objects with low <= attribute <= high, sorted by the attribute.
+
+        attr_name must be one of the sorted indexes; a None bound is open.
+        """
+        if attr_name not in self._sorted_indexes:
+            raise ValueError(f"No sorted index on '{attr_name}'")
+        return list(self._sorted_indexes[attr_name].range(low, high))
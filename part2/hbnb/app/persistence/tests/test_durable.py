@@ -0,0 +1,98 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from app.persistence.durable import DurableStore
+from app.services.facade import HBnBFacade
+
+
+class TestDurableStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.facade = HBnBFacade()
+        self.facade.open_store(self.directory, sync_interval=0, snapshot_every=None)
+        self.owner = self.facade.create_user({'first_name': 'Alice', 'last_name': 'Smith',
+                                              'email': 'alice@example.com'})
+        self.wifi = self.facade.create_amenity({'name': 'Wifi'})
+        self.place = self.facade.create_place({'title': 'Loft', 'price': 120, 'latitude': 48.85,
+                                               'longitude': 2.35, 'owner_id': self.owner.id,
+                                               'amenities': [self.wifi.id]})
+
+    def tearDown(self):
+        self.facade.reset()
+        shutil.rmtree(self.directory)
+
+    def _restart(self):
+        self.facade.reset()
+        restarted = HBnBFacade()
+        restarted.open_store(self.directory, sync_interval=0, snapshot_every=None)
+        self.addCleanup(restarted.reset)
+        return restarted
+
+    def _assert_same_content(self, restarted):
+        place = restarted.get_place(self.place.id)
+        self.assertEqual(place.title, 'Loft')
+        # References come back as the objects of the other repositories, not copies
+        self.assertIs(place.owner, restarted.get_user(self.owner.id))
+        self.assertIs(place.amenities[0], restarted.get_amenity(self.wifi.id))
+        self.assertIs(restarted.get_user_by_email('alice@example.com'), place.owner)
+        self.assertEqual(restarted.get_places_by_price(100, 150), [place])
+
+    def test_changes_survive_a_restart_through_the_log(self):
+        self.facade.update_place(self.place.id, {'title': 'Loft', 'price': 90})
+        review = self.facade.create_review({'text': 'Nice', 'rating': 5, 'user_id': self.owner.id,
+                                            'place_id': self.place.id})
+        self.facade.delete_review(review.id)
+
+        restarted = self._restart()
+        self.assertEqual(restarted.get_places_by_price(80, 100), [restarted.get_place(self.place.id)])
+        self.assertEqual(restarted.get_all_reviews(), [])
+
+    def test_snapshot_then_log(self):
+        self.facade.store.snapshot()
+        self.facade.update_amenity(self.wifi.id, {'name': 'Fiber'})
+        self.assertEqual(len([name for name in os.listdir(self.directory) if name.startswith('log.')]), 1)
+
+        restarted = self._restart()
+        self._assert_same_content(restarted)
+        self.assertEqual(restarted.get_amenity(self.wifi.id).name, 'Fiber')
+
+    def test_snapshot_writes_the_states_copied_at_the_switch(self):
+        store = self.facade.store
+        write = store._write_snapshot
+
+        def change_then_write(*args):
+            # A request thread changing the place, without logging it yet, during the dump
+            self.place.amenities.append(self.facade.create_amenity({'name': 'Pool'}))
+            self.place.title = 'Changed'
+            write(*args)
+
+        with patch.object(store, '_write_snapshot', side_effect=change_then_write):
+            store.snapshot()
+        restarted = self._restart()
+        self._assert_same_content(restarted)
+        self.assertEqual(len(restarted.get_place(self.place.id).amenities), 1)
+        self.assertEqual(sorted(a.name for a in restarted.get_all_amenities()), ['Pool', 'Wifi'])
+
+    def test_torn_record_at_the_end_is_ignored(self):
+        self.facade.store.snapshot()
+        self.facade.update_amenity(self.wifi.id, {'name': 'Fiber'})
+        path = os.path.join(self.directory, f'log.{self.facade.store._segment}')
+        with open(path, 'r+b') as f:
+            f.truncate(os.path.getsize(path) - 5)
+
+        restarted = self._restart()
+        self._assert_same_content(restarted)
+        self.assertEqual(restarted.get_amenity(self.wifi.id).name, 'Wifi')
+        # New records go to a fresh segment, not after the torn one
+        restarted.update_amenity(self.wifi.id, {'name': 'Fast wifi'})
+        self.assertEqual(self._restart().get_amenity(self.wifi.id).name, 'Fast wifi')
+
+    def test_unattached_store_only_loads(self):
+        self.facade.store.snapshot()
+        store = DurableStore(self.directory)
+        store.load()
+        store.close()
+        self.assertEqual(self._restart().get_all_places()[0].id, self.place.id)
@@ -0,0 +1,98 @@
+import random
+import unittest
+from app.models.place import Place
+from app.models.user import User
+from app.persistence.indexes import SortedIndex
+from app.persistence.repository import InMemoryRepository
+from app.services.facade import HBnBFacade
+
+
+def make_place(owner, price, latitude=0.0, longitude=0.0):
+    return Place(title="Place", description="", price=price, latitude=latitude, longitude=longitude, owner=owner)
+
+
+class TestInMemoryRepositoryIndexes(unittest.TestCase):
+
+    def setUp(self):
+        self.owner = User(first_name="Alice", last_name="Smith", email="alice@example.com")
+
+    def test_hash_index_follows_add_update_and_delete(self):
+        repo = InMemoryRepository(indexes=('email',))
+        repo.add(self.owner)
+        self.assertIs(repo.get_by_attribute('email', 'alice@example.com'), self.owner)
+
+        repo.update(self.owner.id, {'email': 'alice@work.example.com'})
+        self.assertIsNone(repo.get_by_attribute('email', 'alice@example.com'))
+        self.assertIs(repo.get_by_attribute('email', 'alice@work.example.com'), self.owner)
+
+        repo.delete(self.owner.id)
+        self.assertIsNone(repo.get_by_attribute('email', 'alice@work.example.com'))
+        self.assertEqual(repo.get_all_by_attribute('email', 'alice@work.example.com'), [])
+
+    def test_unindexed_attributes_are_scanned(self):
+        repo = InMemoryRepository()
+        bob = User(first_name="Bob", last_name="Smith", email="bob@example.com")
+        repo.add(self.owner)
+        repo.add(bob)
+        self.assertIs(repo.get_by_attribute('last_name', 'Smith'), self.owner)
+        self.assertEqual(repo.get_all_by_attribute('last_name', 'Smith'), [self.owner, bob])
+        with self.assertRaises(ValueError):
+            repo.get_range('last_name', 'A', 'Z')
+
+    def test_range_matches_a_full_scan(self):
+        repo = InMemoryRepository(sorted_indexes=('price',))
+        # Small chunks so that chunks get split and emptied
+        repo._sorted_indexes['price'] = SortedIndex(chunk_size=4)
+        rng = random.Random(42)
+        places = []
+        for _ in range(300):
+            place = make_place(self.owner, rng.randint(0, 50))
+            repo.add(place)
+            places.append(place)
+        for place in rng.sample(places, 100):
+            repo.update(place.id, {'price': rng.randint(0, 50)})
+        for place in rng.sample(places, 100):
+            repo.delete(place.id)
+
+        for low, high in [(None, None), (10, 20), (None, 5), (45, None), (20, 20), (51, 60)]:
+            expected = sorted((place for place in repo.get_all()
+                               if (low is None or place.price >= low) and (high is None or place.price <= high)),
+                              key=lambda place: (place.price, place.id))
+            self.assertEqual(repo.get_range('price', low, high), expected)
+
+    def test_reindex_after_a_direct_change(self):
+        repo = InMemoryRepository(sorted_indexes=('price',))
+        place = make_place(self.owner, 100)
+        repo.add(place)
+        place.price = 10
+        repo.reindex(place)
+        self.assertEqual(repo.get_range('price', 0, 50), [place])
+        self.assertEqual(repo.get_range('price', 51), [])
+
+
+class TestFacadeIndexedQueries(unittest.TestCase):
+
+    def setUp(self):
+        self.facade = HBnBFacade()
+        self.owner = self.facade.create_user({'first_name': 'Alice', 'last_name': 'Smith',
+                                              'email': 'alice@example.com'})
+
+    def _place(self, price, latitude, longitude):
+        return self.facade.create_place({'title': 'Place', 'price': price, 'latitude': latitude,
+                                         'longitude': longitude, 'owner_id': self.owner.id})
+
+    def test_places_by_price_and_area(self):
+        paris = self._place(120, 48.85, 2.35)
+        lyon = self._place(80, 45.76, 4.84)
+        self._place(200, 40.71, -74.0)
+        self.assertEqual(self.facade.get_places_by_price(50, 150), [lyon, paris])
+        self.assertEqual(self.facade.get_places_in_area(45, 50, 0, 5), [lyon, paris])
+
+    def test_reviews_by_place(self):
+        place = self._place(120, 48.85, 2.35)
+        other = self._place(80, 45.76, 4.84)
+        review = self.facade.create_review({'text': 'Nice', 'rating': 5, 'user_id': self.owner.id,
+                                            'place_id': place.id})
+        self.facade.create_review({'text': 'Fine', 'rating': 3, 'user_id': self.owner.id, 'place_id': other.id})
+        self.assertEqual(self.facade.get_reviews_by_place(place.id), [review])
+        self.assertEqual(self.facade.get_reviews_by_place('missing'), [])
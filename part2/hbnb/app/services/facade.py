@@ -1,3 +1,4 @@
+from app.persistence.durable import DurableStore
 from app.persistence.repository import InMemoryRepository
 from app.models.user import User
 from app.models.amenity import Amenity
@@ -7,11 +8,28 @@ from app.models.place import Place
 
 class HBnBFacade:
     def __init__(self):
-        self.user_repo = InMemoryRepository()
-        self.place_repo = InMemoryRepository()
-        self.review_repo = InMemoryRepository()
+        self.store = None
+        self.reset()
+
+    def reset(self):
+        """Start over with empty repositories, detached from any store."""
+        if self.store is not None:
+            self.store.close()
+            self.store = None
+        self.user_repo = InMemoryRepository(indexes=('email',))
+        self.place_repo = InMemoryRepository(sorted_indexes=('price', 'latitude'))
+        self.review_repo = InMemoryRepository(indexes=('place',))
         self.amenity_repo = InMemoryRepository()
 
+    def open_store(self, directory, **options):
+        """Load the repositories from `directory` and persist their changes there (see DurableStore)."""
+        self.reset()
+        self.store = DurableStore(directory, **options)
+        for name, repo in (('users', self.user_repo), ('amenities', self.amenity_repo),
+                           ('places', self.place_repo), ('reviews', self.review_repo)):
+            self.store.attach(name, repo)
+        self.store.load()
+
     def create_user(self, user_data):
         user = User(**user_data)
         self.user_repo.add(user)
@@ -71,6 +89,15 @@ class HBnBFacade:
     def get_all_places(self):
         return self.place_repo.get_all()
 
+    def get_places_by_price(self, min_price=None, max_price=None):
+        """Get the places priced between min_price and max_price, cheapest first."""
+        return self.place_repo.get_range('price', min_price, max_price)
+
+    def get_places_in_area(self, min_latitude, max_latitude, min_longitude, max_longitude):
+        """Get the places inside a latitude/longitude box, sorted by latitude."""
+        return [place for place in self.place_repo.get_range('latitude', min_latitude, max_latitude)
+                if min_longitude <= place.longitude <= max_longitude]
+
     def update_place(self, place_id, place_data):
         place = self.get_place(place_id)
         if not place:
@@ -97,6 +124,7 @@ class HBnBFacade:
                 if not amenity:
                     raise ValueError(f"Amenity with ID '{amenity_id}' does not exist")
                 place.add_amenity(amenity)
+            self.place_repo.reindex(place)
 
         return place
 
@@ -124,10 +152,10 @@ class HBnBFacade:
         return self.review_repo.get_all()
 
     def get_reviews_by_place(self, place_id):
-        return [
-            review for review in self.review_repo.get_all()
-            if review.place.id == place_id
-        ]
+        place = self.get_place(place_id)
+        if not place:
+            return []
+        return self.review_repo.get_all_by_attribute('place', place)
 
     def update_review(self, review_id, review_data):
         review = self.get_review(review_id)
@@ -0,0 +1,57 @@
+"""Measure the memory used per object by the in-memory backend.
+
+Creates `count` users, amenities, places (each with 3 amenities) and
+reviews through the facade, and reports the bytes allocated per object of
+each kind: the model itself, its attribute values and its repository and
+index entries. Users and amenities referenced by places and reviews are
+counted with their own kind.
+
+Usage: python -m benchmarks.bench_memory [count]
+"""
+import gc
+import random
+import sys
+import tracemalloc
+
+from app.services.facade import HBnBFacade
+
+WORDS = ['apartment', 'house', 'studio', 'loft', 'villa', 'cozy', 'bright', 'quiet', 'central', 'garden']
+AMENITY_NAMES = ['Wifi', 'Pool', 'Parking', 'Kitchen', 'Air conditioning', 'Washer', 'Heating', 'TV']
+
+
+def measure(label, count, create):
+    """Run create(i) for i in range(count) and print the bytes allocated per call."""
+    gc.collect()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [create(i) for i in range(count)]
+    gc.collect()
+    # The list holding the results is not part of the backend
+    allocated = tracemalloc.get_traced_memory()[0] - before - sys.getsizeof(objects)
+    print(f'{label:<10} {allocated / count:>8.0f} bytes/object')
+    return objects
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    rng = random.Random(42)
+    facade = HBnBFacade()
+    tracemalloc.start()
+    print(f'{count} objects of each kind')
+
+    users = measure('users', count, lambda i: facade.create_user({
+        'first_name': rng.choice(WORDS).title(), 'last_name': rng.choice(WORDS).title(),
+        'email': f'user{i}@example.com'}))
+    amenities = measure('amenities', count, lambda i: facade.create_amenity({
+        'name': AMENITY_NAMES[i % len(AMENITY_NAMES)]}))
+    places = measure('places', count, lambda i: facade.create_place({
+        'title': f'{rng.choice(WORDS).title()} {rng.choice(WORDS)}', 'description': '',
+        'price': rng.randint(20, 500), 'latitude': rng.uniform(-85, 85), 'longitude': rng.uniform(-180, 180),
+        'owner_id': users[i].id, 'amenities': [amenity.id for amenity in rng.sample(amenities, 3)]}))
+    measure('reviews', count, lambda i: facade.create_review({
+        'text': f'Very {rng.choice(WORDS)}', 'rating': rng.randint(1, 5),
+        'user_id': users[rng.randrange(count)].id, 'place_id': places[i].id}))
+    tracemalloc.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -3,12 +3,19 @@ import os
 class Config:
     SECRET_KEY = os.getenv('SECRET_KEY', 'default_secret_key')
     DEBUG = False
+    # Directory where the repositories are persisted (log + snapshots); unset keeps them in memory only
+    DATA_DIR = os.getenv('HBNB_DATA_DIR')
+    # Seconds between two fsyncs of the log (0: after every change)
+    LOG_SYNC_INTERVAL = float(os.getenv('HBNB_LOG_SYNC_INTERVAL', '0.1'))
+    # Log records after which a snapshot is taken
+    SNAPSHOT_EVERY = int(os.getenv('HBNB_SNAPSHOT_EVERY', '100000'))
 
 class DevelopmentConfig(Config):
     DEBUG = True
 
 class TestingConfig(Config):
     TESTING = True
+    DATA_DIR = None
     
 config = {
     'development': DevelopmentConfig,
@@ -1,12 +1,14 @@
 from flask import Flask, redirect
 from flask_restx import Api
-from app.extensions import db, bcrypt, jwt
+from app.extensions import db, bcrypt, jwt, metrics, password_hasher, query_detector
 from app.api.v1.users import api as users_ns
 from app.api.v1.amenities import api as amenities_ns
 from app.api.v1.places import api as places_ns
 from app.api.v1.reviews import api as reviews_ns
 from app.api.v1.auth import api as auth_ns
 from app.services import facade
+from app.commands import hbnb_cli
+from app.persistence.pragmas import apply_sqlite_pragmas
 
 def create_app(config_class="config.DevelopmentConfig"):
 
@@ -14,9 +16,18 @@ def create_app(config_class="config.DevelopmentConfig"):
     app.config.from_object(config_class)
 
     db.init_app(app)
+    with app.app_context():
+        apply_sqlite_pragmas(db.engine, app.config.get('SQLITE_PRAGMAS'))
+    metrics.init_app(app)
+    query_detector.init_app(app)
 
     bcrypt.init_app(app)
+    password_hasher.init_app(app)
     jwt.init_app(app)
+    facade.init_revocations(app.config)
+    jwt.token_in_blocklist_loader(lambda jwt_header, jwt_payload: facade.is_token_revoked(jwt_payload))
+    facade.init_cache(app.config)
+    app.cli.add_command(hbnb_cli)
 
     @app.route('/')
     def index():
@@ -1,6 +1,12 @@
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import jwt_required, get_jwt
 from app.services import facade
+from app.api.v1.pagination import pagination_parser, get_page_args
+from app.api.v1.batch import batch_response, get_ids, ids_parser
+from app.api.v1.conditional import collection_validators, entity_validators, not_modified, validator_headers
+from app.api.v1.fieldsets import fields_parser, get_fields, select_fields, sparse_serializer
+from app.api.v1.serialization import RowSerializer, json_response
+from app.api.v1.streaming import negotiate_encoding, stream_json_list, stream_requested
 
 api = Namespace('amenities', description='Amenity operations')
 
@@ -9,6 +15,9 @@ amenity_model = api.model('Amenity', {
     'name': fields.String(required=True, description='Name of the amenity')
 })
 
+# Amenity.to_dict(), encoded from rows by the list endpoint (and the place list)
+AMENITY_SERIALIZER = RowSerializer(('id', 'name', 'created_at', 'updated_at'))
+
 @api.route('/')
 class AmenityList(Resource):
     @api.expect(amenity_model)
@@ -31,22 +40,60 @@ class AmenityList(Resource):
             return {'error': str(e)}, 400
         return {'id': amenity.id, 'name': amenity.name}, 201
 
+    @api.expect(pagination_parser, fields_parser, ids_parser)
     @api.response(200, 'List of amenities retrieved successfully')
+    @api.response(400, 'Invalid pagination, fields or ids parameters')
     def get(self):
-        """Retrieve a list of all amenities"""
-        ameneties = facade.get_all_amenities()
-        return {'amenities': [amenity.to_dict() for amenity in ameneties]}, 200
+        """Retrieve a list of all amenities, or one page of it with ?limit=&cursor="""
+        page_args = get_page_args()
+        try:
+            serializer = sparse_serializer(AMENITY_SERIALIZER)
+            ids = get_ids()
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        stream = stream_requested() and ids is None
+        encoding = negotiate_encoding() if stream else None
+        etag, last_modified = collection_validators(facade.get_collection_stats('amenities'), variant=encoding)
+        cached = not_modified(etag, last_modified)
+        if cached:
+            return cached
+        headers = validator_headers(etag, last_modified)
+        if ids is not None:
+            return batch_response('amenities', *facade.get_many('amenities', ids), serializer.keys, headers)
+        if stream:
+            return stream_json_list(facade.iter_rows('amenities', serializer.columns), serializer.encode, encoding,
+                                    key='amenities', headers=headers, encoded=True)
+        if page_args is None:
+            amenities = facade.get_rows('amenities', serializer.columns)
+            return json_response(serializer.encode_list(amenities, key='amenities'), headers=headers)
+        try:
+            amenities, next_cursor = facade.get_rows_page('amenities', serializer.columns, *page_args)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        return json_response(serializer.encode_list(amenities, key='amenities', next_cursor=next_cursor),
+                             headers=headers)
 
 @api.route('/<amenity_id>')
 class AmenityResource(Resource):
+    @api.expect(fields_parser)
     @api.response(200, 'Amenity details retrieved successfully')
+    @api.response(400, 'Invalid fields parameter')
     @api.response(404, 'Amenity not found')
     def get(self, amenity_id):
         """Get amenity details by ID"""
+        try:
+            selected = get_fields(('id', 'name'))
+        except ValueError as e:
+            return {'error': str(e)}, 400
         amenity = facade.get_amenity(amenity_id)
         if not amenity:
             return {'error': 'Amenity not found'}, 404
-        return {'id': amenity.id, 'name': amenity.name}, 200
+        etag, last_modified = entity_validators(amenity, variant=selected and ','.join(selected))
+        cached = not_modified(etag, last_modified)
+        if cached:
+            return cached
+        return (select_fields({'id': amenity.id, 'name': amenity.name}, selected),
+                200, validator_headers(etag, last_modified))
 
     @api.expect(amenity_model)
     @api.response(200, 'Amenity updated successfully')
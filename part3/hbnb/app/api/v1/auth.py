@@ -1,5 +1,5 @@
 from flask_restx import Namespace, Resource, fields
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
+from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity, get_jwt
 from app.services import facade
 
 api = Namespace('auth', description='Authentication operations')
@@ -17,11 +17,10 @@ class Login(Resource):
         """Authenticate user and return a JWT token"""
         credentials = api.payload  # Get the email and password from the request payload
         
-        # Step 1: Retrieve the user based on the provided email
-        user = facade.get_user_by_email(credentials['email'])
-        
-        # Step 2: Check if the user exists and the password is correct
-        if not user or not user.verify_password(credentials['password']):
+        # Step 1 & 2: Retrieve the user by email and check the password
+        # (the hash is upgraded if it was made with an outdated cost factor)
+        user = facade.authenticate_user(credentials['email'], credentials['password'])
+        if not user:
             return {'error': 'Invalid credentials'}, 401
 
         # Step 3: Create a JWT token with the user's id and is_admin flag
@@ -32,7 +31,17 @@ class Login(Resource):
         
         # Step 4: Return the JWT token to the client
         return {'access_token': access_token}, 200
-    
+
+
+@api.route('/logout')
+class Logout(Resource):
+    @api.response(200, 'Token revoked')
+    @jwt_required()
+    def post(self):
+        """Revoke the JWT token used for this request"""
+        facade.revoke_token(get_jwt())
+        return {'message': 'Successfully logged out'}, 200
+
 @api.route('/protected')
 class ProtectedResource(Resource):
     @jwt_required()
@@ -0,0 +1,34 @@
+from flask_restx import reqparse
+from app.api.v1.fieldsets import select_fields
+from app.api.v1.pagination import MAX_PAGE_SIZE
+
+# Largest number of ids accepted by ?ids=
+MAX_IDS = MAX_PAGE_SIZE
+
+# Query-string parameter of the batch fetch, accepted by the list endpoints
+ids_parser = reqparse.RequestParser()
+ids_parser.add_argument('ids', type=str, location='args',
+                        help=f'Comma-separated IDs to fetch in one request (at most {MAX_IDS}), '
+                             'instead of the list; other list parameters but fields are ignored')
+
+
+def get_ids():
+    """Parse ?ids=a,b,c from the request.
+
+    Returns the ids in the order given (each once), or None when the client
+    did not ask for them. Raises ValueError for an empty or too long list.
+    """
+    raw = ids_parser.parse_args()['ids']
+    if raw is None:
+        return None
+    ids = list(dict.fromkeys(obj_id.strip() for obj_id in raw.split(',') if obj_id.strip()))
+    if not ids:
+        raise ValueError("ids must name at least one ID")
+    if len(ids) > MAX_IDS:
+        raise ValueError(f"At most {MAX_IDS} ids can be fetched at once")
+    return ids
+
+
+def batch_response(key, objects, missing, keys, headers=None):
+    """Build {key: [...], 'missing': [...]} from get_many results, with the given keys of each to_dict()."""
+    return {key: [select_fields(obj.to_dict(), keys) for obj in objects], 'missing': missing}, 200, headers
@@ -0,0 +1,66 @@
+import hashlib
+from datetime import timezone
+
+from flask import Response, request
+from werkzeug.http import http_date, quote_etag
+
+
+def _utc(moment):
+    """updated_at is stored as naive local time; HTTP dates are UTC with second precision."""
+    return moment.astimezone(timezone.utc).replace(microsecond=0)
+
+
+def _etag(parts):
+    return hashlib.sha256('|'.join(parts).encode('utf-8')).hexdigest()[:32]
+
+
+def entity_validators(*objs, variant=None):
+    """Return (etag, last_modified) for a representation built from objs.
+
+    Pass every model the response embeds (e.g. a place, its owner and its
+    amenities) so that a change to any of them changes the ETag. `variant`
+    tells apart representations of the same objects, such as the keys
+    selected with ?fields=.
+    """
+    parts = [f'{type(obj).__name__}:{obj.id}:{obj.updated_at.isoformat()}' for obj in objs]
+    if variant:
+        parts.append(variant)
+    return _etag(parts), max(obj.updated_at for obj in objs)
+
+
+def collection_validators(stats, variant=None):
+    """Return (etag, last_modified) for a list built from tables with the given stats.
+
+    `stats` holds one (row count, latest updated_at) pair per table. The row
+    count catches deletes, which leave the latest updated_at unchanged; the
+    request's query string is part of the ETag since it selects the page.
+    `variant` tells apart representations of the same URL, such as the
+    content encoding of a streamed list.
+    """
+    parts = [request.full_path, variant or '']
+    parts.extend(f'{count}:{updated_at.isoformat() if updated_at else ""}' for count, updated_at in stats)
+    timestamps = [updated_at for _, updated_at in stats if updated_at]
+    return _etag(parts), max(timestamps) if timestamps else None
+
+
+def validator_headers(etag, last_modified):
+    headers = {'ETag': quote_etag(etag)}
+    if last_modified is not None:
+        headers['Last-Modified'] = http_date(_utc(last_modified))
+    return headers
+
+
+def not_modified(etag, last_modified):
+    """Return a 304 response when the client's cached copy is current, else None.
+
+    If-None-Match takes precedence over If-Modified-Since (RFC 9110).
+    """
+    if request.if_none_match:
+        fresh = request.if_none_match.contains_weak(etag)
+    elif request.if_modified_since and last_modified is not None:
+        fresh = _utc(last_modified) <= request.if_modified_since
+    else:
+        fresh = False
+    if not fresh:
+        return None
+    return Response(status=304, headers=validator_headers(etag, last_modified))
@@ -0,0 +1,38 @@
+from flask_restx import reqparse
+
+# Query-string parameter of the sparse fieldsets, accepted by the list and detail endpoints
+fields_parser = reqparse.RequestParser()
+fields_parser.add_argument('fields', type=str, location='args',
+                           help='Comma-separated keys to return for each item (default: all)')
+
+
+def get_fields(available):
+    """Parse ?fields= against the keys of a representation.
+
+    Returns the requested keys in the order of `available`, or None when the
+    client did not ask for a subset. Raises ValueError for an unknown key or
+    an empty list.
+    """
+    raw = fields_parser.parse_args()['fields']
+    if raw is None:
+        return None
+    requested = {name.strip() for name in raw.split(',')} - {''}
+    if not requested:
+        raise ValueError("fields must name at least one key")
+    unknown = requested.difference(available)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return tuple(key for key in available if key in requested)
+
+
+def sparse_serializer(serializer):
+    """Return a RowSerializer restricted to the keys of ?fields= (see get_fields)."""
+    fields = get_fields(serializer.keys)
+    return serializer if fields is None else serializer.only(fields)
+
+
+def select_fields(data, fields):
+    """Keep the requested keys of a representation (all of them when fields is None)."""
+    if fields is None:
+        return data
+    return {key: data[key] for key in fields}
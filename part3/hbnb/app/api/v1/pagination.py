@@ -0,0 +1,25 @@
+from flask_restx import reqparse, inputs
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# Shared query-string parser for the list endpoints
+pagination_parser = reqparse.RequestParser()
+pagination_parser.add_argument('limit', type=inputs.int_range(1, MAX_PAGE_SIZE), location='args',
+                               help=f'Maximum number of items to return (1-{MAX_PAGE_SIZE})')
+pagination_parser.add_argument('cursor', type=str, location='args',
+                               help='Cursor returned as next_cursor by the previous page')
+pagination_parser.add_argument('stream', type=inputs.boolean, default=False, location='args',
+                               help='Stream the full list as chunked, compressed JSON (ignored with limit/cursor)')
+
+
+def get_page_args():
+    """Parse ?limit=&cursor= from the request.
+
+    Returns (limit, cursor), or None when the client did not ask for a page so
+    the endpoint can keep returning the full, unpaginated list.
+    """
+    args = pagination_parser.parse_args()
+    if args['limit'] is None and args['cursor'] is None:
+        return None
+    return args['limit'] or DEFAULT_PAGE_SIZE, args['cursor']
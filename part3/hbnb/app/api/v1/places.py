@@ -1,5 +1,14 @@
-from flask_restx import Namespace, Resource, fields
+from flask_restx import Namespace, Resource, fields, reqparse, inputs
 from app.services import facade
+from app.api.v1.pagination import pagination_parser, get_page_args, DEFAULT_PAGE_SIZE
+from app.api.v1.amenities import AMENITY_SERIALIZER
+from app.api.v1.batch import batch_response, get_ids, ids_parser
+from app.api.v1.conditional import collection_validators, entity_validators, not_modified, validator_headers
+from app.api.v1.fieldsets import fields_parser, get_fields, select_fields
+from app.api.v1.serialization import RawJSON, RowSerializer, json_response
+from app.api.v1.streaming import negotiate_encoding, stream_json_list, stream_requested
+from app.persistence.fulltext import make_snippet
+from app.persistence.place_repository import PLACE_SORTS
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 
 api = Namespace('places', description='Place operations')
@@ -27,6 +36,97 @@ place_model = api.model('Place', {
     'amenities': fields.List(fields.String, description="List of amenities ID's")
 })
 
+bulk_place_model = api.inherit('BulkPlaceItem', place_model, {
+    'owner_id': fields.String(description='Owner ID (defaults to the admin making the request)')
+})
+
+bulk_places_model = api.model('BulkPlaces', {
+    'places': fields.List(fields.Nested(bulk_place_model), required=True, description='Places to create')
+})
+
+# Largest batch accepted by POST /places/bulk
+MAX_BULK_PLACES = 10000
+
+# Place.to_dict(), encoded from rows by the list endpoints
+PLACE_LIST_KEYS = ('id', 'title', 'description', 'price', 'latitude', 'longitude', 'owner_id',
+                   'review_count', 'rating_sum', 'average_rating', 'amenities')
+PLACE_LIST_SOURCES = {
+    'owner_id': 'user_id',
+    'review_count': (lambda review_count: review_count or 0, 'review_count'),
+    'rating_sum': (lambda rating_sum: rating_sum or 0, 'rating_sum'),
+    'average_rating': (lambda review_count, average: round(average, 2) if review_count else None,
+                       'review_count', 'average_rating'),
+}
+
+
+# Keys of GET /places/<place_id>
+PLACE_DETAIL_KEYS = ('id', 'title', 'description', 'price', 'latitude', 'longitude', 'owner',
+                     'review_count', 'average_rating', 'amenities')
+
+
+class _EncodedAmenities(dict):
+    """Amenity rows encoded on first use: lists repeat the same few amenities."""
+
+    def __missing__(self, row):
+        encoded = self[row] = AMENITY_SERIALIZER.encode(row)
+        return encoded
+
+
+def place_list_serializer(keys=None):
+    """Serializer of place rows, for the given keys (default: all); build one per response.
+
+    With 'amenities', the rows end with the list of their amenity rows.
+    """
+    encoded_amenities = _EncodedAmenities()
+
+    def encode_amenities(amenities):
+        return RawJSON('[' + ', '.join(map(encoded_amenities.__getitem__, amenities)) + ']')
+
+    serializer = RowSerializer(PLACE_LIST_KEYS, {**PLACE_LIST_SOURCES, 'amenities': (encode_amenities, 'amenities')})
+    return serializer if keys is None else serializer.only(keys)
+
+
+def place_row_columns(serializer):
+    """Return (place columns, amenity columns or None) to read for a place_list_serializer."""
+    if serializer.columns[-1] != 'amenities':
+        return serializer.columns, None
+    return serializer.columns[:-1], AMENITY_SERIALIZER.columns
+
+
+# Query-string filters for the place list, on top of ?limit=&cursor=
+place_filter_parser = pagination_parser.copy()
+place_filter_parser.add_argument('min_price', type=float, location='args', help='Minimum price per night')
+place_filter_parser.add_argument('max_price', type=float, location='args', help='Maximum price per night')
+place_filter_parser.add_argument('amenities', type=str, location='args',
+                                 help='Comma-separated amenity IDs the place must all have')
+place_filter_parser.add_argument('q', type=str, location='args', help='Text to search in title and description')
+place_filter_parser.add_argument('sort', type=str, location='args', choices=tuple(PLACE_SORTS),
+                                 help='Sort order: ' + ', '.join(PLACE_SORTS))
+
+
+def get_place_filters():
+    """Parse the place list filters, keeping only the ones the client sent."""
+    args = place_filter_parser.parse_args()
+    filters = {key: args[key] for key in ('min_price', 'max_price', 'q', 'sort') if args[key] is not None}
+    if args['amenities']:
+        filters['amenity_ids'] = [a.strip() for a in args['amenities'].split(',') if a.strip()]
+    return filters
+
+# Query-string parameters for the full-text search, paginated like the lists
+search_parser = pagination_parser.copy()
+search_parser.remove_argument('stream')
+search_parser.add_argument('q', type=str, required=True, location='args',
+                           help='Words to search in title and description (matched as prefixes)')
+
+# Query-string parameters for the nearest-places lookup
+near_parser = reqparse.RequestParser()
+near_parser.add_argument('lat', type=float, required=True, location='args', help='Latitude of the point')
+near_parser.add_argument('lon', type=float, required=True, location='args', help='Longitude of the point')
+near_parser.add_argument('radius_km', type=float, location='args',
+                         help='Search radius in kilometers (default: unbounded)')
+near_parser.add_argument('k', type=inputs.int_range(1, 100), default=10, location='args',
+                         help='Maximum number of places to return (1-100)')
+
 
 @api.route('/')
 class PlaceList(Resource):
@@ -49,29 +149,139 @@ class PlaceList(Resource):
                 'price': place.price,
                 'latitude': place.latitude,
                 'longitude': place.longitude,
-                'owner_id': place.owner.id,
+                'owner_id': place.owner_id,
                 'amenities': [a.to_dict() for a in place.amenities]
             }, 201
         except ValueError as e:
             return {'error': str(e)}, 400
 
+    @api.expect(place_filter_parser, fields_parser, ids_parser)
     @api.response(200, 'List of places retrieved successfully')
+    @api.response(400, 'Invalid filter, pagination, fields or ids parameters')
     def get(self):
-        """Retrieve a list of all places"""
-        place = facade.get_all_places()
-        return [p.to_dict() for p in place], 200
+        """Retrieve places, filtered and sorted in the database, optionally one page at a time"""
+        filters = get_place_filters()
+        page_args = get_page_args()
+        try:
+            selected = get_fields(PLACE_LIST_KEYS)
+            ids = get_ids()
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        stream = stream_requested() and ids is None
+        encoding = negotiate_encoding() if stream else None
+        serializer = place_list_serializer(selected)
+        columns = place_row_columns(serializer)
+        # Places embed their amenities, unless ?fields= leaves them out
+        tables = ('places', 'amenities') if columns[1] else ('places',)
+        etag, last_modified = collection_validators(facade.get_collection_stats(*tables), variant=encoding)
+        cached = not_modified(etag, last_modified)
+        if cached:
+            return cached
+        headers = validator_headers(etag, last_modified)
+        if ids is not None:
+            return batch_response('places', *facade.get_many('places', ids), serializer.keys, headers)
+        if stream:
+            return stream_json_list(facade.iter_place_rows(*columns, **filters), serializer.encode, encoding,
+                                    headers=headers, encoded=True)
+        if page_args is None:
+            return json_response(serializer.encode_list(facade.get_place_rows(*columns, **filters)),
+                                 headers=headers)
+        try:
+            places, next_cursor = facade.get_place_rows_page(*columns, *page_args, **filters)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        return json_response(serializer.encode_list(places, key='places', next_cursor=next_cursor), headers=headers)
+
+
+@api.route('/bulk')
+class PlaceBulk(Resource):
+    @api.expect(bulk_places_model)
+    @api.response(201, 'Places successfully created')
+    @api.response(400, 'Invalid input data')
+    @api.response(403, 'Admin privileges required')
+    @jwt_required()
+    def post(self):
+        """Create many places in one request (admin only)"""
+        current_user = get_jwt()
+
+        # Check if user is an admin
+        if not current_user.get('is_admin', False):
+            return {'error': 'Admin privileges required'}, 403
+
+        places_data = (api.payload or {}).get('places')
+        if not isinstance(places_data, list) or not places_data:
+            return {'error': 'places must be a non-empty list'}, 400
+        if len(places_data) > MAX_BULK_PLACES:
+            return {'error': f'At most {MAX_BULK_PLACES} places per request'}, 400
+        for place_data in places_data:
+            if not isinstance(place_data, dict):
+                return {'error': 'Each place must be an object'}, 400
+            place_data.setdefault('owner_id', get_jwt_identity())
+        try:
+            place_ids = facade.create_places(places_data)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        return {'created': len(place_ids), 'ids': place_ids}, 201
+
+
+@api.route('/search')
+class PlaceSearch(Resource):
+    @api.expect(search_parser)
+    @api.response(200, 'Matching places retrieved successfully')
+    @api.response(400, 'Invalid query or pagination parameters')
+    def get(self):
+        """Full-text search over titles and descriptions, best match first"""
+        args = search_parser.parse_args()
+        try:
+            results, next_cursor = facade.search_places_fulltext(
+                args['q'], args['limit'] or DEFAULT_PAGE_SIZE, args['cursor'])
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        return {
+            'places': [dict(place.to_dict(), score=score,
+                            snippet=make_snippet(args['q'], place.description, place.title))
+                       for place, score in results],
+            'next_cursor': next_cursor
+        }, 200
+
+
+@api.route('/near')
+class PlaceNear(Resource):
+    @api.expect(near_parser)
+    @api.response(200, 'Nearest places retrieved successfully')
+    @api.response(400, 'Invalid coordinates or parameters')
+    def get(self):
+        """Retrieve the places nearest to a point, sorted by great-circle distance"""
+        args = near_parser.parse_args()
+        try:
+            nearest = facade.get_places_near(args['lat'], args['lon'], args['radius_km'], args['k'])
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        return [dict(place.to_dict(), distance_km=round(distance, 3)) for place, distance in nearest], 200
 
 
 @api.route('/<place_id>')
 class PlaceResource(Resource):
+    @api.expect(fields_parser)
     @api.response(200, 'Place details retrieved successfully')
+    @api.response(400, 'Invalid fields parameter')
     @api.response(404, 'Place not found')
     def get(self, place_id):
         """Get place details by ID"""
-        place = facade.get_place(place_id)
+        try:
+            selected = get_fields(PLACE_DETAIL_KEYS)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        place = facade.get_place_details(place_id)
         if not place:
             api.abort(404, "Place not found")
-        return {
+        owner = [place.owner] if place.owner else []
+        etag, last_modified = entity_validators(place, *owner, *place.amenities,
+                                                variant=selected and ','.join(selected))
+        cached = not_modified(etag, last_modified)
+        if cached:
+            return cached
+        return select_fields({
             'id': place.id,
             'title': place.title,
             'description': place.description,
@@ -79,8 +289,10 @@ class PlaceResource(Resource):
             'latitude': place.latitude,
             'longitude': place.longitude,
             'owner': place.owner.to_dict() if place.owner else None,
+            'review_count': place.review_count,
+            'average_rating': round(place.average_rating, 2) if place.review_count else None,
             'amenities': [amenity.to_dict() for amenity in place.amenities]
-        }, 200
+        }, selected), 200, validator_headers(etag, last_modified)
 
     @api.expect(place_model)
     @api.response(200, 'Place updated successfully')
@@ -115,6 +327,34 @@ class PlaceResource(Resource):
             'price': place.price,
             'latitude': place.latitude,
             'longitude': place.longitude,
-            'owner_id': place.owner.id,
+            'owner_id': place.owner_id,
             'amenities': [a.to_dict() for a in place.amenities]
-        }, 200
\ No newline at end of file
+        }, 200
+
+
+@api.route('/<place_id>/reviews')
+class PlaceReviewList(Resource):
+    @api.expect(pagination_parser)
+    @api.response(200, 'List of reviews for the place retrieved successfully')
+    @api.response(400, 'Invalid pagination parameters')
+    @api.response(404, 'Place not found')
+    def get(self, place_id):
+        """Retrieve one page of the reviews of a place"""
+        place = facade.get_place(place_id)
+        if not place:
+            return {'error': 'Place not found'}, 404
+        limit, cursor = get_page_args() or (DEFAULT_PAGE_SIZE, None)
+        try:
+            reviews, next_cursor = facade.get_reviews_page_by_place(place_id, limit, cursor)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        return {
+            'reviews': [{
+                'id': review.id,
+                'text': review.text,
+                'rating': review.rating,
+                'user_id': review.user_id,
+                'place_id': review.place_id
+            } for review in reviews],
+            'next_cursor': next_cursor
+        }, 200
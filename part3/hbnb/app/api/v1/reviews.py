@@ -1,5 +1,11 @@
 from flask_restx import Namespace, Resource, fields
 from app.services import facade
+from app.api.v1.pagination import pagination_parser, get_page_args
+from app.api.v1.batch import batch_response, get_ids, ids_parser
+from app.api.v1.conditional import collection_validators, not_modified, validator_headers
+from app.api.v1.fieldsets import fields_parser, get_fields, select_fields, sparse_serializer
+from app.api.v1.serialization import RowSerializer, json_response
+from app.api.v1.streaming import negotiate_encoding, stream_json_list, stream_requested
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 
 api = Namespace('reviews', description='Review operations')
@@ -11,6 +17,9 @@ review_model = api.model('Review', {
     'place_id': fields.String(required=True, description='ID of the place')
 })
 
+# Reviews as listed by GET /reviews/, encoded from rows
+REVIEW_LIST_SERIALIZER = RowSerializer(('id', 'text', 'rating', 'user_id', 'place_id'))
+
 
 @api.route('/')
 class ReviewList(Resource):
@@ -30,53 +39,75 @@ class ReviewList(Resource):
             if not place:
                 return {'error': 'Place not found'}, 404
 
-            if place.owner.id == current_user:
+            if place.owner_id == current_user:
                 return {'error': 'You cannot review your own place'}, 400
 
-            get_review_place_user = facade.get_reviews_by_place(review_data['place_id'])
-            for review in get_review_place_user:
-                if review.user.id == current_user:
-                    return {'error': 'You have already reviewed this place'}, 400
-
             new_review = facade.create_review(review_data)
             return {
                 'id': new_review.id,
                 'text': new_review.text,
                 'rating': new_review.rating,
-                'user_id': new_review.user.id,
-                'place_id': new_review.place.id
+                'user_id': new_review.user_id,
+                'place_id': new_review.place_id
             }, 201
         except ValueError as e:
             return {'error': str(e)}, 400
 
+    @api.expect(pagination_parser, fields_parser, ids_parser)
     @api.response(200, 'List of reviews retrieved successfully')
+    @api.response(400, 'Invalid pagination, fields or ids parameters')
     def get(self):
-        """Retrieve a list of all reviews"""
-        reviews = facade.get_all_reviews()
-        return [{
-            'id': review.id,
-            'text': review.text,
-            'rating': review.rating,
-            'user_id': review.user.id,
-            'place_id': review.place.id
-        } for review in reviews], 200
+        """Retrieve a list of all reviews, or one page of it with ?limit=&cursor="""
+        page_args = get_page_args()
+        try:
+            serializer = sparse_serializer(REVIEW_LIST_SERIALIZER)
+            ids = get_ids()
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        stream = stream_requested() and ids is None
+        encoding = negotiate_encoding() if stream else None
+        etag, last_modified = collection_validators(facade.get_collection_stats('reviews'), variant=encoding)
+        cached = not_modified(etag, last_modified)
+        if cached:
+            return cached
+        headers = validator_headers(etag, last_modified)
+        if ids is not None:
+            return batch_response('reviews', *facade.get_many('reviews', ids), serializer.keys, headers)
+        if stream:
+            return stream_json_list(facade.iter_rows('reviews', serializer.columns),
+                                    serializer.encode, encoding, headers=headers, encoded=True)
+        if page_args is None:
+            reviews = facade.get_rows('reviews', serializer.columns)
+            return json_response(serializer.encode_list(reviews), headers=headers)
+        try:
+            reviews, next_cursor = facade.get_rows_page('reviews', serializer.columns, *page_args)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        return json_response(serializer.encode_list(reviews, key='reviews', next_cursor=next_cursor),
+                             headers=headers)
 
 
 @api.route('/<review_id>')
 class ReviewResource(Resource):
+    @api.expect(fields_parser)
     @api.response(200, 'Review details retrieved successfully')
+    @api.response(400, 'Invalid fields parameter')
     @api.response(404, 'Review not found')
     def get(self, review_id):
         """Get review details by ID"""
+        try:
+            selected = get_fields(REVIEW_LIST_SERIALIZER.keys)
+        except ValueError as e:
+            return {'error': str(e)}, 400
         try:
             review = facade.get_review(review_id)
-            return {
+            return select_fields({
                 'id': review.id,
                 'text': review.text,
                 'rating': review.rating,
-                'user_id': review.user.id,
-                'place_id': review.place.id
-            }, 200
+                'user_id': review.user_id,
+                'place_id': review.place_id
+            }, selected), 200
         except ValueError:
             return {'error': 'Review not found'}, 404
 
@@ -110,8 +141,8 @@ class ReviewResource(Resource):
                 'id': updated_review.id,
                 'text': updated_review.text,
                 'rating': updated_review.rating,
-                'user_id': updated_review.user.id,
-                'place_id': updated_review.place.id
+                'user_id': updated_review.user_id,
+                'place_id': updated_review.place_id
             }, 200
         except ValueError as e:
             return {'error': str(e)}, 400
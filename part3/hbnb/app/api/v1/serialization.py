@@ -0,0 +1,134 @@
+"""Serialize list endpoints from plain rows instead of ORM instances.
+
+A RowSerializer is built once per representation (a user in a list, a
+place with its amenities...). It encodes a row selected with its
+`columns` straight to the JSON text that json.dumps gives for the
+matching to_dict(), so responses stay byte-identical while skipping the
+ORM identity map, attribute instrumentation and intermediate dicts.
+"""
+import json
+from datetime import datetime
+from json.encoder import INFINITY, encode_basestring_ascii
+from math import isfinite
+
+from flask import Response, current_app
+from flask_restx import representations
+
+
+class RawJSON(str):
+    """JSON text embedded as is, e.g. a list encoded by another serializer."""
+
+
+def _encode_float(value):
+    # json.dumps writes non-finite floats the JavaScript way
+    if value != value:
+        return 'NaN'
+    if value == INFINITY:
+        return 'Infinity'
+    if value == -INFINITY:
+        return '-Infinity'
+    return float.__repr__(value)
+
+
+# Encoder per exact type, matching json.dumps with its default settings
+_ENCODERS = {
+    str: encode_basestring_ascii,
+    RawJSON: str,
+    int: int.__repr__,
+    float: _encode_float,
+    bool: lambda value: 'true' if value else 'false',
+    type(None): lambda value: 'null',
+    # to_dict() uses isoformat(), which never needs escaping
+    datetime: lambda value: '"' + value.isoformat() + '"',
+}
+
+
+def encode_value(value):
+    encoder = _ENCODERS.get(type(value))
+    return encoder(value) if encoder is not None else json.dumps(value)
+
+
+def _encode_column(values):
+    """Encode a column of values; a column of one type is encoded by a single map() call."""
+    types = set(map(type, values))
+    if len(types) == 1:
+        kind = types.pop()
+        if kind is str:
+            return list(map(encode_basestring_ascii, values))
+        if kind is RawJSON:
+            return values
+        if kind is int:
+            return list(map(int.__repr__, values))
+        if kind is float and all(map(isfinite, values)):
+            return list(map(float.__repr__, values))
+    return [encode_value(value) for value in values]
+
+
+class RowSerializer:
+    """Encodes rows as JSON objects with the given keys.
+
+    The value of a key is the row column of the same name, unless
+    `sources` maps the key to another column name, or to a tuple
+    (function, column name, ...) computing it from those columns.
+    `columns` lists the columns the rows must start with, in order.
+    """
+
+    def __init__(self, keys, sources=None):
+        self.keys = tuple(keys)
+        self._sources = dict(sources or {})
+        sources = [self._sources.get(key, key) for key in self.keys]
+        sources = [(None, source) if isinstance(source, str) else source for source in sources]
+        self.columns = tuple(dict.fromkeys(name for _, *names in sources for name in names))
+        self._getters = [(function, tuple(self.columns.index(name) for name in names))
+                         for function, *names in sources]
+        self._template = '{' + ', '.join(json.dumps(key).replace('%', '%%') + ': %s' for key in self.keys) + '}'
+
+    def only(self, keys):
+        """Serializer of the given keys alone, which reads only the columns they need."""
+        keys = set(keys)
+        return RowSerializer([key for key in self.keys if key in keys], self._sources)
+
+    def encode(self, row):
+        values = [row[positions[0]] if function is None else function(*[row[i] for i in positions])
+                  for function, positions in self._getters]
+        return self._template % tuple([encode_value(value) for value in values])
+
+    def encode_rows(self, rows):
+        """Encode many rows at once, column by column."""
+        if not rows:
+            return []
+        # Rows may carry extra columns after self.columns (e.g. the sort column of a page)
+        columns = list(zip(*rows))
+        values = [columns[positions[0]] if function is None
+                  else list(map(function, *[columns[i] for i in positions]))
+                  for function, positions in self._getters]
+        template = self._template
+        return [template % row for row in zip(*[_encode_column(column) for column in values])]
+
+    def encode_list(self, rows, key=None, **extra):
+        """Encode [row, ...], or {key: [row, ...], **extra} when key is given."""
+        items = '[' + ', '.join(self.encode_rows(rows)) + ']'
+        if key is None:
+            return items
+        members = [encode_value(key) + ': ' + items]
+        members.extend(encode_value(name) + ': ' + encode_value(value) for name, value in extra.items())
+        return '{' + ', '.join(members) + '}'
+
+
+def fast_json_enabled():
+    """Tell whether json_response can bypass flask-restx's encoder and still match its output."""
+    return (representations.dumps is json.dumps and not current_app.debug
+            and not current_app.config.get('RESTX_JSON'))
+
+
+def json_response(text, status=200, headers=None):
+    """Return JSON text built by a RowSerializer as the response flask-restx would send.
+
+    With custom RESTX_JSON settings (or debug indentation) the text is
+    decoded and handed back to flask-restx to format.
+    """
+    if not fast_json_enabled():
+        return json.loads(text), status, headers
+    response = Response(text + '\n', status, mimetype='application/json')
+    response.headers.extend(headers or {})
+    return response
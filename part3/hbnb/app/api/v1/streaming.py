@@ -0,0 +1,91 @@
+import json
+import zlib
+
+from flask import Response, request, stream_with_context
+
+from app.api.v1.pagination import pagination_parser
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+# Bytes of JSON collected before a chunk is compressed and sent
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def stream_requested():
+    """Tell whether the client asked for the full list as a stream (?stream=true without a page)."""
+    args = pagination_parser.parse_args()
+    return args['stream'] and args['limit'] is None and args['cursor'] is None
+
+
+def negotiate_encoding():
+    """Pick 'br', 'gzip' or None (identity) from the request's Accept-Encoding."""
+    offers = ['br', 'gzip'] if brotli is not None else ['gzip']
+    return request.accept_encodings.best_match(offers)
+
+
+class _Compressor:
+    """Incremental compressor that flushes after every chunk, so each chunk reaches the client."""
+
+    def __init__(self, encoding):
+        self.encoding = encoding
+        if encoding == 'br':
+            self._brotli = brotli.Compressor()
+        elif encoding == 'gzip':
+            self._zlib = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def chunk(self, data):
+        if self.encoding == 'br':
+            return self._brotli.process(data) + self._brotli.flush()
+        if self.encoding == 'gzip':
+            return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+        return data
+
+    def finish(self):
+        if self.encoding == 'br':
+            return self._brotli.finish()
+        if self.encoding == 'gzip':
+            return self._zlib.flush(zlib.Z_FINISH)
+        return b''
+
+
+def _json_chunks(items, serialize, key, encoded=False):
+    """Yield the JSON encoding of [serialize(item), ...] (or {key: [...]}) in pieces of about STREAM_CHUNK_SIZE."""
+    buffer = ['{%s: [' % json.dumps(key) if key else '[']
+    size = 0
+    for index, item in enumerate(items):
+        piece = serialize(item) if encoded else json.dumps(serialize(item))
+        buffer.append(',' + piece if index else piece)
+        size += len(piece)
+        if size >= STREAM_CHUNK_SIZE:
+            yield ''.join(buffer).encode('utf-8')
+            buffer, size = [], 0
+    buffer.append(']}\n' if key else ']\n')
+    yield ''.join(buffer).encode('utf-8')
+
+
+def stream_json_list(items, serialize, encoding=None, key=None, headers=None, encoded=False):
+    """Build a streamed JSON response from an iterable of models or rows.
+
+    `items` is consumed lazily (e.g. a yield_per query), one chunk at a time,
+    so memory stays flat whatever the size of the list. With `key` the list
+    is wrapped as {key: [...]}, matching the non-streamed response.
+    With `encoded`, serialize returns JSON text (e.g. RowSerializer.encode)
+    rather than a dict to dump.
+    """
+    def generate():
+        compressor = _Compressor(encoding)
+        for chunk in _json_chunks(items, serialize, key, encoded):
+            data = compressor.chunk(chunk)
+            if data:
+                yield data
+        yield compressor.finish()
+
+    response = Response(stream_with_context(generate()), mimetype='application/json')
+    response.headers.update(headers or {})
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
@@ -0,0 +1,81 @@
+import unittest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+from app import create_app
+from app.extensions import db
+from app.models.amenity import Amenity
+from app.models.user import User
+from app.services import facade
+
+
+class TestBatchFetch(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+
+        self.owner = User(first_name="Alice", last_name="Smith", email="alice@example.com", password="x")
+        self.amenities = [Amenity(name=f"Amenity {i}") for i in range(4)]
+        db.session.add_all([self.owner, *self.amenities])
+        db.session.commit()
+        self.admin_headers = {'Authorization': 'Bearer ' + create_access_token(
+            identity='admin', additional_claims={'is_admin': True})}
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def _place(self, amenity_ids):
+        return {'title': 'Loft', 'description': '', 'price': 80.0, 'latitude': 1.0, 'longitude': 2.0,
+                'owner_id': self.owner.id, 'amenities': amenity_ids}
+
+    def test_get_many_keeps_the_order_and_reports_missing_ids(self):
+        ids = [self.amenities[2].id, 'missing', self.amenities[0].id, self.amenities[2].id, 'gone']
+        amenities, missing = facade.amenity_repo.get_many(ids)
+        self.assertEqual(amenities, [self.amenities[2], self.amenities[0]])
+        self.assertEqual(missing, ['missing', 'gone'])
+        self.assertEqual(facade.amenity_repo.get_many([]), ([], []))
+
+    def test_ids_endpoint(self):
+        ids = ','.join([self.amenities[3].id, 'missing', self.amenities[1].id])
+        response = self.client.get(f'/api/v1/amenities/?ids={ids}&fields=name')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json(), {'amenities': [{'name': 'Amenity 3'}, {'name': 'Amenity 1'}],
+                                               'missing': ['missing']})
+        users = self.client.get(f'/api/v1/users/?ids={self.owner.id}', headers=self.admin_headers).get_json()
+        self.assertEqual(users['users'][0]['email'], 'alice@example.com')
+        for url in ('/api/v1/places/?ids=', '/api/v1/reviews/?ids=' + ','.join(map(str, range(101)))):
+            self.assertEqual(self.client.get(url).status_code, 400, url)
+
+    def test_place_amenities_are_loaded_in_one_query(self):
+        amenity_ids = [amenity.id for amenity in self.amenities]
+        selects = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith('SELECT') and 'FROM amenities' in statement:
+                selects.append(statement)
+
+        db.session.expire_all()
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            place = facade.create_place(self._place(amenity_ids))
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+        self.assertEqual(len(selects), 1, selects)
+        self.assertEqual(sorted(amenity.id for amenity in place.amenities), sorted(amenity_ids))
+
+        updated = facade.update_place(place.id, {'amenities': amenity_ids[:2]})
+        self.assertEqual(sorted(amenity.id for amenity in updated.amenities), sorted(amenity_ids[:2]))
+
+    def test_unknown_amenity_is_rejected(self):
+        with self.assertRaises(ValueError) as error:
+            facade.create_place(self._place([self.amenities[0].id, 'missing']))
+        self.assertEqual(str(error.exception), "Amenity with ID 'missing' does not exist")
+
+
+if __name__ == '__main__':
+    unittest.main()
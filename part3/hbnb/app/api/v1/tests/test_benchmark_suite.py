@@ -0,0 +1,24 @@
+import unittest
+from app import create_app
+from benchmarks import suite
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+
+    def test_every_route_has_a_scenario(self):
+        app = create_app("config.TestingConfig")
+        self.assertEqual(suite.uncovered_routes(app), [])
+
+    def test_compare_flags_regressions(self):
+        def report(p95_ms, queries, errors=0):
+            return {'scenarios': {'places.list': {'p95_ms': p95_ms, 'queries_per_request': queries,
+                                                  'errors': errors}}}
+
+        baseline = report(10.0, 3.0)
+        self.assertEqual(suite.compare_reports(baseline, report(11.5, 3.0)), [])
+        self.assertEqual(suite.compare_reports(report(0.2, 3.0), report(0.9, 3.0)), [])
+        slower = suite.compare_reports(baseline, report(13.0, 3.0))
+        self.assertEqual([name for name, _ in slower], ['places.list'])
+        more_queries = suite.compare_reports(baseline, report(10.0, 4.0))
+        self.assertIn('queries/request', more_queries[0][1][0])
+        self.assertEqual(len(suite.compare_reports(baseline, report(10.0, 3.0, errors=1))), 1)
@@ -0,0 +1,102 @@
+import unittest
+from flask_jwt_extended import create_access_token
+from sqlalchemy.exc import IntegrityError
+from app import create_app
+from app.extensions import db
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+from app.services import facade
+
+
+class TestBulkPlaces(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+
+        self.admin = User(first_name="Admin", last_name="User", email="admin@example.com",
+                          password="x", is_admin=True)
+        self.user = User(first_name="Bob", last_name="Martin", email="bob@example.com", password="x")
+        self.wifi = Amenity(name="WiFi")
+        db.session.add_all([self.admin, self.user, self.wifi])
+        db.session.commit()
+        self.admin_headers = {'Authorization': 'Bearer ' + create_access_token(
+            identity=self.admin.id, additional_claims={'is_admin': True})}
+        self.user_headers = {'Authorization': 'Bearer ' + create_access_token(identity=self.user.id)}
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def _place(self, **overrides):
+        place = {"title": "Nice Place", "description": "A nice place", "price": 50.0,
+                 "latitude": 48.8566, "longitude": 2.3522}
+        place.update(overrides)
+        return place
+
+    def test_bulk_create(self):
+        response = self.client.post('/api/v1/places/bulk', headers=self.admin_headers, json={'places': [
+            self._place(title="A", amenities=[self.wifi.id]),
+            self._place(title="  B  ", owner_id=self.user.id),
+        ]})
+        self.assertEqual(response.status_code, 201)
+        data = response.get_json()
+        self.assertEqual(data['created'], 2)
+        place_a = db.session.get(Place, data['ids'][0])
+        place_b = db.session.get(Place, data['ids'][1])
+        self.assertEqual(place_a.owner_id, self.admin.id)
+        self.assertEqual([a.name for a in place_a.amenities], ['WiFi'])
+        self.assertEqual(place_b.title, 'B')
+        self.assertEqual(place_b.owner_id, self.user.id)
+        self.assertIsNotNone(place_b.created_at)
+
+    def test_bulk_create_validates_every_row(self):
+        response = self.client.post('/api/v1/places/bulk', headers=self.admin_headers, json={'places': [
+            self._place(), self._place(price=-1)
+        ]})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json()['error'], 'places[1]: Price cannot be negative')
+        self.assertEqual(Place.query.count(), 0)
+
+    def test_bulk_create_unknown_amenity(self):
+        response = self.client.post('/api/v1/places/bulk', headers=self.admin_headers, json={'places': [
+            self._place(amenities=['nonexistent-amenity'])
+        ]})
+        self.assertEqual(response.status_code, 400)
+
+    def test_failed_bulk_insert_keeps_places_near_working(self):
+        [existing] = facade.create_places([self._place(owner_id=self.admin.id)])
+        duplicate = {'id': existing, 'title': 'Duplicate', 'description': '', 'price': 50.0,
+                     'latitude': 48.8566, 'longitude': 2.3522, 'user_id': self.admin.id}
+        with self.assertRaises(IntegrityError):
+            facade.place_repo.add_many([duplicate])
+        later = Place(title="Later", description="", price=50.0, latitude=48.86, longitude=2.35, owner=self.admin)
+        db.session.add(later)
+        db.session.commit()
+        response = self.client.get('/api/v1/places/near?lat=48.86&lon=2.35&radius_km=5')
+        self.assertEqual(sorted(p['id'] for p in response.get_json()), sorted([existing, later.id]))
+
+    def test_bulk_create_admin_only(self):
+        response = self.client.post('/api/v1/places/bulk', headers=self.user_headers,
+                                    json={'places': [self._place()]})
+        self.assertEqual(response.status_code, 403)
+
+    def test_create_reviews(self):
+        place_id = facade.create_places([self._place(owner_id=self.admin.id)])[0]
+        ids = facade.create_reviews([{'text': 'Great', 'rating': 5, 'user_id': self.user.id, 'place_id': place_id}])
+        self.assertEqual(len(ids), 1)
+        with self.assertRaises(ValueError):
+            facade.create_reviews([{'text': 'Again', 'rating': 4, 'user_id': self.user.id, 'place_id': place_id}])
+        self.assertEqual(Review.query.count(), 1)
+
+    def test_bulk_upsert(self):
+        repo = facade.amenity_repo
+        repo.bulk_upsert([{'id': self.wifi.id, 'name': 'Fiber'}, {'name': 'Pool'}])
+        db.session.expire_all()
+        self.assertEqual(sorted(a.name for a in Amenity.query.all()), ['Fiber', 'Pool'])
@@ -0,0 +1,106 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from flask_jwt_extended import create_access_token
+from werkzeug.http import http_date
+from app import create_app
+from app.extensions import db
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+
+
+class TestConditionalGet(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+
+        self.owner = User(first_name="Alice", last_name="Smith", email="alice@example.com", password="x")
+        self.reviewer = User(first_name="Bob", last_name="Martin", email="bob@example.com", password="x")
+        self.wifi = Amenity(name="WiFi")
+        self.place = Place(title="Loft", description="", price=80.0, latitude=0.0, longitude=0.0, owner=self.owner)
+        self.place.add_amenity(self.wifi)
+        db.session.add_all([self.owner, self.reviewer, self.wifi, self.place])
+        db.session.commit()
+        self.place_id, self.wifi_id, self.owner_id = self.place.id, self.wifi.id, self.owner.id
+        self.admin_headers = {'Authorization': 'Bearer ' + create_access_token(
+            identity=self.owner_id, additional_claims={'is_admin': True})}
+        self.reviewer_headers = {'Authorization': 'Bearer ' + create_access_token(identity=self.reviewer.id)}
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def _etag(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.headers['ETag']
+
+    def test_detail_endpoints_answer_304(self):
+        for url in (f'/api/v1/places/{self.place_id}', f'/api/v1/amenities/{self.wifi_id}',
+                    f'/api/v1/users/{self.owner_id}'):
+            first = self.client.get(url)
+            self.assertIn('Last-Modified', first.headers)
+            response = self.client.get(url, headers={'If-None-Match': first.headers['ETag']})
+            self.assertEqual(response.status_code, 304, url)
+            self.assertEqual(response.data, b'')
+            self.assertEqual(response.headers['ETag'], first.headers['ETag'])
+            response = self.client.get(url, headers={'If-None-Match': '"stale"'})
+            self.assertEqual(response.status_code, 200, url)
+
+    def test_place_etag_follows_embedded_amenities_and_ratings(self):
+        url = f'/api/v1/places/{self.place_id}'
+        etag = self._etag(url)
+        response = self.client.put(f'/api/v1/amenities/{self.wifi_id}', headers=self.admin_headers,
+                                   json={'name': 'Fast WiFi'})
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['amenities'][0]['name'], 'Fast WiFi')
+
+        etag = response.headers['ETag']
+        self.client.post('/api/v1/reviews/', headers=self.reviewer_headers,
+                         json={'text': 'Great', 'rating': 5, 'place_id': self.place_id})
+        response = self.client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['review_count'], 1)
+
+    def test_if_modified_since(self):
+        url = f'/api/v1/amenities/{self.wifi_id}'
+        last_modified = self.client.get(url).headers['Last-Modified']
+        response = self.client.get(url, headers={'If-Modified-Since': last_modified})
+        self.assertEqual(response.status_code, 304)
+        earlier = http_date(datetime.now(timezone.utc) - timedelta(days=1))
+        response = self.client.get(url, headers={'If-Modified-Since': earlier})
+        self.assertEqual(response.status_code, 200)
+
+    def test_list_etag_changes_with_collection(self):
+        etag = self._etag('/api/v1/amenities/')
+        self.assertEqual(self.client.get('/api/v1/amenities/', headers={'If-None-Match': etag}).status_code, 304)
+        self.assertNotEqual(self._etag('/api/v1/amenities/?limit=1'), etag)
+
+        self.client.post('/api/v1/amenities/', headers=self.admin_headers, json={'name': 'Pool'})
+        response = self.client.get('/api/v1/amenities/', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.get_json()['amenities']), 2)
+
+    def test_list_etag_changes_on_delete(self):
+        review = Review(text="Nice", rating=4, place=self.place, user=self.reviewer)
+        db.session.add(review)
+        db.session.commit()
+        review_id = review.id
+        etag = self._etag('/api/v1/reviews/')
+        self.client.delete(f'/api/v1/reviews/{review_id}', headers=self.reviewer_headers)
+        response = self.client.get('/api/v1/reviews/', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json(), [])
+
+    def test_place_list_follows_amenities(self):
+        etag = self._etag('/api/v1/places/')
+        self.client.put(f'/api/v1/amenities/{self.wifi_id}', headers=self.admin_headers, json={'name': 'Fiber'})
+        self.assertEqual(self.client.get('/api/v1/places/', headers={'If-None-Match': etag}).status_code, 200)
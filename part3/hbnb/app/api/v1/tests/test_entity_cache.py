@@ -0,0 +1,111 @@
+import unittest
+from flask_jwt_extended import create_access_token
+from app import create_app
+from app.extensions import db
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.user import User
+from app.services import facade
+from app.services.cache import EntityCache
+
+
+class CachedTestingConfig:
+    TESTING = True
+    SECRET_KEY = 'test'
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    ENTITY_CACHE_ENABLED = True
+    ENTITY_CACHE_SIZE = 16
+    ENTITY_CACHE_TTL = 300
+
+
+class TestEntityCache(unittest.TestCase):
+
+    def test_lru_eviction(self):
+        cache = EntityCache(max_size=2, ttl=300)
+        cache.set('user', 'a', 1)
+        cache.set('user', 'b', 2)
+        cache.get('user', 'a')
+        cache.set('user', 'c', 3)
+        self.assertIsNone(cache.get('user', 'b'))
+        self.assertEqual(cache.get('user', 'a'), 1)
+        self.assertEqual(cache.get('user', 'c'), 3)
+
+    def test_ttl_expiry(self):
+        cache = EntityCache(max_size=2, ttl=0)
+        cache.set('user', 'a', 1)
+        self.assertIsNone(cache.get('user', 'a'))
+        self.assertEqual(cache.stats()['size'], 0)
+
+    def test_invalidate_namespace(self):
+        cache = EntityCache()
+        cache.set('place_details', 'a', 1)
+        cache.set('place_details', 'b', 2)
+        cache.set('place', 'a', 3)
+        cache.invalidate('place_details')
+        self.assertEqual(cache.stats()['size'], 1)
+
+
+class TestFacadeCache(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app(CachedTestingConfig)
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+
+        self.admin = User(first_name="Admin", last_name="User", email="admin@example.com",
+                          password="x", is_admin=True)
+        self.amenity = Amenity(name="WiFi")
+        self.place = Place(title="Nice Place", description="", price=50.0,
+                           latitude=0.0, longitude=0.0, owner=self.admin)
+        self.place.add_amenity(self.amenity)
+        db.session.add_all([self.admin, self.amenity, self.place])
+        db.session.commit()
+        self.headers = {'Authorization': 'Bearer ' + create_access_token(
+            identity=self.admin.id, additional_claims={'is_admin': True})}
+        self.place_id, self.user_id, self.amenity_id = self.place.id, self.admin.id, self.amenity.id
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+        facade.init_cache({})
+
+    def _get(self, url):
+        db.session.remove()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.get_json()
+
+    def test_repeated_reads_hit_the_cache(self):
+        self._get(f'/api/v1/places/{self.place_id}')
+        self._get(f'/api/v1/places/{self.place_id}')
+        self._get(f'/api/v1/users/{self.user_id}')
+        data = self._get(f'/api/v1/users/{self.user_id}')
+        self.assertEqual(data['email'], 'admin@example.com')
+        stats = facade.cache.stats()
+        self.assertEqual(stats['hits'], 2)
+        self.assertEqual(stats['misses'], 2)
+
+    def test_update_through_api_invalidates(self):
+        self._get(f'/api/v1/amenities/{self.amenity_id}')
+        self._get(f'/api/v1/places/{self.place_id}')
+        response = self.client.put(f'/api/v1/amenities/{self.amenity_id}', headers=self.headers,
+                                   json={'name': 'Fiber'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._get(f'/api/v1/amenities/{self.amenity_id}')['name'], 'Fiber')
+        place = self._get(f'/api/v1/places/{self.place_id}')
+        self.assertEqual(place['amenities'][0]['name'], 'Fiber')
+
+    def test_session_flush_invalidates(self):
+        self._get(f'/api/v1/places/{self.place_id}')
+        place = Place.query.get(self.place_id)
+        place.title = "Renamed"
+        db.session.commit()
+        self.assertEqual(self._get(f'/api/v1/places/{self.place_id}')['title'], 'Renamed')
+
+    def test_disabled_by_default(self):
+        create_app("config.TestingConfig")
+        self.assertIsNone(facade.cache)
@@ -0,0 +1,110 @@
+import json
+import unittest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+from app import create_app
+from app.extensions import db
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+
+
+class TestFieldsets(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+
+        owner = User(first_name="Alice", last_name="Smith", email="alice@example.com", password="x")
+        guest = User(first_name="Bob", last_name="Martin", email="bob@example.com", password="x")
+        wifi = Amenity(name="WiFi")
+        places = []
+        for i in range(5):
+            place = Place(title=f"Place {i}", description="Nice", price=10.0 * i,
+                          latitude=1.5, longitude=-2.5, owner=owner)
+            place.add_amenity(wifi)
+            places.append(place)
+        review = Review(text="Great", rating=5, place=places[0], user=guest)
+        db.session.add_all([owner, guest, wifi, *places, review])
+        db.session.commit()
+        self.place_id = places[0].id
+        self.user_id = owner.id
+        self.admin_headers = {'Authorization': 'Bearer ' + create_access_token(
+            identity='admin', additional_claims={'is_admin': True})}
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def _statements(self, url):
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            response = self.client.get(url)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+        self.assertEqual(response.status_code, 200, url)
+        return response, statements
+
+    def test_lists_keep_the_requested_keys(self):
+        for url, key, fields in (('/api/v1/places/', None, 'price,id,title'),
+                                 ('/api/v1/users/', None, 'email'),
+                                 ('/api/v1/reviews/', None, 'rating,place_id'),
+                                 ('/api/v1/amenities/', 'amenities', 'name')):
+            full = self.client.get(url, headers=self.admin_headers).get_json()
+            full = full[key] if key else full
+            names = [name for name in full[0] if name in fields.split(',')]
+            expected = [{name: item[name] for name in names} for item in full]
+            items = self.client.get(f'{url}?fields={fields}', headers=self.admin_headers).get_json()
+            self.assertEqual(items[key] if key else items, expected, url)
+            streamed = json.loads(self.client.get(f'{url}?fields={fields}&stream=true',
+                                                  headers=self.admin_headers).data)
+            self.assertEqual(streamed[key] if key else streamed, expected, url)
+
+    def test_pages_keep_the_requested_keys(self):
+        page = self.client.get('/api/v1/places/?fields=title&limit=2').get_json()
+        self.assertEqual(page['places'], [{'title': 'Place 0'}, {'title': 'Place 1'}])
+        rest = self.client.get(f"/api/v1/places/?fields=title&limit=5&cursor={page['next_cursor']}").get_json()
+        self.assertEqual([place['title'] for place in rest['places']], ['Place 2', 'Place 3', 'Place 4'])
+        page = self.client.get('/api/v1/places/?fields=average_rating,amenities&limit=1&sort=rating_desc').get_json()
+        self.assertEqual(page['places'], [{'average_rating': 5.0,
+                                           'amenities': [Amenity.query.one().to_dict()]}])
+
+    def test_unrequested_columns_and_amenities_are_not_read(self):
+        _, statements = self._statements('/api/v1/places/?fields=id,title,price')
+        listing = statements[-1]
+        self.assertIn('places.title', listing)
+        self.assertNotIn('places.description', listing)
+        self.assertFalse(any('amenities' in statement or 'place_amenity' in statement
+                             for statement in statements))
+        _, statements = self._statements('/api/v1/places/?fields=id,amenities')
+        self.assertTrue(any('place_amenity' in statement for statement in statements))
+
+    def test_details_keep_the_requested_keys(self):
+        response = self.client.get(f'/api/v1/places/{self.place_id}?fields=title,owner')
+        self.assertEqual(response.get_json(), {'title': 'Place 0',
+                                               'owner': User.query.get(self.user_id).to_dict()})
+        full = self.client.get(f'/api/v1/places/{self.place_id}')
+        self.assertNotEqual(response.headers['ETag'], full.headers['ETag'])
+        self.assertEqual(self.client.get(f'/api/v1/users/{self.user_id}?fields=email').get_json(),
+                         {'email': 'alice@example.com'})
+
+    def test_invalid_fields_are_rejected(self):
+        for url in ('/api/v1/places/?fields=title,secret', '/api/v1/users/?fields=password',
+                    f'/api/v1/places/{self.place_id}?fields=owner_id', '/api/v1/amenities/?fields=,'):
+            response = self.client.get(url, headers=self.admin_headers)
+            self.assertEqual(response.status_code, 400, url)
+            self.assertIn('error', response.get_json())
+
+
+if __name__ == '__main__':
+    unittest.main()
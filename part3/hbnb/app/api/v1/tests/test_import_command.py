@@ -0,0 +1,152 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from sqlalchemy.exc import IntegrityError
+from app import create_app
+from app.extensions import db
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+from app.persistence.place_repository import PlaceRepository
+
+
+class TestImportCommand(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.runner = self.app.test_cli_runner()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+        self.owner = User(first_name="Alice", last_name="Smith", email="alice@example.com", password="x")
+        db.session.add_all([self.owner, Amenity(name="WiFi"), Amenity(name="Pool")])
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+        self.tmpdir.cleanup()
+
+    def _write(self, name, content):
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return path
+
+    def _ndjson(self, name, rows):
+        return self._write(name, ''.join(json.dumps(row) + '\n' for row in rows))
+
+    def _import(self, *args):
+        return self.runner.invoke(args=['hbnb', 'import', *args])
+
+    def _rejects(self, path):
+        with open(path + '.rejects.ndjson', encoding='utf-8') as f:
+            return [json.loads(line) for line in f]
+
+    def test_import_users_hashes_passwords(self):
+        path = self._ndjson('users.ndjson', [
+            {"first_name": "Bob", "last_name": "Martin", "email": "bob@example.com", "password": "secret"},
+            {"first_name": "Carol", "last_name": "Jones", "email": "carol@example.com",
+             "password_hash": "$2b$04$" + "a" * 53, "is_admin": True},
+        ])
+        result = self._import('users', path)
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('Imported 2 users', result.output)
+        bob = User.query.filter_by(email="bob@example.com").first()
+        self.assertTrue(bob.verify_password("secret"))
+        self.assertFalse(bob.is_admin)
+        self.assertTrue(User.query.filter_by(email="carol@example.com").first().is_admin)
+        self.assertFalse(os.path.exists(path + '.rejects.ndjson'))
+
+    def test_rejected_rows_go_to_side_file(self):
+        path = self._ndjson('users.ndjson', [
+            {"first_name": "Bob", "last_name": "Martin", "email": "bob@example.com", "password": "secret"},
+            {"first_name": "", "last_name": "Martin", "email": "empty@example.com", "password": "secret"},
+            {"first_name": "Alice", "last_name": "Again", "email": "alice@example.com", "password": "secret"},
+            {"first_name": "Bob", "last_name": "Twice", "email": "bob@example.com", "password": "secret"},
+            {"last_name": "Nameless", "email": "nameless@example.com", "password": "secret"},
+        ])
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write('{not json\n')
+        result = self._import('users', path, '--chunk-size', '2')
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('Imported 1 users', result.output)
+        self.assertIn('rejected 5', result.output)
+        self.assertEqual(User.query.count(), 2)
+        rejects = self._rejects(path)
+        self.assertEqual([r['line'] for r in rejects], [2, 3, 4, 5, 6])
+        self.assertEqual(rejects[0]['error'], "First name cannot be empty")
+        self.assertEqual(rejects[1]['error'], "Email 'alice@example.com' already exists")
+        self.assertEqual(rejects[2]['error'], "Email 'bob@example.com' already exists")
+        self.assertEqual(rejects[3]['error'], "Missing field 'first_name'")
+        self.assertTrue(rejects[4]['error'].startswith("Invalid JSON"))
+
+    def test_import_places_csv_resolves_owner_and_amenities(self):
+        path = self._write('places.csv',
+                           "id,title,description,price,latitude,longitude,owner_email,amenities\n"
+                           "p1,Loft,Nice loft,80,48.85,2.35,alice@example.com,WiFi|Pool\n"
+                           ",Studio,,45.5,45.76,4.83,alice@example.com,\n"
+                           ",Cabin,,abc,45.76,4.83,alice@example.com,\n"
+                           ",Hut,,10,45.76,4.83,nobody@example.com,\n"
+                           ",Barn,,10,45.76,4.83,alice@example.com,Sauna\n")
+        result = self._import('places', path)
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('Imported 2 places', result.output)
+        loft = db.session.get(Place, 'p1')
+        self.assertEqual(loft.owner_id, self.owner.id)
+        self.assertEqual(sorted(a.name for a in loft.amenities), ['Pool', 'WiFi'])
+        studio = Place.query.filter_by(title="Studio").first()
+        self.assertEqual(studio.price, 45.5)
+        self.assertEqual(studio.description, '')
+        self.assertEqual([r['error'] for r in self._rejects(path)], [
+            "Invalid value for 'price': 'abc'",
+            "Unknown owner 'nobody@example.com'",
+            "Unknown amenity 'Sauna'",
+        ])
+
+    def test_failed_amenity_links_roll_back_their_places(self):
+        path = self._write('places.csv',
+                           "title,description,price,latitude,longitude,owner_email,amenities\n"
+                           "Loft,,80,48.85,2.35,alice@example.com,WiFi\n"
+                           "Studio,,45,45.76,4.83,alice@example.com,\n")
+        error = IntegrityError('INSERT INTO place_amenity', {}, Exception('constraint failed'))
+        with patch.object(PlaceRepository, 'add_many_to', side_effect=error):
+            result = self._import('places', path)
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('Imported 0 places', result.output)
+        self.assertEqual(Place.query.count(), 0)
+        self.assertEqual([r['line'] for r in self._rejects(path)], [2, 3])
+
+    def test_import_reviews(self):
+        place = Place(title="Loft", description="", price=80, latitude=48.85, longitude=2.35, owner=self.owner)
+        bob = User(first_name="Bob", last_name="Martin", email="bob@example.com", password="x")
+        db.session.add_all([place, bob])
+        db.session.commit()
+        path = self._ndjson('reviews.ndjson', [
+            {"text": "Great", "rating": 5, "user_email": "bob@example.com", "place_id": place.id},
+            {"text": "Again", "rating": 4, "user_email": "bob@example.com", "place_id": place.id},
+            {"text": "Bad", "rating": 9, "user_email": "alice@example.com", "place_id": place.id},
+            {"text": "Where", "rating": 3, "user_email": "alice@example.com", "place_id": "missing"},
+        ])
+        result = self._import('reviews', path)
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual([(r.text, r.user_id) for r in Review.query.all()], [("Great", bob.id)])
+        self.assertEqual([r['error'] for r in self._rejects(path)], [
+            "This user has already reviewed this place",
+            "Rating must be between 1 and 5",
+            "Unknown place 'missing'",
+        ])
+
+    def test_import_amenities_rejects_existing_names(self):
+        path = self._write('amenities.csv', "name\nSauna\nWiFi\n")
+        result = self._import('amenities', path, '--rejects', os.path.join(self.tmpdir.name, 'bad.ndjson'))
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual(Amenity.query.filter_by(name="Sauna").count(), 1)
+        self.assertEqual(Amenity.query.filter_by(name="WiFi").count(), 1)
+        self.assertTrue(os.path.exists(os.path.join(self.tmpdir.name, 'bad.ndjson')))
@@ -0,0 +1,115 @@
+import threading
+import unittest
+from app import create_app
+from app.extensions import db, metrics
+from app.models.place import Place
+from app.models.user import User
+
+
+def parse_metrics(body):
+    """Map 'name{labels}' to its value for every sample of a /metrics response."""
+    samples = {}
+    for line in body.splitlines():
+        if line and not line.startswith('#'):
+            key, value = line.rsplit(' ', 1)
+            samples[key] = float(value)
+    return samples
+
+
+PLACE_ROUTE = 'namespace="places",route="/api/v1/places/<place_id>",method="GET"'
+
+
+class TestMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+
+        owner = User(first_name="Alice", last_name="Smith", email="alice@example.com", password="x")
+        self.place = Place(title="Loft", description="", price=100.0, latitude=0.0, longitude=0.0, owner=owner)
+        db.session.add_all([owner, self.place])
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def scrape(self):
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith('text/plain; version=0.0.4'))
+        return parse_metrics(response.get_data(as_text=True))
+
+    def test_requests_are_counted_per_route_and_status(self):
+        before = self.scrape()
+        self.client.get(f'/api/v1/places/{self.place.id}')
+        self.client.get(f'/api/v1/places/{self.place.id}')
+        self.client.get('/api/v1/places/missing')
+        after = self.scrape()
+
+        def delta(key):
+            return after.get(key, 0) - before.get(key, 0)
+
+        self.assertEqual(delta(f'hbnb_http_requests_total{{{PLACE_ROUTE},status="200"}}'), 2)
+        self.assertEqual(delta(f'hbnb_http_requests_total{{{PLACE_ROUTE},status="404"}}'), 1)
+        self.assertEqual(delta(f'hbnb_http_request_duration_seconds_count{{{PLACE_ROUTE}}}'), 3)
+        self.assertEqual(delta(f'hbnb_http_request_duration_seconds_bucket{{{PLACE_ROUTE},le="+Inf"}}'), 3)
+        self.assertEqual(after[f'hbnb_http_requests_in_flight{{{PLACE_ROUTE}}}'], 0)
+
+    def test_sql_statements_are_attributed_to_the_request(self):
+        before = self.scrape()
+        self.client.get(f'/api/v1/places/{self.place.id}')
+        after = self.scrape()
+        queries = (after[f'hbnb_db_queries_per_request_sum{{{PLACE_ROUTE}}}']
+                   - before.get(f'hbnb_db_queries_per_request_sum{{{PLACE_ROUTE}}}', 0))
+        self.assertGreaterEqual(queries, 1)
+        self.assertGreaterEqual(after['hbnb_db_query_duration_seconds_count']
+                                - before['hbnb_db_query_duration_seconds_count'], queries)
+        self.assertGreater(after['hbnb_db_pool_checkout_seconds_count'], 0)
+
+    def test_unmatched_urls_share_one_label_set(self):
+        self.client.get('/api/v1/unknown/1')
+        self.client.get('/api/v1/unknown/2')
+        samples = self.scrape()
+        self.assertGreaterEqual(samples['hbnb_http_requests_total{namespace="",route="<unmatched>",'
+                                        'method="GET",status="404"}'], 2)
+        self.assertFalse([key for key in samples if 'unknown' in key])
+
+    def test_threads_do_not_lose_or_leak_values(self):
+        key = f'hbnb_http_requests_total{{{PLACE_ROUTE},status="200"}}'
+        before = self.scrape().get(key, 0)
+        url = f'/api/v1/places/{self.place.id}'
+
+        def get_place():
+            client = self.app.test_client()
+            for _ in range(5):
+                client.get(url)
+
+        threads = [threading.Thread(target=get_place) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.scrape()[key] - before, 40)
+        self.assertFalse([shard for shard in metrics._shards if not shard.thread.is_alive()])
+
+    def test_metrics_can_be_disabled(self):
+        class Config:
+            TESTING = True
+            SQLALCHEMY_DATABASE_URI = 'sqlite://'
+            PASSWORD_HASH_WORKERS = 0
+            METRICS_ENABLED = False
+
+        self.assertEqual(create_app(Config).test_client().get('/metrics').status_code, 404)
+
+    def test_scrapes_need_the_token_when_one_is_set(self):
+        self.app.config['METRICS_TOKEN'] = 's3cret'
+        self.assertEqual(self.client.get('/metrics').status_code, 401)
+        response = self.client.get('/metrics', headers={'Authorization': 'Bearer wrong'})
+        self.assertEqual(response.status_code, 401)
+        response = self.client.get('/metrics', headers={'Authorization': 'Bearer s3cret'})
+        self.assertEqual(response.status_code, 200)
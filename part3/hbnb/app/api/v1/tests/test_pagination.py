@@ -0,0 +1,91 @@
+import unittest
+from datetime import datetime, timedelta
+from flask_jwt_extended import create_access_token
+from app import create_app
+from app.extensions import db
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+
+
+class TestPagination(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def _seed_places(self, count):
+        owner = User(first_name="Alice", last_name="Smith", email="alice@example.com", password="x")
+        db.session.add(owner)
+        start = datetime(2026, 1, 1)
+        for i in range(count):
+            place = Place(title=f"Place {i}", description="", price=10.0 + i,
+                          latitude=0.0, longitude=0.0, owner=owner)
+            # Give half of the places the same timestamp to exercise the id tie-breaker
+            place.created_at = start + timedelta(seconds=i // 2)
+            db.session.add(place)
+        db.session.commit()
+        return owner
+
+    def _collect(self, url, key, limit, headers=None):
+        seen, cursor = [], None
+        while True:
+            query = f'{url}?limit={limit}' + (f'&cursor={cursor}' if cursor else '')
+            response = self.client.get(query, headers=headers)
+            self.assertEqual(response.status_code, 200)
+            data = response.get_json()
+            self.assertLessEqual(len(data[key]), limit)
+            seen.extend(item['id'] for item in data[key])
+            cursor = data['next_cursor']
+            if cursor is None:
+                return seen
+
+    def test_places_pages_cover_every_row_once(self):
+        self._seed_places(7)
+        seen = self._collect('/api/v1/places/', 'places', 3)
+        self.assertEqual(len(seen), 7)
+        self.assertEqual(len(set(seen)), 7)
+        expected = [p.id for p in Place.query.order_by(Place.created_at, Place.id).all()]
+        self.assertEqual(seen, expected)
+
+    def test_reviews_users_and_amenities_are_paginated(self):
+        owner = self._seed_places(1)
+        place = Place.query.first()
+        for i in range(3):
+            user = User(first_name="Bob", last_name="Martin", email=f"bob{i}@example.com", password="x")
+            db.session.add(Review(text="Nice", rating=4, place=place, user=user))
+            db.session.add(Amenity(name=f"Amenity {i}"))
+        db.session.commit()
+
+        self.assertEqual(len(self._collect('/api/v1/reviews/', 'reviews', 2)), 3)
+        self.assertEqual(len(self._collect('/api/v1/amenities/', 'amenities', 2)), 3)
+        admin_headers = {'Authorization': 'Bearer ' + create_access_token(
+            identity='admin', additional_claims={'is_admin': True})}
+        self.assertEqual(len(self._collect('/api/v1/users/', 'users', 2, admin_headers)), 4)
+        self.assertEqual(self.client.get('/api/v1/users/').status_code, 401)
+        user_headers = {'Authorization': 'Bearer ' + create_access_token(identity=owner.id)}
+        self.assertEqual(self.client.get('/api/v1/users/', headers=user_headers).status_code, 403)
+
+    def test_unpaginated_list_is_unchanged(self):
+        self._seed_places(3)
+        response = self.client.get('/api/v1/places/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.get_json()), 3)
+
+    def test_invalid_cursor(self):
+        response = self.client.get('/api/v1/places/?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('error', response.get_json())
+
+    def test_limit_out_of_range(self):
+        response = self.client.get('/api/v1/places/?limit=0')
+        self.assertEqual(response.status_code, 400)
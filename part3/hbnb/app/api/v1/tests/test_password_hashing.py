@@ -0,0 +1,86 @@
+import unittest
+from app import create_app
+from app.extensions import db, password_hasher
+from app.models.user import User
+from app.password_hasher import PasswordHasher
+
+
+class PoolTestingConfig:
+    TESTING = True
+    SECRET_KEY = 'test'
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    BCRYPT_LOG_ROUNDS = 4
+    PASSWORD_HASH_WORKERS = 1
+
+
+class TestPasswordHashing(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def _create_user(self, rounds):
+        password_hasher.rounds = rounds
+        user = User(first_name="Alice", last_name="Smith", email="alice@example.com", password="x")
+        user.hash_password("secret123")
+        db.session.add(user)
+        db.session.commit()
+        password_hasher.rounds = self.app.config['BCRYPT_LOG_ROUNDS']
+        return user
+
+    def _login(self, password="secret123"):
+        return self.client.post('/api/v1/auth/login', json={
+            "email": "alice@example.com",
+            "password": password
+        })
+
+    def test_hash_uses_configured_cost(self):
+        user = self._create_user(rounds=4)
+        self.assertTrue(user.password.startswith('$2b$04$'))
+        self.assertFalse(user.password_needs_rehash())
+        self.assertTrue(user.verify_password("secret123"))
+        self.assertFalse(user.verify_password("wrong"))
+
+    def test_login_rehashes_outdated_cost(self):
+        self._create_user(rounds=5)
+        response = self._login()
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('access_token', response.get_json())
+        db.session.expire_all()
+        user = User.query.filter_by(email="alice@example.com").first()
+        self.assertTrue(user.password.startswith('$2b$04$'))
+        self.assertEqual(self._login().status_code, 200)
+
+    def test_failed_login_keeps_hash(self):
+        user = self._create_user(rounds=5)
+        original = user.password
+        self.assertEqual(self._login("wrong").status_code, 401)
+        db.session.expire_all()
+        self.assertEqual(User.query.first().password, original)
+
+
+class TestPasswordHasherPool(unittest.TestCase):
+
+    def test_hash_and_verify_in_process_pool(self):
+        hasher = PasswordHasher(create_app(PoolTestingConfig))
+        try:
+            hashed = hasher.hash("secret123")
+            self.assertTrue(hashed.startswith('$2b$04$'))
+            self.assertTrue(hasher.verify("secret123", hashed))
+            self.assertFalse(hasher.verify("wrong", hashed))
+            # Forking the multithreaded server process could deadlock
+            self.assertNotEqual(hasher._get_executor()._mp_context.get_start_method(), 'fork')
+        finally:
+            hasher.shutdown()
+
+    def test_needs_rehash_on_malformed_hash(self):
+        self.assertTrue(PasswordHasher().needs_rehash("not-a-bcrypt-hash"))
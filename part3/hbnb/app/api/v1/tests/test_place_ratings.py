@@ -0,0 +1,120 @@
+import unittest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import inspect, text
+from app import create_app
+from app.extensions import db
+from app.models.place import Place
+from app.models.user import User
+from app.persistence.ratings import add_rating_columns
+from app.services import facade
+
+
+class TestPlaceRatings(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.runner = self.app.test_cli_runner()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+
+        owner = User(first_name="Alice", last_name="Smith", email="alice@example.com", password="x")
+        self.bob = User(first_name="Bob", last_name="Martin", email="bob@example.com", password="x")
+        self.carol = User(first_name="Carol", last_name="Jones", email="carol@example.com", password="x")
+        self.loft = Place(title="Loft", description="", price=80.0, latitude=0.0, longitude=0.0, owner=owner)
+        self.studio = Place(title="Studio", description="", price=40.0, latitude=0.0, longitude=0.0, owner=owner)
+        db.session.add_all([owner, self.bob, self.carol, self.loft, self.studio])
+        db.session.commit()
+        self.loft_id, self.studio_id = self.loft.id, self.studio.id
+        self.bob_headers = {'Authorization': f'Bearer {create_access_token(identity=self.bob.id)}'}
+        self.carol_headers = {'Authorization': f'Bearer {create_access_token(identity=self.carol.id)}'}
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def _review(self, headers, place_id, rating):
+        response = self.client.post('/api/v1/reviews/', headers=headers, json={
+            "text": "Review", "rating": rating, "place_id": place_id})
+        self.assertEqual(response.status_code, 201)
+        return response.get_json()['id']
+
+    def _aggregates(self, place_id):
+        data = self.client.get('/api/v1/places/', query_string={'limit': 10}).get_json()['places']
+        place = next(p for p in data if p['id'] == place_id)
+        return place['review_count'], place['rating_sum'], place['average_rating']
+
+    def test_new_place_has_no_rating(self):
+        self.assertEqual(self._aggregates(self.loft_id), (0, 0, None))
+
+    def test_create_update_delete_review(self):
+        bob_review = self._review(self.bob_headers, self.loft_id, 5)
+        self._review(self.carol_headers, self.loft_id, 2)
+        self.assertEqual(self._aggregates(self.loft_id), (2, 7, 3.5))
+
+        response = self.client.put(f'/api/v1/reviews/{bob_review}', headers=self.bob_headers,
+                                   json={"text": "Changed my mind", "rating": 3, "place_id": self.loft_id})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._aggregates(self.loft_id), (2, 5, 2.5))
+
+        response = self.client.delete(f'/api/v1/reviews/{bob_review}', headers=self.bob_headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._aggregates(self.loft_id), (1, 2, 2.0))
+        self.assertEqual(self.client.get(f'/api/v1/places/{self.loft_id}').get_json()['average_rating'], 2.0)
+
+    def test_rejected_review_leaves_aggregates_untouched(self):
+        self._review(self.bob_headers, self.loft_id, 4)
+        response = self.client.post('/api/v1/reviews/', headers=self.bob_headers, json={
+            "text": "Again", "rating": 1, "place_id": self.loft_id})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self._aggregates(self.loft_id), (1, 4, 4.0))
+
+    def test_bulk_reviews_update_aggregates(self):
+        facade.create_reviews([
+            {"text": "A", "rating": 4, "user_id": self.bob.id, "place_id": self.studio_id},
+            {"text": "B", "rating": 1, "user_id": self.carol.id, "place_id": self.studio_id},
+            {"text": "C", "rating": 5, "user_id": self.bob.id, "place_id": self.loft_id},
+        ])
+        self.assertEqual(self._aggregates(self.studio_id), (2, 5, 2.5))
+        self.assertEqual(self._aggregates(self.loft_id), (1, 5, 5.0))
+
+    def test_sort_by_rating(self):
+        self._review(self.bob_headers, self.studio_id, 5)
+        self._review(self.bob_headers, self.loft_id, 3)
+        self._review(self.carol_headers, self.loft_id, 4)
+        response = self.client.get('/api/v1/places/', query_string={'sort': 'rating_desc', 'limit': 1})
+        page = response.get_json()
+        self.assertEqual([p['title'] for p in page['places']], ['Studio'])
+        page = self.client.get('/api/v1/places/', query_string={
+            'sort': 'rating_desc', 'limit': 1, 'cursor': page['next_cursor']}).get_json()
+        self.assertEqual([p['title'] for p in page['places']], ['Loft'])
+        response = self.client.get('/api/v1/places/', query_string={'sort': 'reviews_desc'})
+        self.assertEqual([p['title'] for p in response.get_json()], ['Loft', 'Studio'])
+
+    def test_rebuild_command_repairs_drift(self):
+        self._review(self.bob_headers, self.loft_id, 4)
+        db.session.execute(text("UPDATE places SET review_count = 7, rating_sum = 1, average_rating = 0.1"))
+        db.session.commit()
+        result = self.runner.invoke(args=['hbnb', 'rebuild-ratings'])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('Fixed the rating aggregates of 2 place(s)', result.output)
+        self.assertEqual(self._aggregates(self.loft_id), (1, 4, 4.0))
+        self.assertEqual(self._aggregates(self.studio_id), (0, 0, None))
+        result = self.runner.invoke(args=['hbnb', 'rebuild-ratings'])
+        self.assertIn('of 0 place(s)', result.output)
+
+    def test_add_rating_columns_to_old_table(self):
+        self._review(self.bob_headers, self.loft_id, 4)
+        with db.engine.begin() as connection:
+            for index in ('idx_places_average_rating_id', 'idx_places_review_count_id'):
+                connection.execute(text(f"DROP INDEX {index}"))
+            for column in ('review_count', 'rating_sum', 'average_rating'):
+                connection.execute(text(f"ALTER TABLE places DROP COLUMN {column}"))
+            add_rating_columns(connection)
+            add_rating_columns(connection)
+            indexes = {index['name'] for index in inspect(connection).get_indexes('places')}
+        db.session.expire_all()
+        self.assertEqual(self._aggregates(self.loft_id), (1, 4, 4.0))
+        self.assertLessEqual({'idx_places_average_rating_id', 'idx_places_review_count_id'}, indexes)
@@ -0,0 +1,58 @@
+import unittest
+from app import create_app
+from app.extensions import db
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+
+
+class TestPlaceReviews(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+
+        owner = User(first_name="Alice", last_name="Smith", email="alice@example.com", password="x")
+        self.place = Place(title="Nice Place", description="", price=50.0,
+                           latitude=0.0, longitude=0.0, owner=owner)
+        other = Place(title="Other Place", description="", price=50.0,
+                      latitude=0.0, longitude=0.0, owner=owner)
+        reviewers = [User(first_name="Bob", last_name="Martin", email=f"bob{i}@example.com", password="x")
+                     for i in range(5)]
+        reviews = [Review(text="Nice", rating=4, place=self.place, user=user) for user in reviewers]
+        reviews.append(Review(text="Meh", rating=2, place=other, user=reviewers[0]))
+        db.session.add_all([owner, self.place, other, *reviewers, *reviews])
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def test_get_place_reviews(self):
+        response = self.client.get(f'/api/v1/places/{self.place.id}/reviews')
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual(len(data['reviews']), 5)
+        self.assertIsNone(data['next_cursor'])
+        self.assertTrue(all(r['place_id'] == self.place.id for r in data['reviews']))
+
+    def test_get_place_reviews_paginated(self):
+        seen, cursor = [], None
+        while True:
+            url = f'/api/v1/places/{self.place.id}/reviews?limit=2' + (f'&cursor={cursor}' if cursor else '')
+            data = self.client.get(url).get_json()
+            self.assertLessEqual(len(data['reviews']), 2)
+            seen.extend(r['id'] for r in data['reviews'])
+            cursor = data['next_cursor']
+            if cursor is None:
+                break
+        self.assertEqual(len(set(seen)), 5)
+
+    def test_get_place_reviews_place_not_found(self):
+        response = self.client.get('/api/v1/places/nonexistent-id/reviews')
+        self.assertEqual(response.status_code, 404)
+        self.assertIn('error', response.get_json())
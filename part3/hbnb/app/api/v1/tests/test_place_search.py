@@ -0,0 +1,72 @@
+import unittest
+from app import create_app
+from app.extensions import db
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.user import User
+
+
+class TestPlaceSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+
+        owner = User(first_name="Alice", last_name="Smith", email="alice@example.com", password="x")
+        self.wifi = Amenity(name="WiFi")
+        self.pool = Amenity(name="Pool")
+        self.cheap = Place(title="Cheap studio", description="Small but central", price=40.0,
+                           latitude=0.0, longitude=0.0, owner=owner)
+        self.mid = Place(title="Beach house", description="Sea view", price=120.0,
+                         latitude=0.0, longitude=0.0, owner=owner)
+        self.lux = Place(title="Villa", description="Huge villa by the sea", price=300.0,
+                         latitude=0.0, longitude=0.0, owner=owner)
+        self.cheap.add_amenity(self.wifi)
+        self.mid.add_amenity(self.wifi)
+        self.mid.add_amenity(self.pool)
+        self.lux.add_amenity(self.pool)
+        db.session.add_all([owner, self.wifi, self.pool, self.cheap, self.mid, self.lux])
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def _titles(self, query):
+        response = self.client.get(f'/api/v1/places/?{query}')
+        self.assertEqual(response.status_code, 200)
+        return [p['title'] for p in response.get_json()]
+
+    def test_price_range(self):
+        titles = self._titles('min_price=50&max_price=300&sort=price_asc')
+        self.assertEqual(titles, ['Beach house', 'Villa'])
+
+    def test_amenities_must_have_all(self):
+        titles = self._titles(f'amenities={self.wifi.id},{self.pool.id}')
+        self.assertEqual(titles, ['Beach house'])
+
+    def test_text_search_is_case_insensitive(self):
+        titles = self._titles('q=SEA&sort=title')
+        self.assertEqual(titles, ['Beach house', 'Villa'])
+
+    def test_sort_price_desc(self):
+        self.assertEqual(self._titles('sort=price_desc'), ['Villa', 'Beach house', 'Cheap studio'])
+
+    def test_sorted_pages(self):
+        seen, cursor = [], None
+        while True:
+            url = '/api/v1/places/?sort=price_desc&limit=2' + (f'&cursor={cursor}' if cursor else '')
+            data = self.client.get(url).get_json()
+            seen.extend(p['title'] for p in data['places'])
+            cursor = data['next_cursor']
+            if cursor is None:
+                break
+        self.assertEqual(seen, ['Villa', 'Beach house', 'Cheap studio'])
+
+    def test_invalid_sort(self):
+        response = self.client.get('/api/v1/places/?sort=rating')
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,125 @@
+import unittest
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+from app import create_app
+from app.extensions import db
+from app.models.place import Place
+from app.models.user import User
+from app.persistence.fulltext import create_fulltext_index, fulltext_index_is_stale
+from app.services import facade
+
+
+class TestPlaceFullTextSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+
+        self.owner = User(first_name="Alice", last_name="Smith", email="alice@example.com", password="x")
+        self.cottage = Place(title="Seaside cottage", description="Small house by the beach",
+                             price=80.0, latitude=0.0, longitude=0.0, owner=self.owner)
+        self.loft = Place(title="City loft", description="Bright loft, a short walk to the seaside",
+                          price=120.0, latitude=0.0, longitude=0.0, owner=self.owner)
+        self.chalet = Place(title="Mountain chalet", description="Ski-in <ski-out> chalet",
+                            price=200.0, latitude=0.0, longitude=0.0, owner=self.owner)
+        db.session.add_all([self.owner, self.cottage, self.loft, self.chalet])
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def search(self, query):
+        response = self.client.get(f'/api/v1/places/search?{query}')
+        self.assertEqual(response.status_code, 200, response.get_json())
+        return response.get_json()
+
+    def test_title_matches_rank_first(self):
+        data = self.search('q=seaside')
+        self.assertEqual([p['id'] for p in data['places']], [self.cottage.id, self.loft.id])
+        self.assertGreater(data['places'][0]['score'], data['places'][1]['score'])
+        self.assertIsNone(data['next_cursor'])
+
+    def test_prefix_and_accent_insensitive_match(self):
+        self.assertEqual([p['id'] for p in self.search('q=mount')['places']], [self.chalet.id])
+        self.assertEqual([p['id'] for p in self.search('q=Chålet')['places']], [self.chalet.id])
+
+    def test_every_word_must_match(self):
+        self.assertEqual([p['id'] for p in self.search('q=seaside+loft')['places']], [self.loft.id])
+        self.assertEqual(self.search('q=seaside+chalet')['places'], [])
+
+    def test_operators_are_treated_as_text(self):
+        data = self.search('q=chalet OR "loft" NEAR(')
+        self.assertEqual(data['places'], [])
+        response = self.client.get('/api/v1/places/search?q=%22*()')
+        self.assertEqual(response.status_code, 400)
+
+    def test_snippet_is_escaped_and_marked(self):
+        place = self.search('q=ski')['places'][0]
+        self.assertIn('<mark>Ski</mark>', place['snippet'])
+        self.assertIn('&lt;', place['snippet'])
+
+    def test_index_follows_updates_and_deletes(self):
+        facade.update_place(self.chalet.id, {'title': 'Mountain lodge'})
+        self.assertEqual([p['id'] for p in self.search('q=lodge')['places']], [self.chalet.id])
+        db.session.delete(self.cottage)
+        db.session.commit()
+        self.assertEqual([p['id'] for p in self.search('q=seaside')['places']], [self.loft.id])
+
+    def test_index_is_rebuilt_when_rowids_are_renumbered(self):
+        # What a VACUUM may do to the implicit rowids of places
+        db.session.execute(text("UPDATE places SET rowid = rowid + 1000"))
+        db.session.commit()
+        with db.engine.begin() as connection:
+            self.assertTrue(fulltext_index_is_stale(connection))
+            create_fulltext_index(connection)
+            self.assertFalse(fulltext_index_is_stale(connection))
+        data = self.search('q=seaside')
+        self.assertEqual([p['id'] for p in data['places']], [self.cottage.id, self.loft.id])
+
+    def test_bulk_inserted_places_are_indexed(self):
+        facade.create_places([{
+            'title': f'Harbour view {i}', 'description': 'Boats', 'price': 50.0,
+            'latitude': 0.0, 'longitude': 0.0, 'owner_id': self.owner.id,
+        } for i in range(5)])
+        self.assertEqual(len(self.search('q=harbour')['places']), 5)
+        db.session.add(Place(title="Harbour studio", description="", price=40.0,
+                             latitude=0.0, longitude=0.0, owner=self.owner))
+        db.session.commit()
+        self.assertEqual(len(self.search('q=harbour')['places']), 6)
+
+    def test_failed_bulk_insert_keeps_later_places_searchable(self):
+        duplicate = {'id': self.chalet.id, 'title': 'Harbour duplicate', 'description': '', 'price': 50.0,
+                     'latitude': 0.0, 'longitude': 0.0, 'user_id': self.owner.id}
+        with self.assertRaises(IntegrityError):
+            facade.place_repo.add_many([duplicate])
+        studio = Place(title="Harbour studio", description="", price=40.0,
+                       latitude=0.0, longitude=0.0, owner=self.owner)
+        db.session.add(studio)
+        db.session.commit()
+        self.assertEqual([p['id'] for p in self.search('q=harbour')['places']], [studio.id])
+
+    def test_pagination_walks_every_match_once(self):
+        facade.create_places([{
+            'title': 'Garden flat', 'description': 'garden ' * (i % 3), 'price': 50.0,
+            'latitude': 0.0, 'longitude': 0.0, 'owner_id': self.owner.id,
+        } for i in range(12)])
+        seen, cursor = [], None
+        while True:
+            query = 'q=garden&limit=5' + (f'&cursor={cursor}' if cursor else '')
+            data = self.search(query)
+            seen.extend(p['id'] for p in data['places'])
+            cursor = data['next_cursor']
+            if not cursor:
+                break
+        self.assertEqual(len(seen), 12)
+        self.assertEqual(len(set(seen)), 12)
+        self.assertEqual(seen, [p['id'] for p in self.search('q=garden&limit=100')['places']])
+
+    def test_invalid_parameters(self):
+        self.assertEqual(self.client.get('/api/v1/places/search').status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/places/search?q=loft&cursor=bad').status_code, 400)
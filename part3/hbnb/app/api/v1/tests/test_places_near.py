@@ -0,0 +1,78 @@
+import unittest
+from sqlalchemy import text
+from app import create_app
+from app.extensions import db
+from app.models.place import Place
+from app.models.user import User
+from app.persistence.spatial import create_spatial_index, haversine_km, spatial_index_is_stale
+
+
+class TestPlacesNear(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+
+        owner = User(first_name="Alice", last_name="Smith", email="alice@example.com", password="x")
+        db.session.add(owner)
+        for title, lat, lon in [("Paris", 48.8566, 2.3522), ("Versailles", 48.8049, 2.1204),
+                                ("London", 51.5074, -0.1278), ("New York", 40.7128, -74.0060),
+                                ("Fiji East", -17.0, 179.9), ("Fiji West", -17.0, -179.9)]:
+            db.session.add(Place(title=title, description="", price=50.0,
+                                 latitude=lat, longitude=lon, owner=owner))
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def _near(self, query):
+        response = self.client.get(f'/api/v1/places/near?{query}')
+        self.assertEqual(response.status_code, 200)
+        return response.get_json()
+
+    def test_radius_search_sorted_by_distance(self):
+        data = self._near('lat=48.85&lon=2.35&radius_km=50')
+        self.assertEqual([p['title'] for p in data], ['Paris', 'Versailles'])
+        self.assertLess(data[0]['distance_km'], data[1]['distance_km'])
+
+    def test_nearest_k_without_radius(self):
+        data = self._near('lat=48.85&lon=2.35&k=3')
+        self.assertEqual([p['title'] for p in data], ['Paris', 'Versailles', 'London'])
+        expected = haversine_km(48.85, 2.35, 51.5074, -0.1278)
+        self.assertAlmostEqual(data[2]['distance_km'], expected, places=2)
+
+    def test_radius_crossing_the_antimeridian(self):
+        data = self._near('lat=-17&lon=180&radius_km=50')
+        self.assertEqual(sorted(p['title'] for p in data), ['Fiji East', 'Fiji West'])
+
+    def test_index_follows_updates_and_deletes(self):
+        paris = Place.query.filter_by(title="Paris").first()
+        paris.latitude, paris.longitude = 40.7, -74.0
+        db.session.delete(Place.query.filter_by(title="Versailles").first())
+        db.session.commit()
+        self.assertEqual(self._near('lat=48.85&lon=2.35&radius_km=50'), [])
+        data = self._near('lat=40.71&lon=-74.0&radius_km=50')
+        self.assertEqual(sorted(p['title'] for p in data), ['New York', 'Paris'])
+
+    def test_index_is_rebuilt_when_rowids_are_renumbered(self):
+        # What a VACUUM may do to the implicit rowids of places
+        db.session.execute(text("UPDATE places SET rowid = rowid + 1000"))
+        db.session.commit()
+        self.assertEqual(self._near('lat=48.85&lon=2.35&radius_km=50'), [])
+        with db.engine.begin() as connection:
+            self.assertTrue(spatial_index_is_stale(connection))
+            create_spatial_index(connection)
+            self.assertFalse(spatial_index_is_stale(connection))
+        data = self._near('lat=48.85&lon=2.35&radius_km=50')
+        self.assertEqual([p['title'] for p in data], ['Paris', 'Versailles'])
+
+    def test_invalid_coordinates(self):
+        response = self.client.get('/api/v1/places/near?lat=100&lon=0')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get('/api/v1/places/near?lon=0')
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,88 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from sqlalchemy import text
+from app import create_app
+from app.extensions import db
+from app.models.user import User
+from config import ProductionConfig
+
+
+class TestProductionConfig(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        path = os.path.join(self.tmpdir, 'production.db')
+
+        class Config(ProductionConfig):
+            SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+            PASSWORD_HASH_WORKERS = 0
+            BCRYPT_LOG_ROUNDS = 4
+
+        self.app = create_app(Config)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        db.engine.dispose()
+        self.ctx.pop()
+        shutil.rmtree(self.tmpdir)
+
+    def pragma(self, connection, name):
+        return connection.execute(text(f"PRAGMA {name}")).scalar()
+
+    def test_pragmas_are_set_on_every_connection(self):
+        pragmas = ProductionConfig.SQLITE_PRAGMAS
+        # Check out two connections at once so that both are fresh
+        with db.engine.connect() as first, db.engine.connect() as second:
+            for connection in (first, second):
+                self.assertEqual(self.pragma(connection, 'journal_mode'), 'wal')
+                self.assertEqual(self.pragma(connection, 'synchronous'), 1)
+                self.assertEqual(self.pragma(connection, 'busy_timeout'), pragmas['busy_timeout'])
+                self.assertEqual(self.pragma(connection, 'cache_size'), pragmas['cache_size'])
+                self.assertEqual(self.pragma(connection, 'mmap_size'), pragmas['mmap_size'])
+                self.assertEqual(self.pragma(connection, 'foreign_keys'), 1)
+
+    def test_pool_options_come_from_the_config(self):
+        options = ProductionConfig.SQLALCHEMY_ENGINE_OPTIONS
+        self.assertEqual(db.engine.pool.size(), options['pool_size'])
+        self.assertEqual(db.engine.pool._max_overflow, options['max_overflow'])
+        self.assertEqual(db.engine.pool._recycle, options['pool_recycle'])
+        self.assertEqual(db.engine.pool._pre_ping, options['pool_pre_ping'])
+
+    @unittest.skipIf('METRICS_ENABLED' in os.environ, 'METRICS_ENABLED is set in the environment')
+    def test_metrics_are_off_by_default(self):
+        self.assertEqual(self.app.test_client().get('/metrics').status_code, 404)
+
+    def test_readers_do_not_block_on_an_open_write(self):
+        db.session.add(User(first_name="Alice", last_name="Smith", email="alice@example.com", password="x"))
+        db.session.commit()
+        engine = db.engine
+        with engine.connect() as writer:
+            # An exclusive lock keeps every reader out unless the database is in WAL mode
+            writer.exec_driver_sql("BEGIN EXCLUSIVE")
+            writer.execute(text("UPDATE users SET first_name = 'Alicia'"))
+            names = []
+
+            def read():
+                with engine.connect() as reader:
+                    names.append(reader.execute(text("SELECT first_name FROM users")).scalar())
+
+            thread = threading.Thread(target=read)
+            thread.start()
+            thread.join(timeout=2)
+            self.assertEqual(names, ['Alice'])
+            writer.rollback()
+
+    def test_foreign_keys_are_enforced(self):
+        with self.assertRaises(Exception):
+            with db.engine.begin() as connection:
+                connection.execute(text(
+                    "INSERT INTO reviews (id, text, rating, user_id, place_id, created_at, updated_at) "
+                    "VALUES ('r1', 'Nice', 5, 'missing', 'missing', CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)"
+                ))
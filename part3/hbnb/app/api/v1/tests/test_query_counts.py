@@ -0,0 +1,129 @@
+import unittest
+from contextlib import contextmanager
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+from app import create_app
+from app.extensions import db
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+from app.services import facade
+
+
+class TestQueryCounts(unittest.TestCase):
+    """Pin the number of SQL statements per endpoint so N+1 loads cannot creep back.
+
+    List endpoints run one extra query for their ETag/Last-Modified validators.
+    """
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+
+        owner = User(first_name="Alice", last_name="Smith", email="alice@example.com", password="x")
+        amenities = [Amenity(name=f"Amenity {i}") for i in range(3)]
+        places = []
+        for i in range(5):
+            place = Place(title=f"Place {i}", description="", price=50.0,
+                          latitude=0.0, longitude=0.0, owner=owner)
+            for amenity in amenities:
+                place.add_amenity(amenity)
+            places.append(place)
+        reviewers = [User(first_name="Bob", last_name="Martin", email=f"bob{i}@example.com", password="x")
+                     for i in range(5)]
+        reviews = [Review(text="Nice", rating=4, place=place, user=user)
+                   for place in places for user in reviewers]
+        db.session.add_all([owner, *amenities, *places, *reviewers, *reviews])
+        db.session.commit()
+        self.place_id = places[0].id
+        self.review_id = reviews[0].id
+        self.user_id = owner.id
+        self.amenity_id = amenities[0].id
+        self.admin_headers = {'Authorization': 'Bearer ' + create_access_token(
+            identity='admin', additional_claims={'is_admin': True})}
+        # Load the token revocation list now rather than inside a counted request
+        facade.revocations.refresh()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    @contextmanager
+    def assertQueryCount(self, expected):
+        statements = []
+
+        def count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        # Start from an empty identity map so lazy loads really hit the database
+        db.session.remove()
+        event.listen(db.engine, 'before_cursor_execute', count)
+        try:
+            yield
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', count)
+        self.assertEqual(len(statements), expected, '\n\n'.join(statements))
+
+    def _get(self, url, headers=None):
+        response = self.client.get(url, headers=headers)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_place_list(self):
+        with self.assertQueryCount(3):
+            self._get('/api/v1/places/')
+
+    def test_place_list_page(self):
+        with self.assertQueryCount(3):
+            self._get('/api/v1/places/?limit=3')
+
+    def test_place_detail(self):
+        with self.assertQueryCount(2):
+            self._get(f'/api/v1/places/{self.place_id}')
+
+    def test_place_reviews(self):
+        with self.assertQueryCount(2):
+            self._get(f'/api/v1/places/{self.place_id}/reviews')
+
+    def test_review_list(self):
+        with self.assertQueryCount(2):
+            self._get('/api/v1/reviews/')
+
+    def test_review_detail(self):
+        with self.assertQueryCount(1):
+            self._get(f'/api/v1/reviews/{self.review_id}')
+
+    def test_user_list(self):
+        with self.assertQueryCount(2):
+            self._get('/api/v1/users/', self.admin_headers)
+
+    def test_user_detail(self):
+        with self.assertQueryCount(1):
+            self._get(f'/api/v1/users/{self.user_id}')
+
+    def test_amenity_list(self):
+        with self.assertQueryCount(2):
+            self._get('/api/v1/amenities/')
+
+    def test_amenity_detail(self):
+        with self.assertQueryCount(1):
+            self._get(f'/api/v1/amenities/{self.amenity_id}')
+
+    def test_place_batch(self):
+        with self.assertQueryCount(3):
+            self._get(f'/api/v1/places/?ids={self.place_id},missing')
+
+    def test_user_batch(self):
+        with self.assertQueryCount(2):
+            self._get(f'/api/v1/users/?ids={self.user_id}', self.admin_headers)
+
+    def test_not_modified_list_skips_loading(self):
+        etag = self._get('/api/v1/places/').headers['ETag']
+        with self.assertQueryCount(1):
+            response = self.client.get('/api/v1/places/', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
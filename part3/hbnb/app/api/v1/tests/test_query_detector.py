@@ -0,0 +1,130 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from app import create_app
+from app.extensions import db, query_detector
+from app.models.place import Place
+from app.models.user import User
+from app.query_detector import QueryIssuesError, normalize_sql
+
+
+class TestNormalizeSql(unittest.TestCase):
+
+    def test_literals_and_parameters_are_replaced(self):
+        self.assertEqual(normalize_sql("SELECT * FROM users WHERE email = 'a@b.c' AND age > 18 LIMIT ?"),
+                         "SELECT * FROM users WHERE email = ? AND age > ? LIMIT ?")
+        self.assertEqual(normalize_sql("SELECT * FROM t1 WHERE id = :id_1\n  AND x = %(x)s"),
+                         "SELECT * FROM t1 WHERE id = ? AND x = ?")
+
+    def test_in_lists_of_any_length_are_the_same_statement(self):
+        self.assertEqual(normalize_sql("SELECT * FROM places WHERE id IN (?, ?)"),
+                         normalize_sql("SELECT * FROM places WHERE id IN (?, ?, ?, ?)"))
+
+
+class TestQueryDetector(unittest.TestCase):
+
+    def create_app(self, **settings):
+        class Config:
+            TESTING = True
+            SQLALCHEMY_DATABASE_URI = 'sqlite://'
+            PASSWORD_HASH_WORKERS = 0
+            QUERY_DETECTOR_ENABLED = True
+            QUERY_DETECTOR_REPORT = self.report_path
+
+        for key, value in settings.items():
+            setattr(Config, key, value)
+        app = create_app(Config)
+
+        @app.route('/owners')
+        def owners():
+            # One lazy load of place.owner per place
+            return {'owners': [place.owner.first_name for place in Place.query.all()]}
+
+        @app.route('/owners/allowed')
+        def allowed_owners():
+            with query_detector.allow_repeats():
+                return owners()
+
+        self.ctx = app.app_context()
+        self.ctx.push()
+        db.create_all()
+        places = [Place(title=f"Place {i}", description="", price=10.0, latitude=0.0, longitude=0.0,
+                        owner=User(first_name=f"Owner{i}", last_name="Smith",
+                                   email=f"owner{i}@example.com", password="x"))
+                  for i in range(4)]
+        db.session.add_all(places)
+        db.session.commit()
+        # Start from an empty identity map so every owner is loaded again
+        db.session.remove()
+        return app.test_client()
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.report_path = os.path.join(self.tmpdir, 'queries.jsonl')
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+        shutil.rmtree(self.tmpdir)
+
+    def reports(self):
+        if not os.path.exists(self.report_path):
+            return []
+        with open(self.report_path) as f:
+            return [json.loads(line) for line in f]
+
+    def test_repeated_statements_are_reported_with_route_and_stack(self):
+        client = self.create_app()
+        with self.assertLogs('app.query_detector', 'WARNING'):
+            self.assertEqual(client.get('/owners').status_code, 200)
+        [report] = self.reports()
+        self.assertEqual(report['route'], '/owners')
+        self.assertEqual(report['method'], 'GET')
+        self.assertEqual(report['statements'], 5)
+        [issue] = report['issues']
+        self.assertEqual(issue['type'], 'n+1')
+        self.assertEqual(issue['count'], 4)
+        self.assertIn('FROM users WHERE users.id = ?', issue['sql'])
+        self.assertTrue(any(frame.startswith('app/api/v1/tests/test_query_detector.py:')
+                            and frame.endswith('in owners') for frame in issue['stack']))
+
+    def test_strict_mode_fails_the_request(self):
+        client = self.create_app(QUERY_DETECTOR_STRICT=True)
+        with self.assertLogs('app.query_detector', 'WARNING'):
+            with self.assertRaises(QueryIssuesError) as caught:
+                client.get('/owners')
+        self.assertEqual(caught.exception.report['issues'][0]['count'], 4)
+
+    def test_slow_statements_are_reported(self):
+        client = self.create_app(QUERY_DETECTOR_SLOW_MS=0, QUERY_DETECTOR_REPEAT_THRESHOLD=100)
+        with self.assertLogs('app.query_detector', 'WARNING'):
+            client.get('/owners')
+        [report] = self.reports()
+        self.assertEqual([issue['type'] for issue in report['issues']], ['slow'] * 5)
+
+    def test_strict_mode_only_reports_slow_statements(self):
+        client = self.create_app(QUERY_DETECTOR_STRICT=True, QUERY_DETECTOR_SLOW_MS=0,
+                                 QUERY_DETECTOR_REPEAT_THRESHOLD=100)
+        with self.assertLogs('app.query_detector', 'WARNING'):
+            self.assertEqual(client.get('/owners').status_code, 200)
+        [report] = self.reports()
+        self.assertEqual([issue['type'] for issue in report['issues']], ['slow'] * 5)
+
+    def test_allowed_repeats_and_clean_requests_are_not_reported(self):
+        client = self.create_app(QUERY_DETECTOR_STRICT=True)
+        self.assertEqual(client.get('/owners/allowed').status_code, 200)
+        self.assertEqual(client.get('/api/v1/places/').status_code, 200)
+        self.assertEqual(self.reports(), [])
+
+    def test_failed_statements_leave_no_state_on_the_connection(self):
+        self.create_app()
+        with self.assertRaises(OperationalError):
+            db.session.execute(text('SELECT * FROM missing'))
+        db.session.rollback()
+        with db.engine.connect() as conn:
+            self.assertNotIn('query_detector_start', conn.info)
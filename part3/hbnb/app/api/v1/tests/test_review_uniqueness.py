@@ -0,0 +1,91 @@
+import unittest
+from unittest.mock import patch
+from flask_jwt_extended import create_access_token
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import IntegrityError
+from app import create_app
+from app.extensions import db
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+from app.persistence.review_repository import add_review_unique_index
+from app.services import facade
+
+
+class TestReviewUniqueness(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+
+        owner = User(first_name="Alice", last_name="Smith", email="alice@example.com", password="x")
+        self.reviewer = User(first_name="Bob", last_name="Martin", email="bob@example.com", password="x")
+        self.place = Place(title="Nice Place", description="", price=50.0,
+                           latitude=0.0, longitude=0.0, owner=owner)
+        db.session.add_all([owner, self.reviewer, self.place])
+        db.session.commit()
+        self.headers = {'Authorization': f'Bearer {create_access_token(identity=self.reviewer.id)}'}
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def _post_review(self):
+        return self.client.post('/api/v1/reviews/', headers=self.headers, json={
+            "text": "Great place!",
+            "rating": 5,
+            "place_id": self.place.id
+        })
+
+    def test_duplicate_review_is_rejected(self):
+        self.assertEqual(self._post_review().status_code, 201)
+        response = self._post_review()
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json()['error'], 'You have already reviewed this place')
+        self.assertEqual(Review.query.count(), 1)
+
+    def test_database_enforces_uniqueness(self):
+        db.session.add(Review(text="One", rating=4, place=self.place, user=self.reviewer))
+        db.session.commit()
+        db.session.add(Review(text="Two", rating=3, place=self.place, user=self.reviewer))
+        with self.assertRaises(IntegrityError):
+            db.session.commit()
+        db.session.rollback()
+
+    def test_conflict_on_insert_is_reported_as_value_error(self):
+        db.session.add(Review(text="One", rating=4, place=self.place, user=self.reviewer))
+        db.session.commit()
+        # Simulate a concurrent insert that slipped past the EXISTS probe
+        with patch.object(facade.review_repo, 'user_has_reviewed_place', return_value=False):
+            with self.assertRaises(ValueError):
+                facade.create_review({'text': "Two", 'rating': 3,
+                                      'user_id': self.reviewer.id, 'place_id': self.place.id})
+        self.assertEqual(Review.query.count(), 1)
+
+    def test_unique_index_added_to_old_table(self):
+        with db.engine.begin() as connection:
+            connection.execute(text("DROP TABLE reviews"))
+            connection.execute(text(
+                "CREATE TABLE reviews (id VARCHAR(36) PRIMARY KEY, created_at DATETIME, updated_at DATETIME, "
+                "text VARCHAR(500) NOT NULL, rating INTEGER NOT NULL, "
+                "user_id VARCHAR(36) NOT NULL REFERENCES users (id), "
+                "place_id VARCHAR(36) NOT NULL REFERENCES places (id))"
+            ))
+            add_review_unique_index(connection)
+            add_review_unique_index(connection)
+        db.session.add(Review(text="One", rating=4, place=self.place, user=self.reviewer))
+        db.session.commit()
+        db.session.add(Review(text="Two", rating=3, place=self.place, user=self.reviewer))
+        with self.assertRaises(IntegrityError):
+            db.session.commit()
+        db.session.rollback()
+
+    def test_unique_index_not_duplicated_on_new_table(self):
+        with db.engine.begin() as connection:
+            add_review_unique_index(connection)
+            indexes = [index['name'] for index in inspect(connection).get_indexes('reviews')]
+        self.assertNotIn('uq_user_place_review', indexes)
@@ -0,0 +1,99 @@
+import json
+import unittest
+from datetime import datetime
+from flask_jwt_extended import create_access_token
+from app import create_app
+from app.api.v1.serialization import RawJSON, RowSerializer, encode_value
+from app.extensions import db
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+
+
+class TestRowSerializer(unittest.TestCase):
+
+    def test_values_match_json_dumps(self):
+        for value in ['plain', 'é "quoted"\n', '', 0, -12, 2 ** 70, 1.5, 0.1, 1e300, float('nan'),
+                      float('inf'), float('-inf'), True, False, None, datetime(2024, 2, 29, 23, 59, 59, 5)]:
+            expected = json.dumps(value.isoformat() if isinstance(value, datetime) else value)
+            self.assertEqual(encode_value(value), expected, repr(value))
+
+    def test_rows_match_json_dumps(self):
+        serializer = RowSerializer(('name', 'score', '100%', 'nested'))
+        rows = [('a', 1, 1.5, RawJSON('[1, 2]')), ('b"', None, 2, RawJSON('[]')), ('c', 3, float('nan'), RawJSON('{}'))]
+        expected = [json.dumps({'name': row[0], 'score': row[1], '100%': row[2], 'nested': json.loads(row[3])})
+                    for row in rows]
+        self.assertEqual([serializer.encode(row) for row in rows], expected)
+        self.assertEqual(serializer.encode_rows(rows), expected)
+        self.assertEqual(serializer.encode_list(rows), '[' + ', '.join(expected) + ']')
+        self.assertEqual(serializer.encode_list([], key='items', next_cursor=None),
+                         json.dumps({'items': [], 'next_cursor': None}))
+        # Columns beyond the keys' (e.g. the sort column of a page) are left out
+        self.assertEqual(serializer.encode_rows([row + ('extra',) for row in rows]), expected)
+
+
+class TestListSerialization(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+
+        owner = User(first_name="Zoé", last_name="O'Neil", email="zoe@example.com", password="x")
+        amenities = [Amenity(name=name) for name in ("WiFi", "Pool \"heated\"", "Café")]
+        places = []
+        for i in range(6):
+            place = Place(title=f"Place {i}", description="Line\nbreak" if i % 2 else "", price=10.25 * i,
+                          latitude=-i / 3, longitude=i / 7, owner=owner)
+            for amenity in amenities[:i % 4]:
+                place.add_amenity(amenity)
+            places.append(place)
+        guest = User(first_name="Bob", last_name="Martin", email="bob@example.com", password="x")
+        reviews = [Review(text="Très bien", rating=4, place=places[0], user=guest),
+                   Review(text="Good", rating=5, place=places[1], user=guest)]
+        db.session.add_all([owner, guest, *amenities, *places, *reviews])
+        db.session.commit()
+        self.admin_headers = {'Authorization': 'Bearer ' + create_access_token(
+            identity='admin', additional_claims={'is_admin': True})}
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def test_lists_match_to_dict(self):
+        places = json.dumps([place.to_dict() for place in Place.query.all()]) + '\n'
+        amenities = json.dumps({'amenities': [amenity.to_dict() for amenity in Amenity.query.all()]}) + '\n'
+        response = self.client.get('/api/v1/places/')
+        self.assertEqual(response.headers['Content-Type'], 'application/json')
+        self.assertIn('ETag', response.headers)
+        self.assertEqual(response.get_data(as_text=True), places)
+        self.assertEqual(self.client.get('/api/v1/amenities/').get_data(as_text=True), amenities)
+
+    def test_pages_match_lists(self):
+        for url, key in (('/api/v1/places/', 'places'), ('/api/v1/users/', 'users'),
+                         ('/api/v1/reviews/', 'reviews'), ('/api/v1/amenities/', 'amenities')):
+            everything = self.client.get(url, headers=self.admin_headers).get_json()
+            items = everything if key != 'amenities' else everything['amenities']
+            page = self.client.get(f'{url}?limit=4', headers=self.admin_headers).get_json()
+            self.assertEqual(page[key], items[:4], url)
+            if len(items) > 4:
+                rest = self.client.get(f"{url}?limit=4&cursor={page['next_cursor']}",
+                                       headers=self.admin_headers).get_json()
+                self.assertEqual(page[key] + rest[key], items, url)
+
+    def test_debug_output_is_indented_by_flask_restx(self):
+        self.app.debug = True
+        try:
+            response = self.client.get('/api/v1/places/')
+        finally:
+            self.app.debug = False
+        places = [place.to_dict() for place in Place.query.all()]
+        self.assertEqual(response.get_data(as_text=True), json.dumps(places, indent=4) + '\n')
+
+
+if __name__ == '__main__':
+    unittest.main()
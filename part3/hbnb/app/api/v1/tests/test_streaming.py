@@ -0,0 +1,93 @@
+import gzip
+import json
+import unittest
+from unittest.mock import patch
+from flask_jwt_extended import create_access_token
+from app import create_app
+from app.api.v1 import streaming
+from app.extensions import db
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+
+
+class TestStreaming(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+
+        owner = User(first_name="Alice", last_name="Smith", email="alice@example.com", password="x")
+        wifi = Amenity(name="WiFi")
+        places = []
+        for i in range(30):
+            place = Place(title=f"Place {i:02d}", description="", price=float(i),
+                          latitude=0.0, longitude=0.0, owner=owner)
+            place.add_amenity(wifi)
+            places.append(place)
+        reviewers = [User(first_name="Bob", last_name="Martin", email=f"bob{i}@example.com", password="x")
+                     for i in range(3)]
+        reviews = [Review(text="Nice", rating=4, place=place, user=user)
+                   for place in places[:5] for user in reviewers]
+        db.session.add_all([owner, wifi, *places, *reviewers, *reviews])
+        db.session.commit()
+        self.admin_headers = {'Authorization': 'Bearer ' + create_access_token(
+            identity='admin', additional_claims={'is_admin': True})}
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def test_stream_matches_buffered_list(self):
+        for url in ('/api/v1/places/', '/api/v1/reviews/', '/api/v1/users/', '/api/v1/amenities/',
+                    '/api/v1/places/?sort=price_desc&max_price=10'):
+            separator = '&' if '?' in url else '?'
+            streamed = self.client.get(f'{url}{separator}stream=true', headers=self.admin_headers)
+            self.assertEqual(streamed.status_code, 200, url)
+            self.assertEqual(streamed.headers['Vary'], 'Accept-Encoding', url)
+            self.assertEqual(json.loads(streamed.data), self.client.get(url, headers=self.admin_headers).get_json(), url)
+
+    def test_gzip_is_negotiated(self):
+        response = self.client.get('/api/v1/places/?stream=true', headers={'Accept-Encoding': 'gzip, deflate'})
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(response.headers['Vary'], 'Accept-Encoding')
+        places = json.loads(gzip.decompress(response.data))
+        self.assertEqual(len(places), 30)
+
+        response = self.client.get('/api/v1/places/?stream=true', headers={'Accept-Encoding': 'gzip;q=0'})
+        self.assertNotIn('Content-Encoding', response.headers)
+
+    @unittest.skipUnless(streaming.brotli, "brotli is not installed")
+    def test_brotli_is_preferred(self):
+        response = self.client.get('/api/v1/reviews/?stream=true', headers={'Accept-Encoding': 'gzip, br'})
+        self.assertEqual(response.headers['Content-Encoding'], 'br')
+        self.assertEqual(len(json.loads(streaming.brotli.decompress(response.data))), 15)
+
+    def test_body_is_sent_in_chunks(self):
+        with patch.object(streaming, 'STREAM_CHUNK_SIZE', 1024):
+            response = self.client.get('/api/v1/places/?stream=true', headers={'Accept-Encoding': 'gzip'},
+                                       buffered=False)
+            chunks = [chunk for chunk in response.response if chunk]
+            response.close()
+        self.assertGreater(len(chunks), 2)
+        self.assertEqual(len(json.loads(gzip.decompress(b''.join(chunks)))), 30)
+
+    def test_stream_is_ignored_for_pages(self):
+        response = self.client.get('/api/v1/places/?stream=true&limit=5')
+        self.assertNotIn('Vary', response.headers)
+        self.assertEqual(len(response.get_json()['places']), 5)
+
+    def test_etag_depends_on_encoding(self):
+        url = '/api/v1/places/?stream=true'
+        plain = self.client.get(url).headers['ETag']
+        zipped = self.client.get(url, headers={'Accept-Encoding': 'gzip'}).headers['ETag']
+        self.assertNotEqual(plain, zipped)
+        response = self.client.get(url, headers={'Accept-Encoding': 'gzip', 'If-None-Match': zipped})
+        self.assertEqual(response.status_code, 304)
+        response = self.client.get(url, headers={'If-None-Match': zipped})
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,89 @@
+import time
+import unittest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+from app import create_app
+from app.extensions import db
+from app.models.token_revocation import TokenRevocation
+from app.services import facade
+
+
+class TestTokenRevocation(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+
+        self.user = facade.create_user({'first_name': 'Alice', 'last_name': 'Smith',
+                                        'email': 'alice@example.com', 'password': 'secret123'})
+        self.admin_headers = {'Authorization': 'Bearer ' + create_access_token(
+            identity='admin', additional_claims={'is_admin': True})}
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def _login(self):
+        response = self.client.post('/api/v1/auth/login', json={
+            'email': 'alice@example.com', 'password': 'secret123'})
+        self.assertEqual(response.status_code, 200)
+        return {'Authorization': 'Bearer ' + response.get_json()['access_token']}
+
+    def _protected(self, headers):
+        return self.client.get('/api/v1/auth/protected', headers=headers).status_code
+
+    def test_logout_revokes_only_the_current_token(self):
+        headers, other_headers = self._login(), self._login()
+        self.assertEqual(self.client.post('/api/v1/auth/logout', headers=headers).status_code, 200)
+        response = self.client.get('/api/v1/auth/protected', headers=headers)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.get_json(), {'msg': 'Token has been revoked'})
+        self.assertEqual(self._protected(other_headers), 200)
+
+    def test_admin_revokes_every_token_of_a_user(self):
+        headers = self._login()
+        url = f'/api/v1/users/{self.user.id}/tokens'
+        self.assertEqual(self.client.delete(url, headers=headers).status_code, 403)
+        self.assertEqual(self.client.delete(url, headers=self.admin_headers).status_code, 200)
+        self.assertEqual(self._protected(headers), 401)
+        self.assertEqual(self._protected(self.admin_headers), 200)
+        self.assertEqual(self.client.delete('/api/v1/users/missing/tokens',
+                                            headers=self.admin_headers).status_code, 404)
+
+    def test_revocations_of_other_workers_are_picked_up_on_refresh(self):
+        headers = self._login()
+        self.assertEqual(self._protected(headers), 200)
+        # Written by another process: this one only sees it once its list is refreshed
+        db.session.add(TokenRevocation(user_id=self.user.id, revoked_at=int(time.time()),
+                                       expires_at=int(time.time()) + 60))
+        db.session.commit()
+        self.assertEqual(self._protected(headers), 200)
+        facade.revocations._next_refresh = 0
+        self.assertEqual(self._protected(headers), 401)
+
+    def test_checks_do_not_query_the_database(self):
+        headers = self._login()
+        self.assertEqual(self._protected(headers), 200)
+        statements = []
+
+        def count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', count)
+        try:
+            for _ in range(10):
+                self.assertEqual(self._protected(headers), 200)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', count)
+        self.assertEqual(statements, [])
+
+    def test_expired_revocations_are_deleted(self):
+        db.session.add(TokenRevocation(jti='old', user_id=self.user.id, revoked_at=0, expires_at=1))
+        db.session.commit()
+        self.client.post('/api/v1/auth/logout', headers=self._login())
+        self.assertNotIn('old', [revocation.jti for revocation in TokenRevocation.query.all()])
+        self.assertEqual(TokenRevocation.query.count(), 1)
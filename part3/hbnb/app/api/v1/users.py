@@ -1,6 +1,12 @@
 from flask_jwt_extended import get_jwt_identity, jwt_required, get_jwt
 from flask_restx import Namespace, Resource, fields
 from app.services import facade
+from app.api.v1.pagination import pagination_parser, get_page_args
+from app.api.v1.batch import batch_response, get_ids, ids_parser
+from app.api.v1.conditional import collection_validators, entity_validators, not_modified, validator_headers
+from app.api.v1.fieldsets import fields_parser, get_fields, select_fields, sparse_serializer
+from app.api.v1.serialization import RowSerializer, json_response
+from app.api.v1.streaming import negotiate_encoding, stream_json_list, stream_requested
 
 api = Namespace('users', description='User operations')
 
@@ -12,6 +18,9 @@ user_model = api.model('User', {
     'password': fields.String(required=True, description='Password for the user')
 })
 
+# Users as listed by GET /users/, encoded from rows
+USER_LIST_SERIALIZER = RowSerializer(('id', 'first_name', 'last_name', 'email'))
+
 
 @api.route('/')
 class UserList(Resource):
@@ -42,17 +51,69 @@ class UserList(Resource):
 
         return {'id': new_user.id, 'first_name': new_user.first_name, 'last_name': new_user.last_name, 'email': new_user.email}, 201
 
+    @api.expect(pagination_parser, fields_parser, ids_parser)
+    @api.response(200, 'List of users retrieved successfully')
+    @api.response(400, 'Invalid pagination, fields or ids parameters')
+    @api.response(403, 'Admin privileges required')
+    @jwt_required()
+    def get(self):
+        """Retrieve a list of all users, or one page of it with ?limit=&cursor= (admin only)"""
+        current_user = get_jwt()
+
+        # Check if user is an admin
+        if not current_user.get('is_admin', False):
+            return {'error': 'Admin privileges required'}, 403
+
+        page_args = get_page_args()
+        try:
+            serializer = sparse_serializer(USER_LIST_SERIALIZER)
+            ids = get_ids()
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        stream = stream_requested() and ids is None
+        encoding = negotiate_encoding() if stream else None
+        etag, last_modified = collection_validators(facade.get_collection_stats('users'), variant=encoding)
+        cached = not_modified(etag, last_modified)
+        if cached:
+            return cached
+        headers = validator_headers(etag, last_modified)
+        if ids is not None:
+            return batch_response('users', *facade.get_many('users', ids), serializer.keys, headers)
+        if stream:
+            return stream_json_list(facade.iter_rows('users', serializer.columns),
+                                    serializer.encode, encoding, headers=headers, encoded=True)
+        if page_args is None:
+            users = facade.get_rows('users', serializer.columns)
+            return json_response(serializer.encode_list(users), headers=headers)
+        try:
+            users, next_cursor = facade.get_rows_page('users', serializer.columns, *page_args)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        return json_response(serializer.encode_list(users, key='users', next_cursor=next_cursor), headers=headers)
+
 
 @api.route('/<user_id>')
 class UserResource(Resource):
+    @api.expect(fields_parser)
     @api.response(200, 'User details retrieved successfully')
+    @api.response(400, 'Invalid fields parameter')
     @api.response(404, 'User not found')
     def get(self, user_id):
         """Get user details by ID"""
+        try:
+            selected = get_fields(USER_LIST_SERIALIZER.keys)
+        except ValueError as e:
+            return {'error': str(e)}, 400
         user = facade.get_user(user_id)
         if not user:
             return {'error': 'User not found'}, 404
-        return {'id': user.id, 'first_name': user.first_name, 'last_name': user.last_name, 'email': user.email}, 200
+        etag, last_modified = entity_validators(user, variant=selected and ','.join(selected))
+        cached = not_modified(etag, last_modified)
+        if cached:
+            return cached
+        return (select_fields({'id': user.id, 'first_name': user.first_name, 'last_name': user.last_name,
+                               'email': user.email}, selected),
+                200, validator_headers(etag, last_modified))
     
     @api.response(200, 'User updated successfully')
     @api.response(400, 'Invalid input data')
@@ -85,3 +146,23 @@ class UserResource(Resource):
         except (ValueError, TypeError) as e:
             return {'error': str(e)}, 400
         return {'id': updated_user.id, 'first_name': updated_user.first_name, 'last_name': updated_user.last_name, 'email': updated_user.email}, 200
+
+
+@api.route('/<user_id>/tokens')
+class UserTokens(Resource):
+    @api.response(200, 'Tokens revoked')
+    @api.response(403, 'Admin privileges required')
+    @api.response(404, 'User not found')
+    @jwt_required()
+    def delete(self, user_id):
+        """Revoke every token issued to a user so far (admin only)"""
+        current_user = get_jwt()
+
+        if not current_user.get('is_admin', False):
+            return {'error': 'Admin privileges required'}, 403
+
+        if not facade.get_user(user_id):
+            return {'error': 'User not found'}, 404
+
+        facade.revoke_user_tokens(user_id)
+        return {'message': 'Tokens revoked'}, 200
@@ -0,0 +1,53 @@
+import os
+
+import click
+from flask.cli import AppGroup
+
+from app.extensions import db
+from app.persistence.ratings import rebuild_place_ratings
+from app.services import facade
+from app.services.importer import DEFAULT_CHUNK_SIZE, IMPORT_FORMATS, IMPORT_KINDS, Importer, read_rows
+
+hbnb_cli = AppGroup('hbnb', help='HBnB maintenance commands.')
+
+
+@hbnb_cli.command('import')
+@click.argument('kind', type=click.Choice(IMPORT_KINDS))
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'fmt', type=click.Choice(IMPORT_FORMATS),
+              help='File format; guessed from the extension by default.')
+@click.option('--chunk-size', type=click.IntRange(min=1), default=DEFAULT_CHUNK_SIZE, show_default=True,
+              help='Rows validated and committed together.')
+@click.option('--rejects', 'rejects_path', type=click.Path(dir_okay=False),
+              help='Where to write rejected rows (default: <path>.rejects.ndjson).')
+def import_command(kind, path, fmt, chunk_size, rejects_path):
+    """Stream users, amenities, places or reviews from an NDJSON or CSV file."""
+    if fmt is None:
+        fmt = 'csv' if path.lower().endswith('.csv') else 'ndjson'
+    rejects_path = rejects_path or f'{path}.rejects.ndjson'
+
+    def progress(stats):
+        click.echo(f"{kind}: {stats['imported']} imported, {stats['rejected']} rejected "
+                   f"({stats['rows_per_second']:,.0f} rows/s)", err=True)
+
+    with open(path, newline='', encoding='utf-8') as source, \
+            open(rejects_path, 'w', encoding='utf-8') as rejects:
+        importer = Importer(kind, facade, chunk_size=chunk_size, rejects=rejects, progress=progress)
+        stats = importer.run(read_rows(source, fmt, kind))
+
+    click.echo(f"Imported {stats['imported']} {kind} in {stats['seconds']:.1f}s "
+               f"({stats['rows_per_second']:,.0f} rows/s), rejected {stats['rejected']}")
+    if stats['rejected']:
+        click.echo(f"Rejected rows written to {rejects_path}")
+    else:
+        os.remove(rejects_path)
+
+
+@hbnb_cli.command('rebuild-ratings')
+def rebuild_ratings_command():
+    """Recompute the review count and rating of every place from the reviews table."""
+    with db.engine.begin() as connection:
+        fixed = rebuild_place_ratings(connection)
+    if facade.cache:
+        facade.cache.clear()
+    click.echo(f"Fixed the rating aggregates of {fixed} place(s)")
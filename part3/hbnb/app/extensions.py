@@ -1,7 +1,13 @@
 from flask_bcrypt import Bcrypt
 from flask_jwt_extended import JWTManager
 from flask_sqlalchemy import SQLAlchemy
+from app.metrics import Metrics
+from app.password_hasher import PasswordHasher
+from app.query_detector import QueryDetector
 
 bcrypt = Bcrypt()
 jwt = JWTManager()
 db = SQLAlchemy()
+password_hasher = PasswordHasher()
+metrics = Metrics()
+query_detector = QueryDetector()
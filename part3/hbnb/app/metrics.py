@@ -0,0 +1,279 @@
+import bisect
+import hmac
+import threading
+import time
+
+from flask import Response, current_app, request
+from sqlalchemy import event
+
+# Upper bounds of the histogram buckets; +Inf is implicit
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 500)
+
+# name -> (type, help, buckets)
+METRICS = {
+    'hbnb_http_requests_total': ('counter', 'HTTP requests by route, method and status', None),
+    'hbnb_http_requests_in_flight': ('gauge', 'HTTP requests being processed', None),
+    'hbnb_http_request_duration_seconds': ('histogram', 'HTTP request latency', LATENCY_BUCKETS),
+    'hbnb_db_queries_per_request': ('histogram', 'SQL statements run by one HTTP request', QUERY_COUNT_BUCKETS),
+    'hbnb_db_query_seconds_per_request': ('histogram', 'Time spent in SQL by one HTTP request', LATENCY_BUCKETS),
+    'hbnb_db_query_duration_seconds': ('histogram', 'SQL statement latency', LATENCY_BUCKETS),
+    'hbnb_db_pool_checkout_seconds': ('histogram', 'Time to get a connection from the pool', LATENCY_BUCKETS),
+}
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class _Shard:
+    """Metric values recorded by one thread; only that thread writes to it."""
+
+    __slots__ = ('thread', 'values', 'histograms')
+
+    def __init__(self, thread):
+        self.thread = thread
+        # (name, labels) -> value
+        self.values = {}
+        # (name, labels) -> [count per bucket..., count above the last bucket, sum]
+        self.histograms = {}
+
+    def merge(self, other):
+        for key, value in other.values.items():
+            self.values[key] = self.values.get(key, 0) + value
+        for key, counts in other.histograms.items():
+            mine = self.histograms.get(key)
+            if mine is None:
+                self.histograms[key] = list(counts)
+            else:
+                for i, count in enumerate(counts):
+                    mine[i] += count
+
+
+def _route_labels(rule, method):
+    """(namespace, route, method) labels; unmatched URLs share one label set."""
+    parts = rule.split('/')
+    namespace = parts[3] if rule.startswith('/api/v1/') and len(parts) > 3 else ''
+    return namespace, rule, method
+
+
+def _format_labels(names, values):
+    if not names:
+        return ''
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for v in values)
+    return '{' + ','.join(f'{n}="{v}"' for n, v in zip(names, escaped)) + '}'
+
+
+class Metrics:
+    """Request, SQL and pool metrics served at /metrics in the Prometheus text format.
+
+    Config keys:
+    - METRICS_ENABLED: record metrics and serve /metrics (default True,
+      False in ProductionConfig).
+    - METRICS_TOKEN: when set, /metrics answers 401 unless the scrape sends
+      `Authorization: Bearer <token>`.
+
+    Every thread records into its own shard, so the request path never
+    takes a lock. A scrape merges the shards; shards of finished threads
+    are folded into one, so memory does not grow with the thread count.
+    """
+
+    ROUTE_LABELS = ('namespace', 'route', 'method')
+
+    def __init__(self, app=None):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._shards = []
+        self._retired = _Shard(None)
+        # (route, method) -> labels, to build each label tuple once
+        self._labels = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        from app.extensions import db
+        if not app.config.get('METRICS_ENABLED', True):
+            return
+        with app.app_context():
+            self.instrument_engine(db.engine)
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+        app.add_url_rule('/metrics', 'metrics', self._serve)
+
+    def instrument_engine(self, engine):
+        """Time the engine's statements and its pool checkouts.
+
+        Statements are timed from the dialect's do_execute hooks: connection
+        events (before/after_cursor_execute) would make every Connection
+        join the engine's dispatch, which costs more than the timing itself.
+        """
+        dialect = engine.dialect
+
+        def do_execute(cursor, statement, parameters, context):
+            self._timed(dialect.do_execute, cursor, statement, parameters, context)
+            return True
+
+        def do_executemany(cursor, statement, parameters, context):
+            self._timed(dialect.do_executemany, cursor, statement, parameters, context)
+            return True
+
+        def do_execute_no_params(cursor, statement, context):
+            self._timed(dialect.do_execute_no_params, cursor, statement, context)
+            return True
+
+        event.listen(engine, 'do_execute', do_execute)
+        event.listen(engine, 'do_executemany', do_executemany)
+        event.listen(engine, 'do_execute_no_params', do_execute_no_params)
+        self._instrument_checkout(engine)
+
+    # --- Recording (hot path, lock-free) ---------------------------------
+
+    def _shard(self):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = self._new_shard()
+        return shard
+
+    def _new_shard(self):
+        shard = _Shard(threading.current_thread())
+        with self._lock:
+            self._retire_dead_shards()
+            self._shards.append(shard)
+        return shard
+
+    def inc(self, name, labels=(), value=1):
+        values = self._shard().values
+        key = (name, labels)
+        values[key] = values.get(key, 0) + value
+
+    def observe(self, name, value, labels=()):
+        histograms = self._shard().histograms
+        key = (name, labels)
+        counts = histograms.get(key)
+        buckets = METRICS[name][2]
+        if counts is None:
+            counts = histograms[key] = [0] * (len(buckets) + 1) + [0]
+        counts[bisect.bisect_left(buckets, value)] += 1
+        counts[-1] += value
+
+    def _before_request(self):
+        rule = request.url_rule
+        key = (rule.rule if rule is not None else '<unmatched>', request.method)
+        labels = self._labels.get(key)
+        if labels is None:
+            labels = self._labels[key] = _route_labels(*key)
+        # [labels, start, status, SQL statements, SQL seconds]
+        self._local.request = [labels, time.perf_counter(), None, 0, 0.0]
+        self.inc('hbnb_http_requests_in_flight', labels)
+
+    def _after_request(self, response):
+        current = getattr(self._local, 'request', None)
+        if current is not None:
+            current[2] = response.status_code
+        return response
+
+    def _teardown_request(self, exc):
+        current = getattr(self._local, 'request', None)
+        if current is None:
+            return
+        self._local.request = None
+        labels, start, status, queries, query_seconds = current
+        self.inc('hbnb_http_requests_in_flight', labels, -1)
+        status = status if status is not None and exc is None else 500
+        self.inc('hbnb_http_requests_total', labels + (str(status),))
+        self.observe('hbnb_http_request_duration_seconds', time.perf_counter() - start, labels)
+        self.observe('hbnb_db_queries_per_request', queries, labels)
+        self.observe('hbnb_db_query_seconds_per_request', query_seconds, labels)
+
+    def _timed(self, execute, *args):
+        start = time.perf_counter()
+        try:
+            execute(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.observe('hbnb_db_query_duration_seconds', elapsed)
+            current = getattr(self._local, 'request', None)
+            if current is not None:
+                current[3] += 1
+                current[4] += elapsed
+
+    def _instrument_checkout(self, engine):
+        # Wraps the engine rather than its pool, which dispose() replaces
+        raw_connection = engine.raw_connection
+
+        def timed_raw_connection():
+            start = time.perf_counter()
+            try:
+                return raw_connection()
+            finally:
+                self.observe('hbnb_db_pool_checkout_seconds', time.perf_counter() - start)
+
+        engine.raw_connection = timed_raw_connection
+
+    # --- Exposition -------------------------------------------------------
+
+    def _retire_dead_shards(self):
+        """Fold the shards of finished threads into one. Caller holds the lock."""
+        alive = []
+        for shard in self._shards:
+            if shard.thread.is_alive():
+                alive.append(shard)
+            else:
+                self._retired.merge(shard)
+        self._shards = alive
+
+    def snapshot(self):
+        """Merge every shard into one _Shard holding the current totals."""
+        total = _Shard(None)
+        with self._lock:
+            self._retire_dead_shards()
+            total.merge(self._retired)
+            shards = list(self._shards)
+        for shard in shards:
+            # Copies are taken under the GIL, so a concurrent write is either in or out
+            copy = _Shard(None)
+            copy.values = shard.values.copy()
+            copy.histograms = {key: list(counts) for key, counts in shard.histograms.copy().items()}
+            total.merge(copy)
+        return total
+
+    def render(self):
+        """Return every metric in the Prometheus text exposition format."""
+        total = self.snapshot()
+        lines = []
+        for name, (kind, help_text, buckets) in METRICS.items():
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            label_names = self._label_names(name)
+            if kind != 'histogram':
+                for (key_name, labels), value in sorted(total.values.items()):
+                    if key_name == name:
+                        lines.append(f'{name}{_format_labels(label_names, labels)} {value}')
+                continue
+            for (key_name, labels), counts in sorted(total.histograms.items()):
+                if key_name != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(buckets + (float('inf'),), counts):
+                    cumulative += count
+                    le = '+Inf' if bound == float('inf') else repr(float(bound))
+                    lines.append(f'{name}_bucket{_format_labels(label_names + ("le",), labels + (le,))} '
+                                 f'{cumulative}')
+                lines.append(f'{name}_sum{_format_labels(label_names, labels)} {counts[-1]}')
+                lines.append(f'{name}_count{_format_labels(label_names, labels)} {cumulative}')
+        return '\n'.join(lines) + '\n'
+
+    def _label_names(self, name):
+        if name == 'hbnb_http_requests_total':
+            return self.ROUTE_LABELS + ('status',)
+        if name.startswith('hbnb_http_') or name.endswith('_per_request'):
+            return self.ROUTE_LABELS
+        return ()
+
+    def _serve(self):
+        token = current_app.config.get('METRICS_TOKEN')
+        if token:
+            given = request.headers.get('Authorization', '').encode('utf-8')
+            if not hmac.compare_digest(given, f'Bearer {token}'.encode('utf-8')):
+                return Response('Unauthorized\n', status=401, content_type='text/plain',
+                                headers={'WWW-Authenticate': 'Bearer'})
+        return Response(self.render(), content_type=CONTENT_TYPE)
@@ -1,10 +1,13 @@
 from .base_model import BaseModel
 from app.extensions import db
 from sqlalchemy.orm import validates, relationship
-from sqlalchemy import Column, String
+from sqlalchemy import Column, Index, String
 
 class Amenity(BaseModel):
 	__tablename__ = 'amenities'
+	__table_args__ = (
+		Index('idx_amenities_created_at_id', 'created_at', 'id'),
+	)
 
 	name = Column(String(100), nullable=False)
 	places = relationship('Place', secondary='place_amenity', back_populates='amenities')
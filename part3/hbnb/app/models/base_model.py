@@ -16,6 +16,22 @@ class BaseModel(db.Model):
         self.created_at = datetime.now()
         self.updated_at = datetime.now()
 
+    @classmethod
+    def validate_fields(cls, data):
+        """Run the model's @validates hooks on a dict of attribute values.
+
+        Lets bulk paths apply the same rules as the constructor without
+        building an ORM instance per row. Returns the normalized values.
+        """
+        validators = cls.__mapper__.validators
+        validated = dict(data)
+        for key, value in data.items():
+            if key in validators:
+                validator, _ = validators[key]
+                # The hooks only look at their arguments, never at the instance
+                validated[key] = validator(None, key, value)
+        return validated
+
     def save(self):
         """Update the updated_at timestamp whenever the object is modified"""
         self.updated_at = datetime.now()
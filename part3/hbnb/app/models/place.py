@@ -1,16 +1,24 @@
 from .base_model import BaseModel
 from sqlalchemy.orm import validates
-from sqlalchemy import Column, String, ForeignKey, Float
+from sqlalchemy import Column, String, ForeignKey, Float, Index, Integer
 from sqlalchemy.orm import relationship, synonym
 from app.extensions import db
 
 place_amenity = db.Table('place_amenity',
     Column('place_id', String(36), db.ForeignKey('places.id'), primary_key=True),
-    Column('amenity_id', String(36), db.ForeignKey('amenities.id'), primary_key=True)
+    Column('amenity_id', String(36), db.ForeignKey('amenities.id'), primary_key=True),
+    Index('idx_place_amenity_amenity_id', 'amenity_id')
 )
 
 class Place(BaseModel):
     __tablename__ = 'places'
+    __table_args__ = (
+        Index('idx_places_created_at_id', 'created_at', 'id'),
+        Index('idx_places_price_id', 'price', 'id'),
+        Index('idx_places_title_id', 'title', 'id'),
+        Index('idx_places_average_rating_id', 'average_rating', 'id'),
+        Index('idx_places_review_count_id', 'review_count', 'id'),
+    )
 
     title = Column(String(100), nullable=False)
     description = Column(String(500), nullable=True)
@@ -18,6 +26,11 @@ class Place(BaseModel):
     latitude = Column(Float, nullable=False)
     longitude = Column(Float, nullable=False)
     user_id = Column(String(36), ForeignKey('users.id'), nullable=False)
+    # Rating aggregates, kept up to date by app.persistence.ratings.
+    # average_rating is rating_sum / review_count, stored so that it can be sorted on (0 without reviews).
+    review_count = Column(Integer, nullable=False, default=0, server_default='0')
+    rating_sum = Column(Integer, nullable=False, default=0, server_default='0')
+    average_rating = Column(Float, nullable=False, default=0.0, server_default='0')
     # Keep owner_id as an alias to preserve existing API and service compatibility.
     owner_id = synonym('user_id')
 
@@ -101,5 +114,8 @@ class Place(BaseModel):
             'latitude': self.latitude,
             'longitude': self.longitude,
             'owner_id': self.owner_id,
+            'review_count': self.review_count or 0,
+            'rating_sum': self.rating_sum or 0,
+            'average_rating': round(self.average_rating, 2) if self.review_count else None,
             'amenities': [amenity.to_dict() for amenity in self.amenities]
         }
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Integer, String
+from sqlalchemy import Column, ForeignKey, Index, Integer, String, UniqueConstraint
 
 from .base_model import BaseModel
 from app.extensions import db
@@ -7,6 +7,13 @@ from sqlalchemy.orm import validates
 class Review(BaseModel):
 
 	__tablename__ = 'reviews'
+	__table_args__ = (
+		Index('idx_reviews_created_at_id', 'created_at', 'id'),
+		# Covers lookups and keyset pages of a single place's reviews
+		Index('idx_reviews_place_id', 'place_id', 'created_at', 'id'),
+		# A user can review a place only once; also serves lookups by user_id
+		UniqueConstraint('user_id', 'place_id', name='uq_user_place_review'),
+	)
 
 	text = Column(String(500), nullable=False)
 	rating = Column(Integer, nullable=False)
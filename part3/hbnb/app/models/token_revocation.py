@@ -0,0 +1,22 @@
+from app.extensions import db
+from sqlalchemy import Column, Index, Integer, String
+
+
+class TokenRevocation(db.Model):
+    """A revoked access token (jti set) or every token of a user up to revoked_at (jti NULL).
+
+    Times are epoch seconds, like the iat and exp claims they are compared with.
+    Rows are write-once and useless after expires_at (NULL: never).
+    """
+    __tablename__ = 'token_revocations'
+    __table_args__ = (
+        # Workers read the latest revocations every few seconds
+        Index('idx_token_revocations_revoked_at', 'revoked_at'),
+        Index('idx_token_revocations_expires_at', 'expires_at'),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    jti = Column(String(36), nullable=True)
+    user_id = Column(String(36), nullable=False)
+    revoked_at = Column(Integer, nullable=False)
+    expires_at = Column(Integer, nullable=True)
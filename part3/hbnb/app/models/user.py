@@ -1,12 +1,14 @@
-import bcrypt
-from app.extensions import db
+from app.extensions import db, password_hasher
 from .base_model import BaseModel
 from sqlalchemy.orm import validates, relationship
-from sqlalchemy import Column, String, Boolean
+from sqlalchemy import Column, String, Boolean, Index
 
 
 class User(BaseModel):
     __tablename__ = 'users'
+    __table_args__ = (
+        Index('idx_users_created_at_id', 'created_at', 'id'),
+    )
 
     first_name = Column(String(50), nullable=False)
     last_name = Column(String(50), nullable=False)
@@ -80,8 +82,12 @@ class User(BaseModel):
 
     def hash_password(self, password):
         """Hash the user's password."""
-        self.password = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        self.password = password_hasher.hash(password)
 
     def verify_password(self, password):
         """Verify the user's password."""
-        return bcrypt.checkpw(password.encode('utf-8'), self.password.encode('utf-8'))
+        return password_hasher.verify(password, self.password)
+
+    def password_needs_rehash(self):
+        """Check whether the stored hash uses an outdated bcrypt cost factor."""
+        return password_hasher.needs_rehash(self.password)
@@ -0,0 +1,91 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import bcrypt
+
+DEFAULT_LOG_ROUNDS = 12
+
+
+def _hashpw(password, rounds):
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds))
+
+
+def _checkpw(password, hashed):
+    return bcrypt.checkpw(password, hashed)
+
+
+class PasswordHasher:
+    """bcrypt hashing with a configurable cost, run in a process pool.
+
+    Config keys:
+    - BCRYPT_LOG_ROUNDS: bcrypt cost factor for new hashes (default 12).
+    - PASSWORD_HASH_WORKERS: size of the process pool; 0 hashes on the
+      calling thread. Defaults to the number of CPUs.
+
+    The pool is created on first use, so each server worker process gets
+    its own after forking. Its workers are started with forkserver (spawn
+    where forkserver is not available), never with a plain fork.
+    """
+
+    def __init__(self, app=None):
+        self.rounds = DEFAULT_LOG_ROUNDS
+        self.workers = 0
+        self._executor = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.shutdown()
+        self.rounds = app.config.get('BCRYPT_LOG_ROUNDS', DEFAULT_LOG_ROUNDS)
+        self.workers = app.config.get('PASSWORD_HASH_WORKERS', os.cpu_count() or 1)
+
+    def _get_executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    # Request threads already run here, and forking a multithreaded process
+                    # can deadlock on the locks they hold. forkserver forks the workers from
+                    # a fresh single-threaded process, which imports __main__ only once.
+                    method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                         mp_context=multiprocessing.get_context(method))
+        return self._executor
+
+    def _run(self, fn, *args):
+        if not self.workers:
+            return fn(*args)
+        return self._get_executor().submit(fn, *args).result()
+
+    def hash(self, password):
+        """Hash a password with the configured cost factor."""
+        return self._run(_hashpw, password.encode('utf-8'), self.rounds).decode('utf-8')
+
+    def hash_many(self, passwords):
+        """Hash a list of passwords, spread over the whole pool."""
+        passwords = [password.encode('utf-8') for password in passwords]
+        rounds = [self.rounds] * len(passwords)
+        if not self.workers:
+            hashes = map(_hashpw, passwords, rounds)
+        else:
+            hashes = self._get_executor().map(_hashpw, passwords, rounds)
+        return [hashed.decode('utf-8') for hashed in hashes]
+
+    def verify(self, password, hashed):
+        """Check a password against a bcrypt hash."""
+        return self._run(_checkpw, password.encode('utf-8'), hashed.encode('utf-8'))
+
+    def needs_rehash(self, hashed):
+        """Tell whether a hash was made with a cost factor other than the configured one."""
+        try:
+            return int(hashed.split('$')[2]) != self.rounds
+        except (IndexError, ValueError):
+            return True
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
@@ -0,0 +1,141 @@
+"""SQLite FTS5 full-text index over place titles and descriptions.
+
+`places_fts` is an external-content FTS5 table: it stores only the index
+and reads the text back from `places` by rowid. Triggers keep it in sync,
+like the R*Tree in spatial.py, and create_fulltext_index() rebuilds it at
+startup when a VACUUM renumbered the rowids. Other databases fall back to
+a LIKE filter.
+"""
+import html
+import re
+import unicodedata
+
+from sqlalchemy import event, text
+from sqlalchemy.exc import DatabaseError
+
+from app.models.place import Place
+
+# Column weights for bm25(): a match in the title counts ten times more
+TITLE_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+# Number of words shown around the matches in a snippet
+SNIPPET_WORDS = 12
+
+INSERT_TRIGGER_DDL = (
+    "CREATE TRIGGER IF NOT EXISTS places_fts_insert AFTER INSERT ON places BEGIN "
+    "INSERT INTO places_fts(rowid, title, description) VALUES (NEW.rowid, NEW.title, NEW.description); "
+    "END"
+)
+
+FULLTEXT_INDEX_DDL = [
+    # prefix='2 3' adds prefix indexes so that short prefix queries stay fast
+    "CREATE VIRTUAL TABLE IF NOT EXISTS places_fts USING fts5("
+    "title, description, content='places', content_rowid='rowid', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    INSERT_TRIGGER_DDL,
+    "CREATE TRIGGER IF NOT EXISTS places_fts_delete AFTER DELETE ON places BEGIN "
+    "INSERT INTO places_fts(places_fts, rowid, title, description) "
+    "VALUES ('delete', OLD.rowid, OLD.title, OLD.description); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS places_fts_update AFTER UPDATE OF title, description ON places BEGIN "
+    "INSERT INTO places_fts(places_fts, rowid, title, description) "
+    "VALUES ('delete', OLD.rowid, OLD.title, OLD.description); "
+    "INSERT INTO places_fts(rowid, title, description) VALUES (NEW.rowid, NEW.title, NEW.description); "
+    "END",
+]
+
+
+def build_match_query(q):
+    """Turn free text into an FTS5 query matching every word as a prefix.
+
+    Words are quoted, so FTS5 operators and punctuation typed by users are
+    never interpreted.
+    """
+    words = re.findall(r'\w+', q)
+    if not words:
+        raise ValueError("Search query must contain at least one word")
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def _fold(word):
+    """Case- and accent-insensitive form of a word, as the unicode61 tokenizer indexes it."""
+    decomposed = unicodedata.normalize('NFKD', word)
+    return ''.join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def make_snippet(q, *texts, size=SNIPPET_WORDS):
+    """Return an HTML excerpt of the first text matching q, with the matches in <mark>.
+
+    Built from the text of the page's places rather than with FTS5's
+    snippet(), which re-reads the doclist of every match. Shows the window
+    of `size` words holding the most distinct query words.
+    """
+    prefixes = [_fold(word) for word in re.findall(r'\w+', q)]
+    for value in texts:
+        words = list(re.finditer(r'\w+', value or ''))
+        # Index of the query word each word of the text matches, or None
+        hits = []
+        for word in words:
+            folded = _fold(word.group())
+            hits.append(next((i for i, prefix in enumerate(prefixes) if folded.startswith(prefix)), None))
+        matched = [index for index, hit in enumerate(hits) if hit is not None]
+        if not matched:
+            continue
+        best = max(matched, key=lambda index: len({hit for hit in hits[index:index + size] if hit is not None}))
+        # Keep a couple of words of context before the first match
+        first = max(0, min(best - 2, len(words) - size))
+        last = min(len(words), first + size) - 1
+
+        parts = ['…' if first else '']
+        position = words[first].start()
+        for word, hit in zip(words[first:last + 1], hits[first:last + 1]):
+            parts.append(html.escape(value[position:word.start()]))
+            text_html = html.escape(word.group())
+            parts.append(text_html if hit is None else f'<mark>{text_html}</mark>')
+            position = word.end()
+        parts.append('…' if last < len(words) - 1 else html.escape(value[position:]))
+        return ''.join(parts)
+    return None
+
+
+def create_fulltext_index(connection):
+    """Create the FTS5 table and its triggers, and index existing places."""
+    if connection.dialect.name != 'sqlite':
+        return
+    existed = connection.execute(text(
+        "SELECT count(*) FROM sqlite_master WHERE type = 'table' AND name = 'places_fts'"
+    )).scalar()
+    for statement in FULLTEXT_INDEX_DDL:
+        connection.execute(text(statement))
+    if not existed or fulltext_index_is_stale(connection):
+        rebuild_fulltext_index(connection)
+
+
+def fulltext_index_is_stale(connection):
+    """Whether the FTS5 index no longer matches the text of `places`.
+
+    The index refers to places by rowid, which a VACUUM may renumber.
+    FTS5's integrity-check compares every indexed row with the content
+    table, so this reads the whole table.
+    """
+    try:
+        connection.execute(text("INSERT INTO places_fts(places_fts, rank) VALUES ('integrity-check', 1)"))
+    except DatabaseError:
+        return True
+    return False
+
+
+def rebuild_fulltext_index(connection):
+    """Rebuild the FTS5 index from the places table."""
+    connection.execute(text("INSERT INTO places_fts(places_fts) VALUES ('rebuild')"))
+
+
+@event.listens_for(Place.__table__, 'after_create')
+def _create_fulltext_index(target, connection, **kw):
+    create_fulltext_index(connection)
+
+
+@event.listens_for(Place.__table__, 'before_drop')
+def _drop_fulltext_index(target, connection, **kw):
+    if connection.dialect.name == 'sqlite':
+        connection.execute(text("DROP TABLE IF EXISTS places_fts"))
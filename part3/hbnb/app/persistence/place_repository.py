@@ -1,27 +1,304 @@
-from app.models.place import Place
-from app.extensions import db
-from app.persistence.repository import SQLAlchemyRepository
+from app.models.amenity import Amenity
+from app.models.place import Place, place_amenity
+from app.extensions import db, query_detector
+from app.persistence import fulltext
+from app.persistence.repository import SQLAlchemyRepository, decode_cursor, encode_cursor
+from app.persistence.spatial import MAX_DISTANCE_KM, bounding_boxes, haversine_km
+from sqlalchemy import and_, func, or_, select, text
+from sqlalchemy.orm import joinedload, selectinload
+
+# Sort keys accepted by the place searches: (column name, descending)
+PLACE_SORTS = {
+    'price_asc': ('price', False),
+    'price_desc': ('price', True),
+    'title': ('title', False),
+    'rating_desc': ('average_rating', True),
+    'reviews_desc': ('review_count', True),
+}
+
+# Row column 'amenity_ids': the comma-separated ids of a place's amenities,
+# read through the same index, hence in the same order, as selectinload(Place.amenities)
+AMENITY_IDS = (
+    select(func.aggregate_strings(place_amenity.c.amenity_id, ','))
+    .where(place_amenity.c.place_id == Place.id)
+    .correlate(Place)
+    .scalar_subquery()
+    .label('amenity_ids')
+)
 
 class PlaceRepository(SQLAlchemyRepository):
     def __init__(self):
         super().__init__(Place)
 
+    def _list_query(self):
+        """Base query for place lists.
+
+        Place.to_dict() serializes the amenities, so load them for the whole
+        page in one extra SELECT instead of one per place.
+        """
+        return self.model.query.options(selectinload(self.model.amenities))
+
+    def get_all(self):
+        return self._list_query().all()
+
+    def get_many(self, ids):
+        return super().get_many(ids, query=self._list_query())
+
+    def get_place_details(self, place_id):
+        """Get a place with its owner and amenities loaded up front."""
+        return self.model.query.options(
+            joinedload(self.model.owner),
+            selectinload(self.model.amenities)
+        ).filter_by(id=place_id).first()
+
+    def add_many_with_amenities(self, rows, links):
+        """Bulk insert places and their place_amenity links in one transaction.
+
+        If any insert fails, neither the places nor their links are kept.
+        Returns the number of inserted places.
+        """
+        try:
+            count = self.add_many(rows, commit=False)
+            self.add_many_to(place_amenity, links, commit=False)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return count
+
     def get_places_by_owner_id(self, owner_id):
         """Get all places for a specific owner."""
-        return self.model.query.filter_by(owner_id=owner_id).all()
+        return self._list_query().filter_by(owner_id=owner_id).all()
+
+    def _price_range_query(self, min_price=None, max_price=None, query=None):
+        """Build a query for places within an optional price range.
+
+        `query` is the query to filter (default: the list query).
+        """
+        query = self._list_query() if query is None else query
+        if min_price is not None:
+            query = query.filter(self.model.price >= min_price)
+        if max_price is not None:
+            query = query.filter(self.model.price <= max_price)
+        return query
 
     def get_places_by_price_range(self, min_price, max_price):
         """Get all places within a price range."""
-        return self.model.query.filter(
-            self.model.price >= min_price,
-            self.model.price <= max_price
-        ).all()
+        return self._price_range_query(min_price, max_price).all()
+
+    def _search_query(self, min_price=None, max_price=None, amenity_ids=None, q=None, query=None):
+        """Build a query for places matching every given filter.
+
+        Places must have all of `amenity_ids`; `q` is matched against the
+        title and description.
+        """
+        query = self._price_range_query(min_price, max_price, query)
+        if amenity_ids:
+            amenity_ids = set(amenity_ids)
+            with_all_amenities = db.session.query(place_amenity.c.place_id).filter(
+                place_amenity.c.amenity_id.in_(amenity_ids)
+            ).group_by(place_amenity.c.place_id).having(
+                func.count(place_amenity.c.amenity_id) == len(amenity_ids)
+            )
+            query = query.filter(self.model.id.in_(with_all_amenities))
+        if q:
+            pattern = f"%{q}%"
+            query = query.filter(or_(
+                self.model.title.ilike(pattern),
+                self.model.description.ilike(pattern)
+            ))
+        return query
+
+    def _sorted(self, query, sort):
+        if not sort:
+            return query
+        column, descending = PLACE_SORTS[sort]
+        order_by = getattr(self.model, column)
+        if descending:
+            return query.order_by(order_by.desc(), self.model.id.desc())
+        return query.order_by(order_by, self.model.id)
+
+    def search_places_page(self, limit, cursor=None, min_price=None, max_price=None,
+                           amenity_ids=None, q=None, sort=None):
+        """Get one page of places matching the filters, optionally sorted."""
+        query = self._search_query(min_price, max_price, amenity_ids, q)
+        if not sort:
+            return self.get_page(limit, cursor, query=query)
+        column, descending = PLACE_SORTS[sort]
+        return self.get_page(limit, cursor, query=query,
+                             order_by=getattr(self.model, column), descending=descending)
+
+    # Row variants of search_places_page, for the list endpoints: the same
+    # filters and order, but rows of the named columns instead of ORM
+    # instances. With amenity_columns, each row ends with the list of the
+    # place's amenities, as rows of those columns.
+
+    def _row_column(self, name):
+        if name == 'amenity_ids':
+            return AMENITY_IDS
+        return super()._row_column(name)
+
+    @staticmethod
+    def _amenity_row_columns(columns, amenity_columns):
+        """Columns to select: `columns`, then what the amenity lookup needs when there is one."""
+        if amenity_columns is None:
+            return columns
+        return (*columns, 'amenity_ids', *(() if 'id' in columns else ('id',)))
+
+    def search_place_rows(self, columns, amenity_columns=None, min_price=None, max_price=None,
+                          amenity_ids=None, q=None, sort=None):
+        query = self._search_query(min_price, max_price, amenity_ids, q, query=self.model.query)
+        rows = self.get_rows(self._amenity_row_columns(columns, amenity_columns), self._sorted(query, sort))
+        if amenity_columns is None:
+            return rows
+        # A subquery rather than thousands of bound ids
+        amenities = self._linked_amenities(query.with_entities(self.model.id).statement, amenity_columns)
+        return self._with_amenities(rows, len(columns), amenities)
+
+    def iter_place_rows(self, columns, amenity_columns=None, min_price=None, max_price=None, amenity_ids=None,
+                        q=None, sort=None, batch_size=1000):
+        query = self._search_query(min_price, max_price, amenity_ids, q, query=self.model.query)
+        rows = self.iter_rows(self._amenity_row_columns(columns, amenity_columns), self._sorted(query, sort),
+                              batch_size)
+        if amenity_columns is None:
+            yield from rows
+            return
+        for batch in rows.partitions():
+            amenities = self._linked_amenities([row.id for row in batch], amenity_columns)
+            yield from self._with_amenities(batch, len(columns), amenities)
+
+    def search_place_rows_page(self, columns, amenity_columns, limit, cursor=None, min_price=None,
+                               max_price=None, amenity_ids=None, q=None, sort=None):
+        query = self._search_query(min_price, max_price, amenity_ids, q, query=self.model.query)
+        row_columns = self._amenity_row_columns(columns, amenity_columns)
+        if not sort:
+            rows, next_cursor = self.get_rows_page(row_columns, limit, cursor, query=query)
+        else:
+            column, descending = PLACE_SORTS[sort]
+            rows, next_cursor = self.get_rows_page(row_columns, limit, cursor, query=query,
+                                                   order_by=getattr(self.model, column), descending=descending)
+        if amenity_columns is None:
+            return rows, next_cursor
+        amenities = self._linked_amenities([row.id for row in rows], amenity_columns)
+        return self._with_amenities(rows, len(columns), amenities), next_cursor
+
+    def _linked_amenities(self, place_ids, columns):
+        """Map the id of each amenity of the given places (a list, or a select of ids) to a row of `columns`."""
+        linked = select(place_amenity.c.amenity_id).where(place_amenity.c.place_id.in_(place_ids))
+        statement = select(Amenity.id, *(getattr(Amenity, name) for name in columns)).where(Amenity.id.in_(linked))
+        return {row[0]: row[1:] for row in db.session.connection().execute(statement)}
+
+    @staticmethod
+    def _with_amenities(rows, index, amenities):
+        """Keep the first `index` columns of each row, then the amenity rows named by its 'amenity_ids'."""
+        result = []
+        for row in rows:
+            ids = row[index]
+            # Links to a deleted amenity are skipped, as the join of selectinload does
+            result.append((*row[:index], [amenities[amenity_id] for amenity_id in ids.split(',')
+                                          if amenity_id in amenities] if ids else []))
+        return result
+
+    def search_fulltext(self, q, limit, cursor=None):
+        """Get one page of the places matching every word of q, best match first.
+
+        On SQLite the places_fts index ranks matches with BM25 (title matches
+        weigh more) and words match as prefixes. Returns (results, next_cursor)
+        where results are (place, score) pairs and higher scores are better
+        matches. Other databases fall back to the LIKE search, without score.
+        """
+        if db.session.get_bind().dialect.name != 'sqlite':
+            places, next_cursor = self.search_places_page(limit, cursor, q=q)
+            return [(place, None) for place in places], next_cursor
+
+        params = {'query': fulltext.build_match_query(q), 'limit': limit + 1}
+        after_cursor = ''
+        if cursor:
+            score, rowid = decode_cursor(cursor)
+            try:
+                params.update(score=float(score), rowid=int(rowid))
+            except (TypeError, ValueError):
+                raise ValueError("Invalid cursor")
+            after_cursor = 'WHERE score > :score OR (score = :score AND rowid > :rowid)'
+        # bm25() is lower for better matches. The keyset is (score, rowid), and
+        # the join to places only runs for the rows of the page.
+        rows = db.session.execute(text(
+            "SELECT places.id, page.rowid, page.score FROM ("
+            "SELECT rowid, score FROM ("
+            f"SELECT rowid, bm25(places_fts, {fulltext.TITLE_WEIGHT}, {fulltext.DESCRIPTION_WEIGHT}) AS score "
+            "FROM places_fts WHERE places_fts MATCH :query"
+            f") {after_cursor} ORDER BY score, rowid LIMIT :limit"
+            ") AS page JOIN places ON places.rowid = page.rowid ORDER BY page.score, page.rowid"
+        ), params).all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].score, str(rows[-1].rowid))
+        if not rows:
+            return [], None
+        places = {place.id: place for place in
+                  self._list_query().filter(self.model.id.in_([row.id for row in rows]))}
+        return [(places[row.id], -row.score) for row in rows], next_cursor
+
+    def _in_boxes(self, boxes):
+        """Filter matching places inside any of the (min_lat, max_lat, min_lon, max_lon) boxes.
+
+        Uses the places_rtree index on SQLite, plain column ranges elsewhere.
+        """
+        if db.session.get_bind().dialect.name == 'sqlite':
+            conditions, params = [], {}
+            for i, (min_lat, max_lat, min_lon, max_lon) in enumerate(boxes):
+                conditions.append(
+                    f"(max_lat >= :min_lat{i} AND min_lat <= :max_lat{i} "
+                    f"AND max_lon >= :min_lon{i} AND min_lon <= :max_lon{i})"
+                )
+                params.update({f'min_lat{i}': min_lat, f'max_lat{i}': max_lat,
+                               f'min_lon{i}': min_lon, f'max_lon{i}': max_lon})
+            return text(
+                f"places.rowid IN (SELECT id FROM places_rtree WHERE {' OR '.join(conditions)})"
+            ).bindparams(**params)
+        return or_(*[and_(
+            self.model.latitude.between(min_lat, max_lat),
+            self.model.longitude.between(min_lon, max_lon)
+        ) for min_lat, max_lat, min_lon, max_lon in boxes])
 
     def get_places_by_location(self, latitude, longitude, radius):
         """Get all places within a radius (in degrees) from a point."""
-        return self.model.query.filter(
-            self.model.latitude >= latitude - radius,
-            self.model.latitude <= latitude + radius,
-            self.model.longitude >= longitude - radius,
-            self.model.longitude <= longitude + radius
-        ).all()
\ No newline at end of file
+        box = (latitude - radius, latitude + radius, longitude - radius, longitude + radius)
+        return self._list_query().filter(self._in_boxes([box])).all()
+
+    def _distances_within(self, latitude, longitude, radius_km):
+        """Get (distance_km, place_id) of every place within radius_km of a point."""
+        rows = db.session.query(self.model.id, self.model.latitude, self.model.longitude).filter(
+            self._in_boxes(bounding_boxes(latitude, longitude, radius_km))
+        ).all()
+        distances = []
+        for place_id, place_lat, place_lon in rows:
+            distance = haversine_km(latitude, longitude, place_lat, place_lon)
+            if distance <= radius_km:
+                distances.append((distance, place_id))
+        return distances
+
+    def get_places_near(self, latitude, longitude, radius_km=None, k=10):
+        """Get the k places nearest to a point, as (place, distance_km) sorted by distance.
+
+        Without radius_km the search radius grows until k places are found,
+        which still returns the exact k nearest.
+        """
+        if radius_km is not None:
+            distances = self._distances_within(latitude, longitude, radius_km)
+        else:
+            radius_km = 10.0
+            # At most log4(MAX_DISTANCE_KM / 10) + 1 rounds
+            with query_detector.allow_repeats():
+                while True:
+                    distances = self._distances_within(latitude, longitude, radius_km)
+                    if len(distances) >= k or radius_km >= MAX_DISTANCE_KM:
+                        break
+                    radius_km = min(radius_km * 4, MAX_DISTANCE_KM)
+        nearest = sorted(distances)[:k]
+        if not nearest:
+            return []
+        places = {place.id: place for place in
+                  self._list_query().filter(self.model.id.in_([place_id for _, place_id in nearest]))}
+        return [(places[place_id], distance) for distance, place_id in nearest]
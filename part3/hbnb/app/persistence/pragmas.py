@@ -0,0 +1,26 @@
+"""Per-connection SQLite settings.
+
+PRAGMAs such as busy_timeout, cache_size or foreign_keys only last for the
+connection that ran them, so they are set on every new pooled connection.
+"""
+from sqlalchemy import event
+
+
+def apply_sqlite_pragmas(engine, pragmas):
+    """Run `PRAGMA name = value` for each item of pragmas on every new connection.
+
+    pragmas is an ordered mapping; journal_mode should come first since WAL
+    changes how the other settings behave. Engines of other databases are
+    left untouched.
+    """
+    if engine.dialect.name != 'sqlite' or not pragmas:
+        return
+
+    @event.listens_for(engine, 'connect')
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name} = {value}")
+        finally:
+            cursor.close()
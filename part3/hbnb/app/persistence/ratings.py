@@ -0,0 +1,112 @@
+"""Rating aggregates of places: review_count, rating_sum and average_rating.
+
+They are updated with relative SQL UPDATEs in the transaction that writes
+the review: mapper events cover reviews saved through the ORM (the facade's
+create_review/update_review/delete_review), and ReviewRepository.add_many
+calls apply_rating_deltas for bulk inserts. rebuild_place_ratings()
+recomputes everything from the reviews table.
+"""
+from collections import defaultdict
+
+from sqlalchemy import and_, bindparam, case, event, func, inspect, or_, select, text
+
+from app.models.place import Place
+from app.models.review import Review
+
+places = Place.__table__
+reviews = Review.__table__
+
+_new_count = places.c.review_count + bindparam('count_delta')
+_new_sum = places.c.rating_sum + bindparam('sum_delta')
+# average_rating is assigned first: MySQL evaluates SET clauses left to right
+# with the values already updated, other databases always read the old row.
+RATING_UPDATE = places.update().where(places.c.id == bindparam('target_place_id')).ordered_values(
+    (places.c.average_rating, case((_new_count > 0, _new_sum * 1.0 / _new_count), else_=0.0)),
+    (places.c.review_count, _new_count),
+    (places.c.rating_sum, _new_sum),
+)
+
+
+def apply_rating_deltas(connection, deltas):
+    """Add {place_id: (count_delta, sum_delta)} to the aggregates of each place."""
+    params = [{'target_place_id': place_id, 'count_delta': count, 'sum_delta': total}
+              for place_id, (count, total) in deltas.items() if count or total]
+    if params:
+        connection.execute(RATING_UPDATE, params)
+
+
+def rating_deltas(rows):
+    """Sum the review rows ({'place_id', 'rating'} dicts) of each place."""
+    deltas = defaultdict(lambda: (0, 0))
+    for row in rows:
+        count, total = deltas[row['place_id']]
+        deltas[row['place_id']] = (count + 1, total + row['rating'])
+    return deltas
+
+
+def rebuild_place_ratings(connection):
+    """Recompute the aggregates of every place whose stored values drifted; returns how many were fixed."""
+    count = select(func.count()).where(reviews.c.place_id == places.c.id).scalar_subquery()
+    total = select(func.coalesce(func.sum(reviews.c.rating), 0)).where(
+        reviews.c.place_id == places.c.id).scalar_subquery()
+    result = connection.execute(places.update().where(or_(
+        places.c.review_count != count,
+        places.c.rating_sum != total,
+        and_(places.c.review_count == 0, places.c.average_rating != 0),
+        and_(places.c.review_count > 0,
+             func.abs(places.c.average_rating - places.c.rating_sum * 1.0 / places.c.review_count) > 1e-9),
+    )).values(
+        review_count=count,
+        rating_sum=total,
+        average_rating=case((count > 0, total * 1.0 / count), else_=0.0),
+    ))
+    return result.rowcount
+
+
+# The sort indexes of Place.__table_args__ on the aggregate columns, which
+# create_all does not add to an existing places table
+RATING_INDEX_DDL = [
+    "CREATE INDEX IF NOT EXISTS idx_places_average_rating_id ON places (average_rating, id)",
+    "CREATE INDEX IF NOT EXISTS idx_places_review_count_id ON places (review_count, id)",
+]
+
+
+def add_rating_columns(connection):
+    """Add the aggregate columns and their sort indexes to a places table created before they existed.
+
+    New columns are filled from the reviews.
+    """
+    existing = {column['name'] for column in inspect(connection).get_columns('places')}
+    missing = [column for column in ('review_count', 'rating_sum', 'average_rating') if column not in existing]
+    for column in missing:
+        column_type = 'FLOAT' if column == 'average_rating' else 'INTEGER'
+        connection.execute(text(f"ALTER TABLE places ADD COLUMN {column} {column_type} NOT NULL DEFAULT 0"))
+    for statement in RATING_INDEX_DDL:
+        connection.execute(text(statement))
+    if missing:
+        rebuild_place_ratings(connection)
+
+
+@event.listens_for(Review, 'after_insert')
+def _review_inserted(mapper, connection, review):
+    apply_rating_deltas(connection, {review.place_id: (1, review.rating)})
+
+
+@event.listens_for(Review, 'after_delete')
+def _review_deleted(mapper, connection, review):
+    apply_rating_deltas(connection, {review.place_id: (-1, -review.rating)})
+
+
+@event.listens_for(Review, 'after_update')
+def _review_updated(mapper, connection, review):
+    state = inspect(review)
+    rating, place_id = state.attrs.rating.history, state.attrs.place_id.history
+    if not rating.has_changes() and not place_id.has_changes():
+        return
+    old_rating = rating.deleted[0] if rating.deleted else review.rating
+    old_place_id = place_id.deleted[0] if place_id.deleted else review.place_id
+    deltas = defaultdict(lambda: (0, 0))
+    deltas[old_place_id] = (-1, -old_rating)
+    count, total = deltas[review.place_id]
+    deltas[review.place_id] = (count + 1, total + review.rating)
+    apply_rating_deltas(connection, deltas)
@@ -1,4 +1,35 @@
+import base64
+import json
+import uuid
 from abc import ABC, abstractmethod
+from datetime import datetime
+from itertools import chain, islice
+
+from sqlalchemy import DateTime, and_, func, or_, select
+
+
+def encode_cursor(sort_value, obj_id):
+    """Encode a (sort_value, id) keyset position as an opaque cursor string."""
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    raw = json.dumps([sort_value, obj_id])
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor):
+    """Decode a cursor produced by encode_cursor back into (sort_value, id).
+
+    Datetimes come back as ISO strings; callers convert them for their column.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+        sort_value, obj_id = json.loads(raw)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(obj_id, str):
+        raise ValueError("Invalid cursor")
+    return sort_value, obj_id
+
 
 class Repository(ABC):
     @abstractmethod
@@ -13,6 +44,14 @@ class Repository(ABC):
     def get_all(self):
         pass
 
+    @abstractmethod
+    def get_many(self, ids):
+        pass
+
+    @abstractmethod
+    def get_page(self, limit, cursor=None):
+        pass
+
     @abstractmethod
     def update(self, obj_id, data):
         pass
@@ -27,13 +66,20 @@ class Repository(ABC):
 
 
 class SQLAlchemyRepository(Repository):
+    # Rows per executemany() call and per commit in the bulk methods
+    BULK_CHUNK_SIZE = 10000
+
     def __init__(self, model):
         self.model = model
 
     def add(self, obj):
         from app.extensions import db
         db.session.add(obj)
-        db.session.commit()
+        try:
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
 
     def get(self, obj_id):
         return self.model.query.get(obj_id)
@@ -41,12 +87,107 @@ class SQLAlchemyRepository(Repository):
     def get_all(self):
         return self.model.query.all()
 
+    def get_many(self, ids, query=None):
+        """Return (objects, missing ids) for the given ids, in one IN query per chunk.
+
+        Objects come in the order of `ids` (each once) and missing lists, in
+        the same order, the ids that match no row. `query` lets subclasses
+        add loader options.
+        """
+        query = self.model.query if query is None else query
+        ids = list(dict.fromkeys(ids))
+        found = {}
+        for start in range(0, len(ids), self.BULK_CHUNK_SIZE):
+            chunk = ids[start:start + self.BULK_CHUNK_SIZE]
+            found.update((obj.id, obj) for obj in query.filter(self.model.id.in_(chunk)))
+        return [found[obj_id] for obj_id in ids if obj_id in found], [obj_id for obj_id in ids if obj_id not in found]
+
+    def _row_column(self, name):
+        """Column selected for `name` by the row methods; subclasses may add computed ones."""
+        return getattr(self.model, name)
+
+    def _row_query(self, columns, query=None):
+        """`query` (default: the whole table) selecting only the named columns, as plain rows."""
+        query = self.model.query if query is None else query
+        return query.with_entities(*(self._row_column(name) for name in columns))
+
+    def _execute_rows(self, query, **options):
+        """Run a column query as a Core statement, skipping the ORM result processing."""
+        from app.extensions import db
+        return db.session.connection().execute(query.statement.execution_options(**options))
+
+    def get_rows(self, columns, query=None):
+        """Like get_all, but as rows of the named columns, without building ORM instances."""
+        return self._execute_rows(self._row_query(columns, query)).all()
+
+    def iter_rows(self, columns, query=None, batch_size=1000):
+        """Like get_rows, but streamed with a server-side cursor that fetches batch_size rows at a time."""
+        return self._execute_rows(self._row_query(columns, query), yield_per=batch_size)
+
+    def get_rows_page(self, columns, limit, cursor=None, query=None, order_by=None, descending=False):
+        """Like get_page, but as rows of the named columns.
+
+        The sort column and the id are added to the rows when missing: the next cursor is read from them.
+        """
+        order_key = (order_by if order_by is not None else self.model.created_at).key
+        columns = (*columns, *(name for name in dict.fromkeys((order_key, 'id')) if name not in columns))
+        return self.get_page(limit, cursor, query=self._row_query(columns, query),
+                             order_by=order_by, descending=descending)
+
+    def attach(self, obj):
+        """Attach an instance loaded by another session (e.g. a cached one) without a SELECT."""
+        from app.extensions import db
+        return db.session.merge(obj, load=False)
+
+    def get_page(self, limit, cursor=None, query=None, order_by=None, descending=False):
+        """Return one page of objects ordered by (order_by, id).
+
+        Uses keyset pagination so the cost of a page does not depend on how
+        deep the cursor is. `query` lets subclasses paginate a filtered query;
+        `order_by` is a model column and defaults to created_at.
+        Returns a tuple (items, next_cursor); next_cursor is None on the last page.
+        """
+        if query is None:
+            query = self.model.query
+        if order_by is None:
+            order_by = self.model.created_at
+        if cursor:
+            sort_value, obj_id = decode_cursor(cursor)
+            if isinstance(order_by.type, DateTime):
+                try:
+                    sort_value = datetime.fromisoformat(sort_value)
+                except (TypeError, ValueError):
+                    raise ValueError("Invalid cursor")
+            if descending:
+                query = query.filter(or_(
+                    order_by < sort_value,
+                    and_(order_by == sort_value, self.model.id < obj_id)
+                ))
+            else:
+                query = query.filter(or_(
+                    order_by > sort_value,
+                    and_(order_by == sort_value, self.model.id > obj_id)
+                ))
+        if descending:
+            query = query.order_by(order_by.desc(), self.model.id.desc())
+        else:
+            query = query.order_by(order_by, self.model.id)
+        items = query.limit(limit + 1).all()
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            last = items[-1]
+            next_cursor = encode_cursor(getattr(last, order_by.key), last.id)
+        return items, next_cursor
+
     def update(self, obj_id, data):
         from app.extensions import db
         obj = self.get(obj_id)
         if obj:
             for key, value in data.items():
                 setattr(obj, key, value)
+            # Also bumps updated_at when only a relationship changed
+            obj.save()
             db.session.commit()
 
     def delete(self, obj_id):
@@ -59,6 +200,126 @@ class SQLAlchemyRepository(Repository):
     def get_by_attribute(self, attr_name, attr_value):
         return self.model.query.filter_by(**{attr_name: attr_value}).first()
 
+    def collection_stats_columns(self):
+        """Scalar subqueries for the table's row count and latest updated_at."""
+        return (select(func.count(self.model.id)).scalar_subquery(),
+                select(func.max(self.model.updated_at)).scalar_subquery())
+
+    def get_collection_stats(self, *others):
+        """Return (row count, latest updated_at) of this table and of each other repository's, in one query."""
+        from app.extensions import db
+        columns = [column for repo in (self, *others) for column in repo.collection_stats_columns()]
+        row = db.session.query(*columns).one()
+        return [tuple(row[i:i + 2]) for i in range(0, len(row), 2)]
+
+    def get_existing_ids(self, ids):
+        """Return the subset of ids that exist, in one query per chunk."""
+        ids = list(set(ids))
+        existing = set()
+        for start in range(0, len(ids), self.BULK_CHUNK_SIZE):
+            chunk = ids[start:start + self.BULK_CHUNK_SIZE]
+            existing.update(row[0] for row in
+                            self.model.query.with_entities(self.model.id).filter(self.model.id.in_(chunk)))
+        return existing
+
+    def get_ids_by_attribute(self, attr_name, values):
+        """Map each given value of attr_name to the id of a matching row, in one query per chunk."""
+        values = list(set(values))
+        column = getattr(self.model, attr_name)
+        ids = {}
+        for start in range(0, len(values), self.BULK_CHUNK_SIZE):
+            chunk = values[start:start + self.BULK_CHUNK_SIZE]
+            ids.update(self.model.query.with_entities(column, self.model.id).filter(column.in_(chunk)))
+        return ids
+
+    def _with_defaults(self, rows):
+        """Yield rows with id and timestamps filled in, as the model defaults would."""
+        now = datetime.now()
+        for row in rows:
+            row = dict(row)
+            if 'id' not in row:
+                row['id'] = str(uuid.uuid4())
+            row.setdefault('created_at', now)
+            row.setdefault('updated_at', now)
+            yield row
+
+    def _execute_in_chunks(self, statement, rows, execute=None, commit=True):
+        """Run statement with executemany over rows, committing every BULK_CHUNK_SIZE rows.
+
+        `execute(statement, chunk)` replaces the plain session.execute call.
+        With commit=False the rows stay in the caller's transaction, which
+        commits or rolls back the whole batch.
+        """
+        from app.extensions import db
+        execute = execute or db.session.execute
+        count = 0
+        rows = iter(rows)
+        while True:
+            chunk = list(islice(rows, self.BULK_CHUNK_SIZE))
+            if not chunk:
+                return count
+            if not commit:
+                execute(statement, chunk)
+                count += len(chunk)
+                continue
+            try:
+                execute(statement, chunk)
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                raise
+            count += len(chunk)
+
+    def add_many(self, rows, commit=True):
+        """Insert dicts of column values with executemany, committing per chunk.
+
+        Skips the ORM unit of work and the @validates hooks: callers pass
+        rows that are already validated (see BaseModel.validate_fields).
+        Chunks committed before a failing one stay committed.
+        Returns the number of inserted rows.
+        """
+        return self._execute_in_chunks(self.model.__table__.insert(), self._with_defaults(rows),
+                                       commit=commit)
+
+    def add_many_to(self, table, rows, commit=True):
+        """Insert plain rows into another table (e.g. an association table) in chunks."""
+        return self._execute_in_chunks(table.insert(), rows, commit=commit)
+
+    def bulk_upsert(self, rows):
+        """Insert rows, or update the given columns of rows whose id already exists.
+
+        Uses INSERT ... ON CONFLICT on SQLite/PostgreSQL and
+        ON DUPLICATE KEY UPDATE on MySQL. Every row must have the same keys.
+        Returns the number of rows written.
+        """
+        from app.extensions import db
+        rows = self._with_defaults(rows)
+        first = next(rows, None)
+        if first is None:
+            return 0
+        table = self.model.__table__
+        columns = [key for key in first if key not in ('id', 'created_at')]
+        dialect = db.session.get_bind().dialect.name
+        if dialect in ('sqlite', 'postgresql'):
+            if dialect == 'sqlite':
+                from sqlalchemy.dialects.sqlite import insert
+            else:
+                from sqlalchemy.dialects.postgresql import insert
+            statement = insert(table)
+            statement = statement.on_conflict_do_update(
+                index_elements=[table.c.id],
+                set_={column: statement.excluded[column] for column in columns}
+            )
+        elif dialect in ('mysql', 'mariadb'):
+            from sqlalchemy.dialects.mysql import insert
+            statement = insert(table)
+            statement = statement.on_duplicate_key_update(
+                {column: statement.inserted[column] for column in columns}
+            )
+        else:
+            raise NotImplementedError(f"bulk_upsert is not supported on {dialect}")
+        return self._execute_in_chunks(statement, chain([first], rows))
+
 
 class InMemoryRepository(Repository):
     def __init__(self):
@@ -73,6 +334,26 @@ class InMemoryRepository(Repository):
     def get_all(self):
         return list(self._storage.values())
 
+    def get_many(self, ids):
+        ids = list(dict.fromkeys(ids))
+        return ([self._storage[obj_id] for obj_id in ids if obj_id in self._storage],
+                [obj_id for obj_id in ids if obj_id not in self._storage])
+
+    def get_page(self, limit, cursor=None):
+        items = sorted(self._storage.values(), key=lambda obj: (obj.created_at, obj.id))
+        if cursor:
+            created_at, obj_id = decode_cursor(cursor)
+            try:
+                position = (datetime.fromisoformat(created_at), obj_id)
+            except (TypeError, ValueError):
+                raise ValueError("Invalid cursor")
+            items = [obj for obj in items if (obj.created_at, obj.id) > position]
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            next_cursor = encode_cursor(items[-1].created_at, items[-1].id)
+        return items, next_cursor
+
     def update(self, obj_id, data):
         obj = self.get(obj_id)
         if obj:
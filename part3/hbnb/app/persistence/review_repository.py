@@ -1,15 +1,66 @@
 from app.models.review import Review
 from app.extensions import db
 from app.persistence.repository import SQLAlchemyRepository
+from app.persistence.ratings import apply_rating_deltas, rating_deltas
+from sqlalchemy import exists, inspect, text
+
+UNIQUE_INDEX_DDL = "CREATE UNIQUE INDEX IF NOT EXISTS uq_user_place_review ON reviews (user_id, place_id)"
+
+
+def add_review_unique_index(connection):
+    """Enforce one review per user and place on a reviews table created without uq_user_place_review.
+
+    Tables created by create_all already have it as a unique constraint.
+    Fails with IntegrityError while duplicate reviews remain.
+    """
+    inspector = inspect(connection)
+    unique = inspector.get_unique_constraints('reviews') + [
+        index for index in inspector.get_indexes('reviews') if index['unique']
+    ]
+    if any(sorted(c['column_names']) == ['place_id', 'user_id'] for c in unique):
+        return
+    connection.execute(text(UNIQUE_INDEX_DDL))
+
 
 class ReviewRepository(SQLAlchemyRepository):
     def __init__(self):
         super().__init__(Review)
 
+    def add_many(self, rows):
+        """Bulk insert reviews, updating their places' rating aggregates in the same transaction."""
+        def insert_and_count(statement, chunk):
+            db.session.execute(statement, chunk)
+            apply_rating_deltas(db.session.connection(), rating_deltas(chunk))
+
+        return self._execute_in_chunks(self.model.__table__.insert(), self._with_defaults(rows),
+                                       execute=insert_and_count)
+
     def get_reviews_by_place_id(self, place_id):
         """Get all reviews for a specific place."""
         return self.model.query.filter_by(place_id=place_id).all()
 
+    def get_reviews_page_by_place_id(self, place_id, limit, cursor=None):
+        """Get one page of reviews for a specific place, oldest first."""
+        return self.get_page(limit, cursor, query=self.model.query.filter_by(place_id=place_id))
+
+    def user_has_reviewed_place(self, user_id, place_id):
+        """Check with a single EXISTS probe whether a user already reviewed a place."""
+        return db.session.query(
+            exists().where(self.model.user_id == user_id, self.model.place_id == place_id)
+        ).scalar()
+
+    def get_reviewed_pairs(self, pairs):
+        """Return the (user_id, place_id) pairs that already have a review."""
+        pairs = set(pairs)
+        if not pairs:
+            return set()
+        user_ids = {user_id for user_id, _ in pairs}
+        place_ids = {place_id for _, place_id in pairs}
+        rows = db.session.query(self.model.user_id, self.model.place_id).filter(
+            self.model.user_id.in_(user_ids), self.model.place_id.in_(place_ids)
+        )
+        return {tuple(row) for row in rows} & pairs
+
     def get_reviews_by_user_id(self, user_id):
         """Get all reviews written by a specific user."""
         return self.model.query.filter_by(user_id=user_id).all()
\ No newline at end of file
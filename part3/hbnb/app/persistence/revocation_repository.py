@@ -0,0 +1,23 @@
+from app.models.token_revocation import TokenRevocation
+from app.extensions import db
+from app.persistence.repository import SQLAlchemyRepository
+from sqlalchemy import delete, or_
+
+
+class RevocationRepository(SQLAlchemyRepository):
+    def __init__(self):
+        super().__init__(TokenRevocation)
+
+    def get_active_since(self, since, now):
+        """Get (jti, user_id, revoked_at, expires_at) of the revocations made at or
+        after `since` that have not expired at `now` (epoch seconds)."""
+        model = self.model
+        return db.session.query(model.jti, model.user_id, model.revoked_at, model.expires_at).filter(
+            model.revoked_at >= since,
+            or_(model.expires_at.is_(None), model.expires_at > now)
+        ).all()
+
+    def add(self, obj):
+        """Add a revocation, deleting in the same commit those of tokens that have expired anyway."""
+        db.session.execute(delete(self.model).where(self.model.expires_at <= obj.revoked_at))
+        super().add(obj)
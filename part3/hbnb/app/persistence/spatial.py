@@ -0,0 +1,116 @@
+"""Geospatial helpers and the SQLite R*Tree index over places.
+
+On SQLite, `places_rtree` holds one point box per place keyed by the
+place's rowid and is kept in sync by triggers. create_spatial_index(),
+run at startup by run.py, rebuilds it when a VACUUM renumbered the rowids.
+Other databases fall back to a plain latitude/longitude range filter.
+"""
+import math
+
+from sqlalchemy import event, text
+
+from app.models.place import Place
+
+EARTH_RADIUS_KM = 6371.0088
+# Half of the Earth's circumference: no two points are farther apart
+MAX_DISTANCE_KM = math.pi * EARTH_RADIUS_KM
+KM_PER_DEGREE_LAT = math.pi * EARTH_RADIUS_KM / 180
+
+INSERT_TRIGGER_DDL = (
+    "CREATE TRIGGER IF NOT EXISTS places_rtree_insert AFTER INSERT ON places BEGIN "
+    "INSERT INTO places_rtree VALUES (NEW.rowid, NEW.latitude, NEW.latitude, NEW.longitude, NEW.longitude); "
+    "END"
+)
+
+SPATIAL_INDEX_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS places_rtree "
+    "USING rtree(id, min_lat, max_lat, min_lon, max_lon)",
+    INSERT_TRIGGER_DDL,
+    "CREATE TRIGGER IF NOT EXISTS places_rtree_update AFTER UPDATE OF latitude, longitude ON places BEGIN "
+    "UPDATE places_rtree SET min_lat = NEW.latitude, max_lat = NEW.latitude, "
+    "min_lon = NEW.longitude, max_lon = NEW.longitude WHERE id = NEW.rowid; "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS places_rtree_delete AFTER DELETE ON places BEGIN "
+    "DELETE FROM places_rtree WHERE id = OLD.rowid; "
+    "END",
+]
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance between two points, in kilometers."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_boxes(latitude, longitude, radius_km):
+    """Return the (min_lat, max_lat, min_lon, max_lon) boxes covering a circle.
+
+    The circle is split in two boxes when it crosses the antimeridian, and
+    spans every longitude when it reaches a pole.
+    """
+    d_lat = radius_km / KM_PER_DEGREE_LAT
+    min_lat, max_lat = latitude - d_lat, latitude + d_lat
+    if min_lat <= -90 or max_lat >= 90:
+        return [(max(min_lat, -90.0), min(max_lat, 90.0), -180.0, 180.0)]
+
+    # Widest longitude span of the circle, reached at its tangent latitude
+    ratio = math.sin(radius_km / EARTH_RADIUS_KM) / math.cos(math.radians(latitude))
+    if ratio >= 1:
+        return [(min_lat, max_lat, -180.0, 180.0)]
+    d_lon = math.degrees(math.asin(ratio))
+    min_lon, max_lon = longitude - d_lon, longitude + d_lon
+    if min_lon < -180:
+        return [(min_lat, max_lat, min_lon + 360, 180.0), (min_lat, max_lat, -180.0, max_lon)]
+    if max_lon > 180:
+        return [(min_lat, max_lat, min_lon, 180.0), (min_lat, max_lat, -180.0, max_lon - 360)]
+    return [(min_lat, max_lat, min_lon, max_lon)]
+
+
+def create_spatial_index(connection):
+    """Create the R*Tree table and its triggers, and (re)fill it when it is stale."""
+    if connection.dialect.name != 'sqlite':
+        return
+    for statement in SPATIAL_INDEX_DDL:
+        connection.execute(text(statement))
+    if spatial_index_is_stale(connection):
+        rebuild_spatial_index(connection)
+
+
+def spatial_index_is_stale(connection):
+    """Whether the R*Tree no longer holds exactly one box per place.
+
+    `places` has no INTEGER PRIMARY KEY, so a VACUUM may renumber its
+    rowids and leave each box keyed to another place. A box is only
+    counted when it contains the coordinates of the place at its rowid.
+    """
+    indexed = connection.execute(text("SELECT count(*) FROM places_rtree")).scalar()
+    total = connection.execute(text("SELECT count(*) FROM places")).scalar()
+    # Boxes are stored as 32-bit floats rounded outwards, hence the range test
+    matching = connection.execute(text(
+        "SELECT count(*) FROM places JOIN places_rtree ON places_rtree.id = places.rowid "
+        "WHERE places_rtree.min_lat <= places.latitude AND places_rtree.max_lat >= places.latitude "
+        "AND places_rtree.min_lon <= places.longitude AND places_rtree.max_lon >= places.longitude"
+    )).scalar()
+    return indexed != total or matching != total
+
+
+def rebuild_spatial_index(connection):
+    """Refill the R*Tree from the places table."""
+    connection.execute(text("DELETE FROM places_rtree"))
+    connection.execute(text(
+        "INSERT INTO places_rtree SELECT rowid, latitude, latitude, longitude, longitude FROM places"
+    ))
+
+
+@event.listens_for(Place.__table__, 'after_create')
+def _create_spatial_index(target, connection, **kw):
+    create_spatial_index(connection)
+
+
+@event.listens_for(Place.__table__, 'before_drop')
+def _drop_spatial_index(target, connection, **kw):
+    if connection.dialect.name == 'sqlite':
+        connection.execute(text("DROP TABLE IF EXISTS places_rtree"))
@@ -0,0 +1,185 @@
+"""Per-request N+1 and slow-query detection for development and canary instances.
+
+Every SQL statement run while handling a request is recorded under its
+normalized form (literals and bound parameters replaced by `?`). When the
+request ends, statements run `QUERY_DETECTOR_REPEAT_THRESHOLD` times or
+more, typically a lazy load inside a loop, and statements slower than
+`QUERY_DETECTOR_SLOW_MS` are written to a JSON report with the route and
+the application stack that ran them.
+"""
+import json
+import logging
+import os
+import re
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+
+from flask import current_app, request
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REPEAT_THRESHOLD = 3
+DEFAULT_SLOW_MS = 100
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?![\w.])")
+_PARAMETER = re.compile(r"%\(\w+\)s|%s|(?<![:\w]):\w+|\?\d*")
+_VALUES = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_sql(statement):
+    """Return statement with every literal and parameter replaced by `?`.
+
+    Lists such as `IN (?, ?, ?)` collapse to `(?, ...)` so that the same
+    query with a different number of ids still counts as one statement.
+    """
+    statement = _STRING.sub('?', statement)
+    statement = _PARAMETER.sub('?', statement)
+    statement = _NUMBER.sub('?', statement)
+    statement = _VALUES.sub('(?, ...)', statement)
+    return _SPACES.sub(' ', statement).strip()
+
+
+class QueryIssuesError(AssertionError):
+    """Raised at the end of a request in strict mode when it has N+1 statements."""
+
+    def __init__(self, report):
+        self.report = report
+        super().__init__(json.dumps(report, indent=2))
+
+
+class QueryDetector:
+    """Flags repeated (N+1) and slow SQL statements per request.
+
+    Config keys:
+    - QUERY_DETECTOR_ENABLED: record the statements of every request
+      (default False).
+    - QUERY_DETECTOR_REPEAT_THRESHOLD: number of runs of one normalized
+      statement in one request that counts as an N+1 (default 3).
+    - QUERY_DETECTOR_SLOW_MS: statements slower than this are reported
+      (default 100).
+    - QUERY_DETECTOR_REPORT: file the reports are appended to, one JSON
+      object per line. They are always logged as warnings.
+    - QUERY_DETECTOR_STRICT: raise QueryIssuesError when a request has an
+      N+1, so that tests fail on a new one (default False). Slow statements
+      depend on the machine and are only reported.
+    """
+
+    def __init__(self, app=None):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        from app.extensions import db
+        if not app.config.get('QUERY_DETECTOR_ENABLED', False):
+            return
+        app.extensions['query_detector'] = {
+            'repeat_threshold': app.config.get('QUERY_DETECTOR_REPEAT_THRESHOLD', DEFAULT_REPEAT_THRESHOLD),
+            'slow_seconds': app.config.get('QUERY_DETECTOR_SLOW_MS', DEFAULT_SLOW_MS) / 1000,
+            'report_path': app.config.get('QUERY_DETECTOR_REPORT'),
+            'strict': app.config.get('QUERY_DETECTOR_STRICT', False),
+            # Only frames of the application itself are kept in stacks
+            'root': os.path.dirname(app.root_path) + os.sep,
+        }
+        with app.app_context():
+            event.listen(db.engine, 'before_cursor_execute', self._before_cursor_execute)
+            event.listen(db.engine, 'after_cursor_execute', self._after_cursor_execute)
+        app.before_request(self._before_request)
+        app.teardown_request(self._teardown_request)
+
+    # --- Recording ----------------------------------------------------------
+
+    def _before_request(self):
+        settings = current_app.extensions['query_detector']
+        # totals [statements, seconds]; normalized statement -> [count, seconds, stack of the first repeat]; slow issues
+        self._local.request = (settings, [0, 0.0], {}, [])
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        # Kept on the execution context, which is dropped with it when the statement raises
+        if context is not None:
+            context._query_detector_start = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, '_query_detector_start', None)
+        elapsed = time.perf_counter() - start if start is not None else 0.0
+        current = getattr(self._local, 'request', None)
+        if current is None:
+            return
+        settings, totals, statements, slow = current
+        totals[0] += 1
+        totals[1] += elapsed
+        sql = normalize_sql(statement)
+        if elapsed >= settings['slow_seconds']:
+            slow.append({'type': 'slow', 'sql': sql, 'duration_ms': round(elapsed * 1000, 3),
+                         'stack': self._stack(settings['root'])})
+        if getattr(self._local, 'allowed', 0):
+            return
+        entry = statements.get(sql)
+        if entry is None:
+            entry = statements[sql] = [0, 0.0, None]
+        entry[0] += 1
+        entry[1] += elapsed
+        # The first repeat is where the loop is; earlier runs are not worth a stack
+        if entry[0] == 2:
+            entry[2] = self._stack(settings['root'])
+
+    @contextmanager
+    def allow_repeats(self):
+        """Do not count the statements run inside as N+1 candidates.
+
+        For loops that repeat a statement on purpose a bounded number of
+        times; slow statements are still reported.
+        """
+        self._local.allowed = getattr(self._local, 'allowed', 0) + 1
+        try:
+            yield
+        finally:
+            self._local.allowed -= 1
+
+    @staticmethod
+    def _stack(root):
+        """Application frames of the current stack, outermost first, without this module."""
+        return [f'{os.path.relpath(frame.filename, root)}:{frame.lineno} in {frame.name}'
+                for frame in traceback.extract_stack()
+                if frame.filename.startswith(root) and frame.filename != __file__]
+
+    # --- Reporting ----------------------------------------------------------
+
+    def _teardown_request(self, exc):
+        current = getattr(self._local, 'request', None)
+        if current is None:
+            return
+        self._local.request = None
+        settings, totals, statements, slow = current
+        repeated = [{'type': 'n+1', 'sql': sql, 'count': count, 'duration_ms': round(seconds * 1000, 3),
+                     'stack': stack}
+                    for sql, (count, seconds, stack) in statements.items()
+                    if count >= settings['repeat_threshold']]
+        if not repeated and not slow:
+            return
+        rule = request.url_rule
+        report = {
+            'route': rule.rule if rule is not None else None,
+            'method': request.method,
+            'url': request.full_path.rstrip('?'),
+            'statements': totals[0],
+            'duration_ms': round(totals[1] * 1000, 3),
+            'issues': repeated + slow,
+        }
+        self.report(report, settings['report_path'])
+        if settings['strict'] and repeated:
+            raise QueryIssuesError(report)
+
+    def report(self, report, path=None):
+        logger.warning('SQL issues in %s %s: %s', report['method'], report['url'],
+                       ', '.join(f"{issue['type']} x{issue.get('count', 1)}" for issue in report['issues']))
+        if path:
+            line = json.dumps(report) + '\n'
+            with self._lock, open(path, 'a') as f:
+                f.write(line)
@@ -0,0 +1,103 @@
+import threading
+import time
+from collections import OrderedDict
+from itertools import chain
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+
+class EntityCache:
+    """Bounded in-process cache with LRU eviction and a per-entry TTL.
+
+    Keys are (namespace, id) pairs. When listening to SQLAlchemy sessions,
+    every flushed update or delete invalidates the keys returned by
+    `keys_for(obj)`; a key whose id is None drops the whole namespace.
+    The cache is per process, so writes made by other workers are only
+    seen once the TTL expires.
+    """
+
+    def __init__(self, max_size=1024, ttl=300, keys_for=None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.keys_for = keys_for
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, namespace, obj_id):
+        """Return the cached value, or None on a miss or an expired entry."""
+        key = (namespace, obj_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, namespace, obj_id, value):
+        """Store a value, evicting the least recently used entry when full."""
+        key = (namespace, obj_id)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, namespace, obj_id=None):
+        """Drop one entry, or every entry of the namespace when obj_id is None."""
+        with self._lock:
+            if obj_id is not None:
+                self._entries.pop((namespace, obj_id), None)
+                return
+            for key in [key for key in self._entries if key[0] == namespace]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Return the hit/miss counters and the current size."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl': self.ttl,
+            }
+
+    def _invalidate_keys(self, keys):
+        for namespace, obj_id in keys:
+            self.invalidate(namespace, obj_id)
+
+    def _after_flush(self, session, flush_context):
+        keys = [key for obj in chain(session.dirty, session.deleted) for key in self.keys_for(obj)]
+        self._invalidate_keys(keys)
+        # Invalidate again at commit: a concurrent read may re-cache the old row in between
+        session.info.setdefault('entity_cache_keys', []).extend(keys)
+
+    def _after_commit(self, session):
+        self._invalidate_keys(session.info.pop('entity_cache_keys', []))
+
+    def _after_rollback(self, session, previous_transaction):
+        self._invalidate_keys(session.info.pop('entity_cache_keys', []))
+
+    def listen(self):
+        """Start invalidating entries from SQLAlchemy session events."""
+        event.listen(Session, 'after_flush', self._after_flush)
+        event.listen(Session, 'after_commit', self._after_commit)
+        event.listen(Session, 'after_soft_rollback', self._after_rollback)
+
+    def stop_listening(self):
+        for name, listener in (('after_flush', self._after_flush),
+                               ('after_commit', self._after_commit),
+                               ('after_soft_rollback', self._after_rollback)):
+            if event.contains(Session, name, listener):
+                event.remove(Session, name, listener)
@@ -1,12 +1,36 @@
+import time
+import uuid
+from datetime import timedelta
+from sqlalchemy.exc import IntegrityError, InvalidRequestError
 from app.persistence.repository import InMemoryRepository, SQLAlchemyRepository
 from app.models.user import User
 from app.models.amenity import Amenity
 from app.models.review import Review
 from app.models.place import Place
+from app.models.token_revocation import TokenRevocation
 from app.persistence.user_repository import UserRepository
 from app.persistence.review_repository import ReviewRepository
 from app.persistence.place_repository import PlaceRepository
 from app.persistence.amenity_repository import AmenityRepository
+from app.persistence.revocation_repository import RevocationRepository
+from app.services.cache import EntityCache
+from app.services.revocations import RevocationList
+
+
+def _cache_keys_for(obj):
+    """Cache entries to drop when obj is updated or deleted."""
+    if isinstance(obj, Place):
+        return [('place', obj.id), ('place_details', obj.id)]
+    if isinstance(obj, User):
+        # Place details embed the owner
+        return [('user', obj.id), ('place_details', None)]
+    if isinstance(obj, Amenity):
+        # Place details embed their amenities
+        return [('amenity', obj.id), ('place_details', None)]
+    if isinstance(obj, Review):
+        # Reviews change the rating aggregates of their place
+        return [('place', obj.place_id), ('place_details', obj.place_id)]
+    return []
 
 
 class HBnBFacade:
@@ -15,6 +39,75 @@ class HBnBFacade:
         self.review_repo = ReviewRepository()
         self.place_repo = PlaceRepository()
         self.amenity_repo = AmenityRepository()
+        self.revocation_repo = RevocationRepository()
+        self.cache = None
+        self.init_revocations({})
+
+    def init_cache(self, config):
+        """Enable or disable the entity cache from the application config."""
+        if self.cache:
+            self.cache.stop_listening()
+            self.cache = None
+        if config.get('ENTITY_CACHE_ENABLED'):
+            self.cache = EntityCache(config.get('ENTITY_CACHE_SIZE', 1024),
+                                     config.get('ENTITY_CACHE_TTL', 300),
+                                     keys_for=_cache_keys_for)
+            self.cache.listen()
+
+    def init_revocations(self, config):
+        """Reset the in-memory token revocation list from the application config."""
+        self.revocations = RevocationList(self.revocation_repo.get_active_since,
+                                          config.get('JWT_REVOCATION_REFRESH_SECONDS', 2))
+        # Seconds after which a user-wide revocation no longer matters (None: tokens never expire)
+        lifetime = config.get('JWT_ACCESS_TOKEN_EXPIRES', timedelta(minutes=15))
+        if isinstance(lifetime, timedelta):
+            lifetime = lifetime.total_seconds()
+        self.token_lifetime = int(lifetime) if lifetime else None
+
+    def _cached(self, namespace, obj_id, repo, loader):
+        """Read-through lookup: serve obj_id from the cache or load and cache it."""
+        if not self.cache:
+            return loader(obj_id)
+        cached = self.cache.get(namespace, obj_id)
+        if cached is not None:
+            try:
+                return repo.attach(cached)
+            except InvalidRequestError:
+                # The cached instance has pending changes in another session
+                self.cache.invalidate(namespace, obj_id)
+        obj = loader(obj_id)
+        if obj is not None:
+            self.cache.set(namespace, obj_id, obj)
+        return obj
+
+    def _invalidate(self, obj):
+        if self.cache:
+            for namespace, obj_id in _cache_keys_for(obj):
+                self.cache.invalidate(namespace, obj_id)
+
+    def _collection_repo(self, collection):
+        return {'users': self.user_repo, 'amenities': self.amenity_repo,
+                'places': self.place_repo, 'reviews': self.review_repo}[collection]
+
+    def get_collection_stats(self, *collections):
+        """Return (row count, latest updated_at) for each of 'users', 'amenities', 'places', 'reviews'."""
+        first, *others = [self._collection_repo(name) for name in collections]
+        return first.get_collection_stats(*others)
+
+    def get_many(self, collection, ids):
+        """Return (objects, missing ids) of 'users', 'amenities', 'places' or 'reviews' for ids, in one query."""
+        return self._collection_repo(collection).get_many(ids)
+
+    # Plain rows of the named columns, for the list endpoints (see app.api.v1.serialization)
+
+    def get_rows(self, collection, columns):
+        return self._collection_repo(collection).get_rows(columns)
+
+    def get_rows_page(self, collection, columns, limit, cursor=None):
+        return self._collection_repo(collection).get_rows_page(columns, limit, cursor)
+
+    def iter_rows(self, collection, columns):
+        return self._collection_repo(collection).iter_rows(columns)
 
     def create_user(self, user_data):
         user = User(**user_data)
@@ -42,15 +135,48 @@ class HBnBFacade:
         return self.create_user(admin_data)
 
     def get_user(self, user_id):
-        return self.user_repo.get(user_id)
+        return self._cached('user', user_id, self.user_repo, self.user_repo.get)
+
+    def revoke_token(self, jwt_payload):
+        """Revoke one access token, e.g. on logout."""
+        self._add_revocation(TokenRevocation(jti=jwt_payload['jti'], user_id=jwt_payload['sub'],
+                                             revoked_at=int(time.time()), expires_at=jwt_payload.get('exp')))
+
+    def revoke_user_tokens(self, user_id):
+        """Revoke every token issued to a user until now."""
+        now = int(time.time())
+        expires_at = now + self.token_lifetime if self.token_lifetime else None
+        self._add_revocation(TokenRevocation(user_id=user_id, revoked_at=now, expires_at=expires_at))
+
+    def _add_revocation(self, revocation):
+        self.revocation_repo.add(revocation)
+        # Other workers pick it up on their next refresh
+        self.revocations.add(revocation.jti, revocation.user_id, revocation.revoked_at, revocation.expires_at)
+
+    def is_token_revoked(self, jwt_payload):
+        return self.revocations.is_revoked(jwt_payload)
 
     def get_user_by_email(self, email):
         return self.user_repo.get_user_by_email(email)
-    
+
+    def authenticate_user(self, email, password):
+        """Return the user matching the credentials, or None.
+
+        Hashes made with an outdated cost factor are upgraded on a successful login.
+        """
+        user = self.get_user_by_email(email)
+        if not user or not user.verify_password(password):
+            return None
+        if user.password_needs_rehash():
+            user.hash_password(password)
+            self.user_repo.update(user.id, {'password': user.password})
+        return user
+
     def update_user(self, user_id, user_data):
         user = self.get_user(user_id)
         if user:
             self.user_repo.update(user_id, user_data)
+            self._invalidate(user)
         return user
 
     def create_amenity(self, amenity_data):
@@ -59,15 +185,20 @@ class HBnBFacade:
         return amenity
 
     def get_amenity(self, amenity_id):
-        return self.amenity_repo.get(amenity_id)
+        return self._cached('amenity', amenity_id, self.amenity_repo, self.amenity_repo.get)
 
-    def get_all_amenities(self):
-        return self.amenity_repo.get_all()
+    def _get_amenities(self, amenity_ids):
+        """Load the amenities of a place in one query; raises ValueError for the first unknown id."""
+        amenities, missing = self.amenity_repo.get_many(amenity_ids)
+        if missing:
+            raise ValueError(f"Amenity with ID '{missing[0]}' does not exist")
+        return amenities
 
     def update_amenity(self, amenity_id, amenity_data):
         amenity = self.get_amenity(amenity_id)
         if amenity:
             self.amenity_repo.update(amenity_id, amenity_data)
+            self._invalidate(amenity)
         return amenity
 
     def create_place(self, place_data):
@@ -86,20 +217,80 @@ class HBnBFacade:
             owner=owner
         )
 
-        for amenity_id in place_data.get('amenities', []):
-            amenity = self.get_amenity(amenity_id)
-            if not amenity:
-                raise ValueError(f"Amenity with ID '{amenity_id}' does not exist")
+        for amenity in self._get_amenities(place_data.get('amenities', [])):
             place.add_amenity(amenity)
 
         self.place_repo.add(place)
         return place
 
+    def create_places(self, places_data):
+        """Validate and insert many places at once; returns their ids.
+
+        Owners and amenities are checked with one query each, and rows are
+        written with executemany instead of one ORM commit per place. The
+        places and their amenity links are committed together.
+        """
+        owners = self.user_repo.get_existing_ids(p.get('owner_id') for p in places_data)
+        amenities = self.amenity_repo.get_existing_ids(
+            amenity_id for p in places_data for amenity_id in p.get('amenities', []))
+        rows, links = [], []
+        for index, place_data in enumerate(places_data):
+            try:
+                if place_data.get('owner_id') not in owners:
+                    raise ValueError("Owner with the given ID does not exist")
+                for amenity_id in place_data.get('amenities', []):
+                    if amenity_id not in amenities:
+                        raise ValueError(f"Amenity with ID '{amenity_id}' does not exist")
+                row = Place.validate_fields({
+                    'title': place_data['title'],
+                    'description': place_data.get('description', ''),
+                    'price': place_data['price'],
+                    'latitude': place_data['latitude'],
+                    'longitude': place_data['longitude'],
+                })
+            except KeyError as e:
+                raise ValueError(f"places[{index}]: Missing field {e}")
+            except (ValueError, TypeError) as e:
+                raise ValueError(f"places[{index}]: {e}")
+            row['id'] = str(uuid.uuid4())
+            row['user_id'] = place_data['owner_id']
+            rows.append(row)
+            links.extend({'place_id': row['id'], 'amenity_id': amenity_id}
+                         for amenity_id in set(place_data.get('amenities', [])))
+        self.place_repo.add_many_with_amenities(rows, links)
+        return [row['id'] for row in rows]
+
     def get_place(self, place_id):
-        return self.place_repo.get(place_id)
+        return self._cached('place', place_id, self.place_repo, self.place_repo.get)
+
+    def get_place_details(self, place_id):
+        return self._cached('place_details', place_id, self.place_repo, self.place_repo.get_place_details)
+
+    def get_place_rows(self, columns, amenity_columns=None, **filters):
+        """Get filtered, optionally sorted places as rows of the named columns (see PlaceRepository.search_place_rows)."""
+        return self.place_repo.search_place_rows(columns, amenity_columns, **filters)
+
+    def get_place_rows_page(self, columns, amenity_columns, limit, cursor=None, **filters):
+        return self.place_repo.search_place_rows_page(columns, amenity_columns, limit, cursor, **filters)
 
-    def get_all_places(self):
-        return self.place_repo.get_all()
+    def iter_place_rows(self, columns, amenity_columns=None, **filters):
+        return self.place_repo.iter_place_rows(columns, amenity_columns, **filters)
+
+    def search_places_fulltext(self, q, limit, cursor=None):
+        """Get one page of (place, score) pairs ranked by relevance to q."""
+        if not q or not q.strip():
+            raise ValueError("Search query must not be empty")
+        return self.place_repo.search_fulltext(q, limit, cursor)
+
+    def get_places_near(self, latitude, longitude, radius_km=None, k=10):
+        """Get the k nearest places to a point as (place, distance_km) pairs."""
+        if not -90 <= latitude <= 90:
+            raise ValueError("Latitude must be between -90 and 90")
+        if not -180 <= longitude <= 180:
+            raise ValueError("Longitude must be between -180 and 180")
+        if radius_km is not None and radius_km <= 0:
+            raise ValueError("radius_km must be positive")
+        return self.place_repo.get_places_near(latitude, longitude, radius_km, k)
 
     def update_place(self, place_id, place_data):
         place = self.get_place(place_id)
@@ -120,15 +311,10 @@ class HBnBFacade:
 
         # Handle amenities update - clear and re-add
         if 'amenities' in place_data:
-            new_amenities = []
-            for amenity_id in place_data['amenities']:
-                amenity = self.get_amenity(amenity_id)
-                if not amenity:
-                    raise ValueError(f"Amenity with ID '{amenity_id}' does not exist")
-                new_amenities.append(amenity)
-            update_data['amenities'] = new_amenities
+            update_data['amenities'] = self._get_amenities(place_data['amenities'])
 
         self.place_repo.update(place_id, update_data)
+        self._invalidate(place)
         return self.get_place(place_id)
 
     def create_review(self, review_data):
@@ -136,29 +322,64 @@ class HBnBFacade:
         place = self.get_place(review_data['place_id'])
         if not user or not place:
             raise ValueError("Invalid user_id or place_id for review")
+        if self.review_repo.user_has_reviewed_place(user.id, place.id):
+            raise ValueError("You have already reviewed this place")
         review = Review(
             text=review_data['text'],
             rating=review_data['rating'],
             place=place,
             user=user
         )
-        self.review_repo.add(review)
+        try:
+            self.review_repo.add(review)
+        except IntegrityError:
+            # A concurrent request inserted the same (user, place) pair first
+            raise ValueError("You have already reviewed this place")
+        self._invalidate(review)
         return review
 
+    def create_reviews(self, reviews_data):
+        """Validate and insert many reviews at once; returns their ids."""
+        users = self.user_repo.get_existing_ids(r.get('user_id') for r in reviews_data)
+        places = self.place_repo.get_existing_ids(r.get('place_id') for r in reviews_data)
+        rows, pairs = [], set()
+        for index, review_data in enumerate(reviews_data):
+            try:
+                if review_data.get('user_id') not in users or review_data.get('place_id') not in places:
+                    raise ValueError("Invalid user_id or place_id for review")
+                pair = (review_data['user_id'], review_data['place_id'])
+                if pair in pairs:
+                    raise ValueError("You have already reviewed this place")
+                pairs.add(pair)
+                row = Review.validate_fields({
+                    'text': review_data['text'],
+                    'rating': review_data['rating'],
+                })
+            except KeyError as e:
+                raise ValueError(f"reviews[{index}]: Missing field {e}")
+            except (ValueError, TypeError) as e:
+                raise ValueError(f"reviews[{index}]: {e}")
+            row['id'] = str(uuid.uuid4())
+            row['user_id'], row['place_id'] = pair
+            rows.append(row)
+        try:
+            self.review_repo.add_many(rows)
+        except IntegrityError:
+            raise ValueError("At least one user has already reviewed one of these places")
+        if self.cache:
+            for place_id in {row['place_id'] for row in rows}:
+                self.cache.invalidate('place', place_id)
+                self.cache.invalidate('place_details', place_id)
+        return [row['id'] for row in rows]
+
     def get_review(self, review_id):
         review = self.review_repo.get(review_id)
         if not review:
             raise ValueError("Review not found")
         return review
 
-    def get_all_reviews(self):
-        return self.review_repo.get_all()
-
-    def get_reviews_by_place(self, place_id):
-        return [
-            review for review in self.review_repo.get_all()
-            if review.place.id == place_id
-        ]
+    def get_reviews_page_by_place(self, place_id, limit, cursor=None):
+        return self.review_repo.get_reviews_page_by_place_id(place_id, limit, cursor)
 
     def update_review(self, review_id, review_data):
         review = self.get_review(review_id)
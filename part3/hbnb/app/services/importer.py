@@ -0,0 +1,349 @@
+"""Streaming import of users, amenities, places and reviews.
+
+Rows are read one at a time from NDJSON or CSV, validated with the models'
+@validates hooks, and written in chunks: foreign keys are resolved with one
+lookup per chunk and each chunk is inserted with executemany, so memory use
+does not grow with the size of the file.
+
+Columns per kind (CSV header or NDJSON keys):
+- users: first_name, last_name, email, password or password_hash, is_admin
+- amenities: name
+- places: title, description, price, latitude, longitude, owner_email,
+  amenities (amenity names; `|`-separated in CSV)
+- reviews: text, rating, user_email, place_id
+
+Every kind also accepts an optional `id`, so that reviews can refer to
+imported places. Invalid rows are skipped and reported with their line number.
+"""
+import csv
+import json
+import time
+import uuid
+from itertools import islice
+
+from sqlalchemy.exc import IntegrityError
+
+from app.extensions import db, password_hasher
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+
+IMPORT_KINDS = ('users', 'amenities', 'places', 'reviews')
+IMPORT_FORMATS = ('ndjson', 'csv')
+DEFAULT_CHUNK_SIZE = 5000
+# Separator of multi-valued CSV cells (amenity names of a place)
+CSV_LIST_SEPARATOR = '|'
+
+
+def _to_bool(value):
+    if value.strip().lower() in ('', '0', 'false', 'no'):
+        return False
+    if value.strip().lower() in ('1', 'true', 'yes'):
+        return True
+    raise ValueError(f"Invalid boolean {value!r}")
+
+
+def _to_list(value):
+    return [item.strip() for item in value.split(CSV_LIST_SEPARATOR) if item.strip()]
+
+
+# CSV cells are strings: convert them to the types the validators expect
+CSV_CONVERTERS = {
+    'users': {'is_admin': _to_bool},
+    'amenities': {},
+    'places': {'price': float, 'latitude': float, 'longitude': float, 'amenities': _to_list},
+    'reviews': {'rating': int},
+}
+
+
+def read_ndjson(stream):
+    """Yield (line_number, row, error) for each non-blank line of an NDJSON stream."""
+    for line_number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield line_number, line.rstrip('\n'), f"Invalid JSON: {e}"
+            continue
+        if not isinstance(row, dict):
+            yield line_number, row, "Each line must be a JSON object"
+            continue
+        yield line_number, row, None
+
+
+def read_csv(stream, kind):
+    """Yield (line_number, row, error) for each record of a CSV stream with a header."""
+    converters = CSV_CONVERTERS[kind]
+    reader = csv.DictReader(stream)
+    for row in reader:
+        # Drop empty cells so that optional columns fall back to their default
+        row = {key: value for key, value in row.items() if key and value not in (None, '')}
+        try:
+            for key, convert in converters.items():
+                if key in row:
+                    row[key] = convert(row[key])
+        except ValueError:
+            yield reader.line_num, row, f"Invalid value for '{key}': {row[key]!r}"
+            continue
+        yield reader.line_num, row, None
+
+
+def read_rows(stream, fmt, kind):
+    if fmt == 'csv':
+        return read_csv(stream, kind)
+    return read_ndjson(stream)
+
+
+def _validate_id(row):
+    obj_id = row.get('id')
+    if obj_id is None:
+        return str(uuid.uuid4())
+    if not isinstance(obj_id, str) or not obj_id or len(obj_id) > 36:
+        raise ValueError("id must be a string of at most 36 characters")
+    return obj_id
+
+
+class Importer:
+    """Import one kind of rows in chunks, reporting rejected rows.
+
+    `rejects` is an optional text stream receiving one JSON object per
+    rejected row ({"line", "error", "row"}); `progress` is called with the
+    running stats after every chunk.
+    """
+
+    def __init__(self, kind, repos, chunk_size=DEFAULT_CHUNK_SIZE, rejects=None, progress=None):
+        if kind not in IMPORT_KINDS:
+            raise ValueError(f"Unknown import kind '{kind}'")
+        self.kind = kind
+        self.repos = repos
+        self.chunk_size = chunk_size
+        self.rejects = rejects
+        self.progress = progress
+        self.imported = 0
+        self.rejected = 0
+        self._started = None
+        self._validate = getattr(self, f'_validate_{kind}')
+        self._resolve = getattr(self, f'_resolve_{kind}')
+        self._write = getattr(self, f'_write_{kind}')
+
+    def stats(self):
+        elapsed = time.perf_counter() - self._started if self._started else 0.0
+        return {
+            'kind': self.kind,
+            'imported': self.imported,
+            'rejected': self.rejected,
+            'seconds': elapsed,
+            'rows_per_second': (self.imported + self.rejected) / elapsed if elapsed else 0.0,
+        }
+
+    def run(self, records):
+        """Import (line_number, row, error) records as produced by read_rows; returns the stats."""
+        self._started = time.perf_counter()
+        records = iter(records)
+        while True:
+            chunk = list(islice(records, self.chunk_size))
+            if not chunk:
+                return self.stats()
+            self._import_chunk(chunk)
+            if self.progress:
+                self.progress(self.stats())
+
+    def _write_rejects(self, rejected):
+        self.rejected += len(rejected)
+        if self.rejects is None:
+            return
+        for line_number, row, error in sorted(rejected, key=lambda reject: reject[0]):
+            self.rejects.write(json.dumps({'line': line_number, 'error': error, 'row': row}, default=str) + '\n')
+
+    def _import_chunk(self, chunk):
+        rejected = []
+        try:
+            self._import_valid_rows(chunk, rejected)
+        finally:
+            self._write_rejects(rejected)
+
+    def _import_valid_rows(self, chunk, rejected):
+        valid = []
+        for line_number, row, error in chunk:
+            if error is None:
+                try:
+                    valid.append((line_number, row, self._validate(row)))
+                    continue
+                except KeyError as e:
+                    error = f"Missing field {e}"
+                except (ValueError, TypeError) as e:
+                    error = str(e)
+            rejected.append((line_number, row, error))
+
+        accepted = []
+        for line_number, row, values, error in self._resolve(valid):
+            if error is None:
+                accepted.append((line_number, row, values))
+            else:
+                rejected.append((line_number, row, error))
+        if not accepted:
+            return
+        try:
+            self._write([values for _, _, values in accepted])
+        except IntegrityError as e:
+            # Rows changed since the lookups, e.g. a concurrent signup with the same email
+            db.session.rollback()
+            for line_number, row, _ in accepted:
+                rejected.append((line_number, row, f"Database error: {e.orig}"))
+            return
+        self.imported += len(accepted)
+
+    def _check_ids(self, repo, valid):
+        """Yield (line_number, row, values, error), rejecting ids that already exist or repeat."""
+        existing = repo.get_existing_ids(values['id'] for _, _, values in valid)
+        seen = set()
+        for line_number, row, values in valid:
+            if values['id'] in existing or values['id'] in seen:
+                yield line_number, row, values, f"Duplicate id '{values['id']}'"
+                continue
+            seen.add(values['id'])
+            yield line_number, row, values, None
+
+    def _check_unique(self, repo, attr_name, label, checked):
+        """Reject rows whose attr_name is already taken, in the database or earlier in the chunk."""
+        checked = list(checked)
+        taken = set(repo.get_ids_by_attribute(
+            attr_name, [values[attr_name] for _, _, values, error in checked if error is None]))
+        for line_number, row, values, error in checked:
+            if error is None:
+                if values[attr_name] in taken:
+                    error = f"{label} '{values[attr_name]}' already exists"
+                else:
+                    taken.add(values[attr_name])
+            yield line_number, row, values, error
+
+    # Users
+
+    def _validate_users(self, row):
+        values = User.validate_fields({
+            'first_name': row['first_name'],
+            'last_name': row['last_name'],
+            'email': row['email'],
+            'is_admin': row.get('is_admin', False),
+        })
+        values['id'] = _validate_id(row)
+        if row.get('password_hash') is not None:
+            password_hash = row['password_hash']
+            if not isinstance(password_hash, str) or not password_hash.startswith('$2') or len(password_hash) != 60:
+                raise ValueError("password_hash must be a bcrypt hash")
+            values['password'] = password_hash
+        else:
+            password = row['password']
+            if not isinstance(password, str) or not password:
+                raise ValueError("Password must be a non-empty string")
+            # Hashed for the whole chunk at once in _write_users
+            values['_password'] = password
+        return values
+
+    def _resolve_users(self, valid):
+        return self._check_unique(self.repos.user_repo, 'email', 'Email',
+                                  self._check_ids(self.repos.user_repo, valid))
+
+    def _write_users(self, rows):
+        to_hash = [row for row in rows if '_password' in row]
+        for row, hashed in zip(to_hash, password_hasher.hash_many([row.pop('_password') for row in to_hash])):
+            row['password'] = hashed
+        self.repos.user_repo.add_many(rows)
+
+    # Amenities
+
+    def _validate_amenities(self, row):
+        values = Amenity.validate_fields({'name': row['name']})
+        values['id'] = _validate_id(row)
+        return values
+
+    def _resolve_amenities(self, valid):
+        # Places refer to amenities by name, so names must stay unambiguous
+        return self._check_unique(self.repos.amenity_repo, 'name', 'Amenity',
+                                  self._check_ids(self.repos.amenity_repo, valid))
+
+    def _write_amenities(self, rows):
+        self.repos.amenity_repo.add_many(rows)
+
+    # Places
+
+    def _validate_places(self, row):
+        values = Place.validate_fields({
+            'title': row['title'],
+            'description': row.get('description', ''),
+            'price': row['price'],
+            'latitude': row['latitude'],
+            'longitude': row['longitude'],
+        })
+        values['id'] = _validate_id(row)
+        values['_owner_email'] = row['owner_email']
+        amenities = row.get('amenities', [])
+        if not isinstance(amenities, list) or not all(isinstance(name, str) for name in amenities):
+            raise TypeError("amenities must be a list of amenity names")
+        values['_amenities'] = amenities
+        return values
+
+    def _resolve_places(self, valid):
+        owners = self.repos.user_repo.get_ids_by_attribute(
+            'email', [values['_owner_email'] for _, _, values in valid])
+        amenities = self.repos.amenity_repo.get_ids_by_attribute(
+            'name', [name for _, _, values in valid for name in values['_amenities']])
+        for line_number, row, values, error in self._check_ids(self.repos.place_repo, valid):
+            if error is None:
+                owner_email = values.pop('_owner_email')
+                names = values.pop('_amenities')
+                missing = [name for name in names if name not in amenities]
+                if owner_email not in owners:
+                    error = f"Unknown owner '{owner_email}'"
+                elif missing:
+                    error = f"Unknown amenity '{missing[0]}'"
+                else:
+                    values['user_id'] = owners[owner_email]
+                    values['_amenity_ids'] = {amenities[name] for name in names}
+            yield line_number, row, values, error
+
+    def _write_places(self, rows):
+        links = [{'place_id': row['id'], 'amenity_id': amenity_id}
+                 for row in rows for amenity_id in row.pop('_amenity_ids')]
+        self.repos.place_repo.add_many_with_amenities(rows, links)
+
+    # Reviews
+
+    def _validate_reviews(self, row):
+        values = Review.validate_fields({'text': row['text'], 'rating': row['rating']})
+        values['id'] = _validate_id(row)
+        values['_user_email'] = row['user_email']
+        values['place_id'] = row['place_id']
+        return values
+
+    def _resolve_reviews(self, valid):
+        users = self.repos.user_repo.get_ids_by_attribute(
+            'email', [values['_user_email'] for _, _, values in valid])
+        places = self.repos.place_repo.get_existing_ids(values['place_id'] for _, _, values in valid)
+        resolved = []
+        for line_number, row, values, error in self._check_ids(self.repos.review_repo, valid):
+            if error is None:
+                user_email = values.pop('_user_email')
+                if user_email not in users:
+                    error = f"Unknown user '{user_email}'"
+                elif values['place_id'] not in places:
+                    error = f"Unknown place '{values['place_id']}'"
+                else:
+                    values['user_id'] = users[user_email]
+            resolved.append((line_number, row, values, error))
+
+        reviewed = self.repos.review_repo.get_reviewed_pairs(
+            (values['user_id'], values['place_id']) for _, _, values, error in resolved if error is None)
+        for line_number, row, values, error in resolved:
+            if error is None:
+                pair = (values['user_id'], values['place_id'])
+                if pair in reviewed:
+                    error = "This user has already reviewed this place"
+                else:
+                    reviewed.add(pair)
+            yield line_number, row, values, error
+
+    def _write_reviews(self, rows):
+        self.repos.review_repo.add_many(rows)
@@ -0,0 +1,83 @@
+import threading
+import time
+
+# Seconds between two passes dropping expired revocations from memory
+PRUNE_INTERVAL = 60
+
+
+class RevocationList:
+    """In-process copy of the token_revocations table, checked on every authenticated request.
+
+    Revoked jtis are kept in one dict (jti -> exp) and user-wide revocations
+    in another (user_id -> (revoked_at, exp)), so a check is two hash
+    lookups. Every `refresh_interval` seconds, one request re-reads the
+    revocations made since the previous read, going back `grace` extra
+    seconds to catch transactions that committed late and clock skew
+    between hosts. Rows are merged idempotently, so reading one twice is
+    harmless. A revocation made by another worker process is enforced here
+    within refresh_interval seconds; the worker that makes it enforces it at once.
+    """
+
+    def __init__(self, load_since, refresh_interval=2, grace=30):
+        # load_since(since, now) -> rows of (jti, user_id, revoked_at, expires_at)
+        self.load_since = load_since
+        self.refresh_interval = refresh_interval
+        self.grace = grace
+        self._tokens = {}
+        self._users = {}
+        self._loaded_at = None
+        self._next_refresh = 0.0
+        self._next_prune = 0
+        self._lock = threading.Lock()
+
+    def add(self, jti, user_id, revoked_at, expires_at):
+        """Record one revocation: a single token when jti is set, else every token of user_id up to revoked_at."""
+        if jti is not None:
+            self._tokens[jti] = expires_at
+            return
+        current = self._users.get(user_id)
+        if current is not None:
+            revoked_at = max(revoked_at, current[0])
+            expires_at = None if None in (expires_at, current[1]) else max(expires_at, current[1])
+        self._users[user_id] = (revoked_at, expires_at)
+
+    def is_revoked(self, jwt_payload):
+        if time.monotonic() >= self._next_refresh:
+            self.refresh()
+        if jwt_payload.get('jti') in self._tokens:
+            return True
+        revoked = self._users.get(jwt_payload.get('sub'))
+        # iat has a one second resolution: tokens issued in the second of the revocation are revoked too
+        return revoked is not None and jwt_payload.get('iat', 0) <= revoked[0]
+
+    def refresh(self):
+        """Merge the revocations made since the last read.
+
+        Until the first read has completed every check waits for it; after
+        that, checks made during a refresh use the data already loaded.
+        """
+        if not self._lock.acquire(blocking=self._loaded_at is None):
+            return
+        try:
+            if time.monotonic() < self._next_refresh:
+                return
+            now = int(time.time())
+            since = 0 if self._loaded_at is None else self._loaded_at - self.grace
+            for row in self.load_since(since, now):
+                self.add(*row)
+            self._loaded_at = now
+            if now >= self._next_prune:
+                self._prune(now)
+                self._next_prune = now + PRUNE_INTERVAL
+            self._next_refresh = time.monotonic() + self.refresh_interval
+        finally:
+            self._lock.release()
+
+    def _prune(self, now):
+        # New dicts are swapped in whole, so concurrent checks never see a half-pruned one
+        self._tokens = {jti: exp for jti, exp in self._tokens.items() if exp is None or exp > now}
+        self._users = {user_id: entry for user_id, entry in self._users.items()
+                       if entry[1] is None or entry[1] > now}
+
+    def __len__(self):
+        return len(self._tokens) + len(self._users)
@@ -0,0 +1,52 @@
+"""Benchmark HBnBFacade.create_places on a SQLite file database.
+
+Usage: python -m benchmarks.bench_bulk_insert [number_of_places]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+from app import create_app
+from app.extensions import db
+from app.models.place import Place
+from app.models.user import User
+from app.services import facade
+
+BATCH_SIZE = 100000
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    path = os.path.join(tempfile.mkdtemp(), 'bench.db')
+
+    class BenchConfig:
+        SECRET_KEY = 'bench'
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+        SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.create_all()
+        owner = User(first_name="Bench", last_name="Owner", email="bench@example.com", password="x")
+        db.session.add(owner)
+        db.session.commit()
+
+        start = time.perf_counter()
+        for offset in range(0, count, BATCH_SIZE):
+            facade.create_places([{
+                'title': f'Place {i}',
+                'description': 'Benchmark place',
+                'price': random.uniform(10, 500),
+                'latitude': random.uniform(-85, 85),
+                'longitude': random.uniform(-180, 180),
+                'owner_id': owner.id,
+            } for i in range(offset, min(offset + BATCH_SIZE, count))])
+        elapsed = time.perf_counter() - start
+        assert Place.query.count() == count
+        print(f"inserted {count} places in {elapsed:.1f}s ({count / elapsed:,.0f} rows/s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""Benchmark POST /api/v1/auth/login throughput and its impact on other routes.
+
+Runs a login storm from several threads while another thread keeps calling
+GET /api/v1/amenities/, once with hashing on the request threads and once
+with the process pool.
+
+Usage: python -m benchmarks.bench_login [seconds] [threads] [rounds]
+"""
+import os
+import statistics
+import sys
+import threading
+import time
+
+from app import create_app
+from app.extensions import db, password_hasher
+from app.models.user import User
+
+
+def run(workers, seconds, threads, rounds):
+    class BenchConfig:
+        SECRET_KEY = 'bench-secret-key-long-enough-for-hs256'
+        SQLALCHEMY_DATABASE_URI = 'sqlite://'
+        SQLALCHEMY_TRACK_MODIFICATIONS = False
+        BCRYPT_LOG_ROUNDS = rounds
+        PASSWORD_HASH_WORKERS = workers
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.create_all()
+        for i in range(threads):
+            user = User(first_name="Bench", last_name="User", email=f"user{i}@example.com", password="x")
+            user.hash_password("secret123")
+            db.session.add(user)
+        db.session.commit()
+
+    logins = []
+    latencies = []
+    deadline = time.perf_counter() + seconds
+
+    def login_storm(i):
+        client = app.test_client()
+        count = 0
+        while time.perf_counter() < deadline:
+            response = client.post('/api/v1/auth/login',
+                                   json={'email': f'user{i}@example.com', 'password': 'secret123'})
+            assert response.status_code == 200, response.get_data(as_text=True)
+            count += 1
+        logins.append(count)
+
+    def reader():
+        client = app.test_client()
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            client.get('/api/v1/amenities/')
+            latencies.append((time.perf_counter() - start) * 1000)
+            time.sleep(0.01)
+
+    workers_threads = [threading.Thread(target=login_storm, args=(i,)) for i in range(threads)]
+    workers_threads.append(threading.Thread(target=reader))
+    for thread in workers_threads:
+        thread.start()
+    for thread in workers_threads:
+        thread.join()
+    password_hasher.shutdown()
+
+    latencies.sort()
+    mode = f"pool of {workers}" if workers else "request thread"
+    print(f"{mode:>16}: {sum(logins) / seconds:.1f} logins/s, "
+          f"GET /amenities/ p50={statistics.median(latencies):.1f}ms "
+          f"p95={latencies[int(len(latencies) * 0.95)]:.1f}ms")
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 10
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    rounds = int(sys.argv[3]) if len(sys.argv) > 3 else 12
+    print(f"{threads} login threads for {seconds:.0f}s, bcrypt cost {rounds}, {os.cpu_count()} CPUs")
+    run(0, seconds, threads, rounds)
+    run(os.cpu_count() or 1, seconds, threads, rounds)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""Latency of GET /api/v1/places/search (FTS5) on a large catalog.
+
+Usage: python -m benchmarks.bench_place_search [number_of_places]
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from app import create_app
+from app.extensions import db
+from app.models.user import User
+from app.services import facade
+
+BATCH_SIZE = 100000
+ROUNDS = 50
+# A Zipf-like vocabulary: a few common words and a long tail of rare ones
+VOCABULARY = [f'word{i}' for i in range(20000)]
+COMMON = ['apartment', 'house', 'studio', 'loft', 'villa', 'cozy', 'bright', 'quiet', 'central', 'garden']
+QUERIES = ['villa', 'cozy loft', 'word12', 'word1234', 'gard', 'quiet central studio', 'word19999 house']
+
+
+def random_text(rng, words):
+    return ' '.join(rng.choice(COMMON) if rng.random() < 0.3 else VOCABULARY[int(rng.paretovariate(1.2)) % 20000]
+                    for _ in range(words))
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    path = os.path.join(tempfile.mkdtemp(), 'bench.db')
+
+    class BenchConfig:
+        SECRET_KEY = 'bench'
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+        SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    app = create_app(BenchConfig)
+    client = app.test_client()
+    rng = random.Random(42)
+    with app.app_context():
+        db.create_all()
+        owner = User(first_name="Bench", last_name="Owner", email="bench@example.com", password="x")
+        db.session.add(owner)
+        db.session.commit()
+        start = time.perf_counter()
+        for offset in range(0, count, BATCH_SIZE):
+            facade.create_places([{
+                'title': random_text(rng, 4), 'description': random_text(rng, 30), 'price': 100.0,
+                'latitude': 0.0, 'longitude': 0.0, 'owner_id': owner.id,
+            } for _ in range(offset, min(offset + BATCH_SIZE, count))])
+        print(f"inserted and indexed {count} places in {time.perf_counter() - start:.1f}s")
+
+        for query in QUERIES:
+            timings = []
+            for _ in range(ROUNDS):
+                db.session.remove()
+                start = time.perf_counter()
+                response = client.get('/api/v1/places/search', query_string={'q': query, 'limit': 20})
+                timings.append((time.perf_counter() - start) * 1000)
+                assert response.status_code == 200, response.get_json()
+            cursor = response.get_json()['next_cursor']
+            timings.sort()
+            print(f"{query!r:>24}: p50 {statistics.median(timings):7.1f} ms  "
+                  f"p95 {timings[int(len(timings) * 0.95) - 1]:7.1f} ms  "
+                  f"{'more pages' if cursor else 'single page'}")
+
+
+if __name__ == '__main__':
+    main()
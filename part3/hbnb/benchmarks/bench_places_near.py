@@ -0,0 +1,80 @@
+"""Benchmark GET /api/v1/places/near on a large SQLite catalog.
+
+Usage: python -m benchmarks.bench_places_near [number_of_places]
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime
+
+from app import create_app
+from app.extensions import db
+from app.models.place import Place
+from app.models.user import User
+
+CHUNK_SIZE = 50000
+QUERIES = 200
+
+
+def seed_places(count, owner_id):
+    """Insert `count` random places with executemany-style chunks."""
+    now = datetime.now()
+    for start in range(0, count, CHUNK_SIZE):
+        rows = [{
+            'id': str(uuid.uuid4()),
+            'title': f'Place {i}',
+            'description': '',
+            'price': 100.0,
+            'latitude': random.uniform(-85, 85),
+            'longitude': random.uniform(-180, 180),
+            'user_id': owner_id,
+            'created_at': now,
+            'updated_at': now,
+        } for i in range(start, min(start + CHUNK_SIZE, count))]
+        db.session.execute(Place.__table__.insert(), rows)
+        db.session.commit()
+
+
+def timed(client, url):
+    start = time.perf_counter()
+    response = client.get(url)
+    elapsed = (time.perf_counter() - start) * 1000
+    assert response.status_code == 200, response.get_data(as_text=True)
+    return elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    path = os.path.join(tempfile.mkdtemp(), 'bench.db')
+
+    class BenchConfig:
+        SECRET_KEY = 'bench'
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+        SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    app = create_app(BenchConfig)
+    client = app.test_client()
+    with app.app_context():
+        db.create_all()
+        owner = User(first_name="Bench", last_name="Owner", email="bench@example.com", password="x")
+        db.session.add(owner)
+        db.session.commit()
+        start = time.perf_counter()
+        seed_places(count, owner.id)
+        print(f"seeded {count} places in {time.perf_counter() - start:.1f}s")
+
+        points = [(random.uniform(-60, 60), random.uniform(-180, 180)) for _ in range(QUERIES)]
+        for label, template in [('radius_km=5', '/api/v1/places/near?lat={}&lon={}&radius_km=5'),
+                                ('radius_km=50', '/api/v1/places/near?lat={}&lon={}&radius_km=50'),
+                                ('k=10', '/api/v1/places/near?lat={}&lon={}&k=10')]:
+            timings = sorted(timed(client, template.format(lat, lon)) for lat, lon in points)
+            print(f"{label:>14}: p50={statistics.median(timings):.2f}ms "
+                  f"p95={timings[int(len(timings) * 0.95)]:.2f}ms max={timings[-1]:.2f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""Concurrent reads and writes on SQLite: default settings vs ProductionConfig.
+
+One thread creates amenities (one commit each) while reader threads list
+them, for a few seconds per configuration.
+
+Usage: python -m benchmarks.bench_sqlite_config [seconds] [readers]
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from sqlalchemy.exc import OperationalError
+
+from app import create_app
+from app.extensions import db
+from app.models.amenity import Amenity
+from config import ProductionConfig
+
+
+def run(config_class, seconds, readers):
+    """Return (writes, reads, lock errors) done in `seconds`."""
+    app = create_app(config_class)
+    with app.app_context():
+        db.create_all()
+        db.session.add_all(Amenity(name=f'Amenity {i}') for i in range(100))
+        db.session.commit()
+    counts = {'writes': 0, 'reads': 0, 'errors': 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def write():
+        with app.app_context():
+            i = 0
+            while time.perf_counter() < deadline:
+                try:
+                    db.session.add(Amenity(name=f'New {i}'))
+                    db.session.commit()
+                    key = 'writes'
+                except OperationalError:
+                    db.session.rollback()
+                    key = 'errors'
+                with lock:
+                    counts[key] += 1
+                i += 1
+            db.session.remove()
+
+    def read():
+        with app.app_context():
+            while time.perf_counter() < deadline:
+                try:
+                    Amenity.query.limit(50).all()
+                    key = 'reads'
+                except OperationalError:
+                    key = 'errors'
+                db.session.remove()
+                with lock:
+                    counts[key] += 1
+
+    threads = [threading.Thread(target=write)] + [threading.Thread(target=read) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    with app.app_context():
+        db.engine.dispose()
+    return counts['writes'], counts['reads'], counts['errors']
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    readers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    tmpdir = tempfile.mkdtemp()
+
+    class DefaultConfig:
+        SECRET_KEY = 'bench'
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(tmpdir, 'default.db')}"
+        SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    class BenchProductionConfig(ProductionConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(tmpdir, 'production.db')}"
+
+    for label, config_class in (('default', DefaultConfig), ('production', BenchProductionConfig)):
+        writes, reads, errors = run(config_class, seconds, readers)
+        print(f"{label:>10}: {writes / seconds:8.0f} writes/s  {reads / seconds:8.0f} reads/s  "
+              f"{errors} 'database is locked' errors")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""Compare peak memory of GET /api/v1/places/ buffered vs streamed (?stream=true).
+
+Usage: python -m benchmarks.bench_stream_export [number_of_places]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from app import create_app
+from app.extensions import db
+from app.models.user import User
+from app.services import facade
+
+BATCH_SIZE = 100000
+
+
+def measure(client, url, headers=None):
+    """Fetch url chunk by chunk; return (peak traced MiB, seconds, body bytes)."""
+    db.session.remove()
+    tracemalloc.start()
+    start = time.perf_counter()
+    response = client.get(url, headers=headers, buffered=False)
+    assert response.status_code == 200, response.status_code
+    size = sum(len(chunk) for chunk in response.response)
+    response.close()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    tracemalloc.stop()
+    return peak, elapsed, size
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    path = os.path.join(tempfile.mkdtemp(), 'bench.db')
+
+    class BenchConfig:
+        SECRET_KEY = 'bench'
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+        SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    app = create_app(BenchConfig)
+    client = app.test_client()
+    with app.app_context():
+        db.create_all()
+        owner = User(first_name="Bench", last_name="Owner", email="bench@example.com", password="x")
+        db.session.add(owner)
+        db.session.commit()
+        for offset in range(0, count, BATCH_SIZE):
+            facade.create_places([{
+                'title': f'Place {i}', 'description': 'Benchmark place', 'price': 100.0,
+                'latitude': 0.0, 'longitude': 0.0, 'owner_id': owner.id,
+            } for i in range(offset, min(offset + BATCH_SIZE, count))])
+
+        for label, url, headers in (
+                ('streamed', '/api/v1/places/?stream=true', None),
+                ('streamed gzip', '/api/v1/places/?stream=true', {'Accept-Encoding': 'gzip'}),
+                ('buffered', '/api/v1/places/', None)):
+            peak, elapsed, size = measure(client, url, headers)
+            print(f"{label:>14}: peak {peak:8.1f} MiB  {elapsed:6.1f}s  {size / 2 ** 20:7.1f} MiB sent")
+
+
+if __name__ == '__main__':
+    main()
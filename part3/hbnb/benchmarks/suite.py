@@ -0,0 +1,518 @@
+"""Benchmark every /api/v1 route on a seeded dataset and compare runs.
+
+The dataset has SCALE users, places, amenities and reviews. It is seeded
+once per scale and kept in --data-dir, and each run works on a copy of it.
+Results (p50/p95/p99 latency, throughput, SQL queries per request) are
+written as JSON.
+
+Usage:
+    python -m benchmarks.suite run --scale 100k [--http] [--requests 200] [--output results.json]
+    python -m benchmarks.suite run --scale 1k --compare baseline.json
+    python -m benchmarks.suite compare baseline.json results.json [--threshold 0.2]
+
+--scale is 1k, 100k, 1m or a number of rows. The compare step exits with
+status 1 when a route regressed.
+"""
+import argparse
+import http.client
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event, text
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+from app import create_app
+from app.extensions import db, password_hasher
+from app.services import facade
+
+SCALES = {'1k': 1000, '100k': 100000, '1m': 1000000}
+SEED_CHUNK = 50000
+# Amenities that places are linked to, so that amenity filters hit many places
+POPULAR_AMENITIES = 50
+PASSWORD = 'bench-password'
+WORDS = ['apartment', 'house', 'studio', 'loft', 'villa', 'cozy', 'bright', 'quiet', 'central', 'garden',
+         'sea', 'view', 'mountain', 'city', 'family', 'pool', 'terrace', 'historic', 'modern', 'river']
+DEFAULT_DATA_DIR = os.path.join(tempfile.gettempdir(), 'hbnb-benchmarks')
+
+
+def scale_rows(scale):
+    return SCALES[scale] if scale in SCALES else int(scale)
+
+
+def make_config(path):
+    class BenchConfig:
+        SECRET_KEY = 'bench-secret-key-long-enough-for-hs256'
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+        SQLALCHEMY_TRACK_MODIFICATIONS = False
+    return BenchConfig
+
+
+# --- Dataset -------------------------------------------------------------
+
+def _owner_index(place_index, count):
+    return place_index * 7919 % count
+
+
+def _seed(count, seed):
+    """Insert `count` users, amenities, places and reviews, deterministically for a seed."""
+    rng = random.Random(seed)
+    base = datetime(2024, 1, 1)
+    password = password_hasher.hash(PASSWORD)
+
+    def new_id():
+        return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+    def chunks(make_row):
+        for start in range(0, count, SEED_CHUNK):
+            yield [make_row(i) for i in range(start, min(start + SEED_CHUNK, count))]
+
+    def stamped(row, i):
+        row['created_at'] = row['updated_at'] = base + timedelta(seconds=i)
+        return row
+
+    user_ids = []
+    for rows in chunks(lambda i: stamped({
+            'id': new_id(), 'first_name': f'First{i}', 'last_name': f'Last{i}',
+            'email': f'user{i}@bench.example.com', 'password': password, 'is_admin': i == 0}, i)):
+        facade.user_repo.add_many(rows)
+        user_ids.extend(row['id'] for row in rows)
+
+    amenity_ids = []
+    for rows in chunks(lambda i: stamped({'id': new_id(), 'name': f'Amenity {i}'}, i)):
+        facade.amenity_repo.add_many(rows)
+        amenity_ids.extend(row['id'] for row in rows)
+    popular = amenity_ids[:POPULAR_AMENITIES]
+
+    place_ids = []
+    for rows in chunks(lambda i: stamped({
+            'id': new_id(), 'title': ' '.join(rng.choice(WORDS) for _ in range(3)),
+            'description': ' '.join(rng.choice(WORDS) for _ in range(20)),
+            'price': float(rng.randint(20, 500)), 'latitude': rng.uniform(-85, 85),
+            'longitude': rng.uniform(-180, 180), 'user_id': user_ids[_owner_index(i, count)]}, i)):
+        facade.place_repo.add_many(rows)
+        facade.place_repo.add_amenity_links([{'place_id': row['id'], 'amenity_id': amenity_id}
+                                             for row in rows for amenity_id in rng.sample(popular, 3)])
+        place_ids.extend(row['id'] for row in rows)
+
+    # User i reviews one place, never their own: (user, place) pairs stay unique
+    for start in range(0, count, SEED_CHUNK):
+        rows = []
+        for i in range(start, min(start + SEED_CHUNK, count)):
+            place_index = (i * 31 + 7) % count
+            if _owner_index(place_index, count) == i:
+                continue
+            rows.append(stamped({'id': new_id(), 'text': ' '.join(rng.choice(WORDS) for _ in range(10)),
+                                 'rating': rng.randint(1, 5), 'user_id': user_ids[i],
+                                 'place_id': place_ids[place_index]}, i))
+        facade.review_repo.add_many(rows)
+
+
+def seeded_database(scale, seed, data_dir):
+    """Return the path of the seeded database for scale, seeding it on first use."""
+    path = os.path.join(data_dir, f'hbnb-{scale}-seed{seed}.db')
+    if os.path.exists(path):
+        return path
+    os.makedirs(data_dir, exist_ok=True)
+    partial = path + '.partial'
+    if os.path.exists(partial):
+        os.remove(partial)
+    app = create_app(make_config(partial))
+    start = time.perf_counter()
+    with app.app_context():
+        db.create_all()
+        _seed(scale_rows(scale), seed)
+        db.session.remove()
+        db.engine.dispose()
+    os.replace(partial, path)
+    print(f"seeded {scale} in {time.perf_counter() - start:.1f}s: {path}", file=sys.stderr)
+    return path
+
+
+# --- Scenarios -----------------------------------------------------------
+
+class Context:
+    """Ids sampled from the dataset and tokens shared by the scenarios."""
+
+    def __init__(self, app, sample_size):
+        self.created = {}
+        with app.app_context():
+            def sample(table):
+                # Spread over the whole table, in rowid order so that runs pick the same rows
+                total = db.session.execute(text(f"SELECT max(rowid) FROM {table}")).scalar() or 0
+                step = max(1, total // sample_size)
+                return db.session.execute(text(
+                    f"SELECT id FROM {table} WHERE rowid % :step = 0 ORDER BY rowid LIMIT :size"
+                ), {'step': step, 'size': sample_size}).scalars().all()
+
+            self.users, self.amenities = sample('users'), sample('amenities')
+            self.places, self.reviews = sample('places'), sample('reviews')
+            admin = db.session.execute(text(
+                "SELECT id, email FROM users WHERE is_admin ORDER BY rowid LIMIT 1")).one()
+            self.admin_email = admin.email
+            # Users whose tokens users.revoke_tokens may revoke without failing the other scenarios
+            self.revocable_users = [user_id for user_id in self.users if user_id != admin.id] or self.users
+            # A user without places or reviews, so that it can review any sampled place
+            reviewer = facade.create_user({'first_name': 'Bench', 'last_name': 'Reviewer',
+                                           'email': f'reviewer-{uuid.uuid4().hex}@bench.example.com',
+                                           'password': PASSWORD})
+            self.reviewer_id = reviewer.id
+            self.tokens = {
+                'admin': create_access_token(identity=admin.id, additional_claims={'is_admin': True}),
+                'user': create_access_token(identity=reviewer.id, additional_claims={'is_admin': False}),
+            }
+            db.session.remove()
+        self.app = app
+
+    def fresh_token(self):
+        """A new token of the reviewer, for scenarios that revoke the token they use."""
+        with self.app.app_context():
+            return create_access_token(identity=self.reviewer_id, additional_claims={'is_admin': False})
+
+    def pick(self, ids, i):
+        return ids[i % len(ids)]
+
+
+@dataclass
+class Scenario:
+    name: str
+    method: str
+    # url_map rule, used to check that every route is benchmarked
+    rule: str
+    # make(ctx, i) -> (url, json body or None)
+    make: object
+    # Key of ctx.tokens, or 'fresh' for a new token per request
+    auth: str = None
+    # Upper bound on the number of requests, for routes that hash passwords
+    max_requests: int = None
+
+
+def _place_body(ctx, i):
+    return {'title': f'Bench place {i}', 'description': 'Created by the benchmark', 'price': 100.0,
+            'latitude': 10.0, 'longitude': 10.0, 'amenities': [ctx.pick(ctx.amenities, i)]}
+
+
+SCENARIOS = [
+    Scenario('auth.login', 'POST', '/api/v1/auth/login',
+             lambda ctx, i: ('/api/v1/auth/login', {'email': ctx.admin_email, 'password': PASSWORD}),
+             max_requests=20),
+    Scenario('auth.protected', 'GET', '/api/v1/auth/protected',
+             lambda ctx, i: ('/api/v1/auth/protected', None), auth='user'),
+    Scenario('auth.logout', 'POST', '/api/v1/auth/logout',
+             lambda ctx, i: ('/api/v1/auth/logout', None), auth='fresh'),
+
+    Scenario('users.list', 'GET', '/api/v1/users/', lambda ctx, i: ('/api/v1/users/?limit=20', None),
+             auth='admin'),
+    Scenario('users.create', 'POST', '/api/v1/users/',
+             lambda ctx, i: ('/api/v1/users/', {'first_name': 'New', 'last_name': 'User',
+                                                'email': f'new-{uuid.uuid4().hex}@bench.example.com',
+                                                'password': PASSWORD}),
+             auth='admin', max_requests=20),
+    Scenario('users.get', 'GET', '/api/v1/users/<user_id>',
+             lambda ctx, i: (f'/api/v1/users/{ctx.pick(ctx.users, i)}', None)),
+    Scenario('users.update', 'PUT', '/api/v1/users/<user_id>',
+             lambda ctx, i: (f'/api/v1/users/{ctx.pick(ctx.users, i)}', {'last_name': f'Renamed{i}'}),
+             auth='admin'),
+    Scenario('users.revoke_tokens', 'DELETE', '/api/v1/users/<user_id>/tokens',
+             lambda ctx, i: (f'/api/v1/users/{ctx.pick(ctx.revocable_users, i)}/tokens', None), auth='admin'),
+
+    Scenario('amenities.list', 'GET', '/api/v1/amenities/',
+             lambda ctx, i: ('/api/v1/amenities/?limit=20', None)),
+    Scenario('amenities.create', 'POST', '/api/v1/amenities/',
+             lambda ctx, i: ('/api/v1/amenities/', {'name': f'Bench amenity {i}'}), auth='admin'),
+    Scenario('amenities.get', 'GET', '/api/v1/amenities/<amenity_id>',
+             lambda ctx, i: (f'/api/v1/amenities/{ctx.pick(ctx.amenities, i)}', None)),
+    Scenario('amenities.update', 'PUT', '/api/v1/amenities/<amenity_id>',
+             lambda ctx, i: (f'/api/v1/amenities/{ctx.pick(ctx.amenities, i)}', {'name': f'Renamed {i}'}),
+             auth='admin'),
+
+    Scenario('places.list', 'GET', '/api/v1/places/', lambda ctx, i: ('/api/v1/places/?limit=20', None)),
+    Scenario('places.list_filtered', 'GET', '/api/v1/places/',
+             lambda ctx, i: (f'/api/v1/places/?limit=20&min_price=50&max_price=150&sort=price_asc'
+                             f'&amenities={ctx.pick(ctx.amenities[:POPULAR_AMENITIES], i)}', None)),
+    Scenario('places.create', 'POST', '/api/v1/places/',
+             lambda ctx, i: ('/api/v1/places/', _place_body(ctx, i)), auth='user'),
+    Scenario('places.bulk', 'POST', '/api/v1/places/bulk',
+             lambda ctx, i: ('/api/v1/places/bulk', {'places': [_place_body(ctx, i * 100 + j) for j in range(100)]}),
+             auth='admin'),
+    Scenario('places.search', 'GET', '/api/v1/places/search',
+             lambda ctx, i: (f'/api/v1/places/search?limit=20&q={WORDS[i % len(WORDS)]}+{WORDS[i * 7 % len(WORDS)]}',
+                             None)),
+    Scenario('places.near', 'GET', '/api/v1/places/near',
+             lambda ctx, i: (f'/api/v1/places/near?lat={(i * 37) % 160 - 80}&lon={(i * 53) % 360 - 180}&k=10',
+                             None)),
+    Scenario('places.get', 'GET', '/api/v1/places/<place_id>',
+             lambda ctx, i: (f'/api/v1/places/{ctx.pick(ctx.places, i)}', None)),
+    Scenario('places.update', 'PUT', '/api/v1/places/<place_id>',
+             lambda ctx, i: (f'/api/v1/places/{ctx.pick(ctx.places, i)}', {'price': 100.0 + i}), auth='admin'),
+    Scenario('places.reviews', 'GET', '/api/v1/places/<place_id>/reviews',
+             lambda ctx, i: (f'/api/v1/places/{ctx.pick(ctx.places, i)}/reviews?limit=20', None)),
+
+    Scenario('reviews.list', 'GET', '/api/v1/reviews/', lambda ctx, i: ('/api/v1/reviews/?limit=20', None)),
+    # The reviewer has no review yet: each request reviews another sampled place
+    Scenario('reviews.create', 'POST', '/api/v1/reviews/',
+             lambda ctx, i: ('/api/v1/reviews/', {'text': 'Benchmark review', 'rating': 4,
+                                                  'place_id': ctx.places[i]}), auth='user'),
+    Scenario('reviews.get', 'GET', '/api/v1/reviews/<review_id>',
+             lambda ctx, i: (f'/api/v1/reviews/{ctx.pick(ctx.reviews, i)}', None)),
+    Scenario('reviews.update', 'PUT', '/api/v1/reviews/<review_id>',
+             lambda ctx, i: (f'/api/v1/reviews/{ctx.pick(ctx.reviews, i)}', {'text': f'Edited {i}', 'rating': 3}),
+             auth='admin'),
+    # Deletes the reviews made by reviews.create
+    Scenario('reviews.delete', 'DELETE', '/api/v1/reviews/<review_id>',
+             lambda ctx, i: (f"/api/v1/reviews/{ctx.created['reviews.create'][i]}", None), auth='admin'),
+]
+
+
+def uncovered_routes(app):
+    """Return the (method, rule) pairs of /api/v1 that no scenario exercises."""
+    covered = {(scenario.method, scenario.rule) for scenario in SCENARIOS}
+    missing = []
+    for rule in app.url_map.iter_rules():
+        if not rule.rule.startswith('/api/v1/') or rule.rule == '/api/v1/':
+            continue
+        for method in sorted(rule.methods - {'HEAD', 'OPTIONS'}):
+            if (method, rule.rule) not in covered:
+                missing.append((method, rule.rule))
+    return missing
+
+
+# --- Drivers -------------------------------------------------------------
+
+class TestClientDriver:
+    """Send requests through Flask's test client (no network, no server)."""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, url, body, headers):
+        response = self.client.open(url, method=method, json=body, headers=headers)
+        return response.status_code, response.get_data()
+
+    def close(self):
+        pass
+
+
+class _QuietRequestHandler(WSGIRequestHandler):
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+class HttpDriver:
+    """Send requests over HTTP to a threaded werkzeug server running the app."""
+
+    def __init__(self, app):
+        self.server = make_server('127.0.0.1', 0, app, threaded=True, request_handler=_QuietRequestHandler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def request(self, method, url, body, headers):
+        connection = http.client.HTTPConnection('127.0.0.1', self.server.server_port)
+        try:
+            payload = None
+            if body is not None:
+                payload = json.dumps(body)
+                headers = dict(headers, **{'Content-Type': 'application/json'})
+            connection.request(method, url, body=payload, headers=headers)
+            response = connection.getresponse()
+            return response.status, response.read()
+        finally:
+            connection.close()
+
+    def close(self):
+        self.server.shutdown()
+
+
+# --- Running -------------------------------------------------------------
+
+def _percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def run_scenario(driver, ctx, scenario, requests, queries):
+    count = min(requests, scenario.max_requests or requests)
+    headers = {}
+    if scenario.auth and scenario.auth != 'fresh':
+        headers['Authorization'] = f'Bearer {ctx.tokens[scenario.auth]}'
+    latencies, errors = [], 0
+    queries_before = queries['count']
+    started = time.perf_counter()
+    for i in range(count):
+        url, body = scenario.make(ctx, i)
+        if scenario.auth == 'fresh':
+            headers['Authorization'] = f'Bearer {ctx.fresh_token()}'
+        start = time.perf_counter()
+        status, data = driver.request(scenario.method, url, body, headers)
+        latencies.append((time.perf_counter() - start) * 1000)
+        if status >= 400:
+            errors += 1
+        elif scenario.method == 'POST':
+            created = json.loads(data).get('id')
+            if created:
+                ctx.created.setdefault(scenario.name, []).append(created)
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        'method': scenario.method,
+        'rule': scenario.rule,
+        'requests': count,
+        'errors': errors,
+        'p50_ms': round(_percentile(latencies, 0.50), 3),
+        'p95_ms': round(_percentile(latencies, 0.95), 3),
+        'p99_ms': round(_percentile(latencies, 0.99), 3),
+        'mean_ms': round(statistics.fmean(latencies), 3),
+        'throughput_rps': round(count / elapsed, 1),
+        'queries_per_request': round((queries['count'] - queries_before) / count, 2),
+    }
+
+
+def run(args):
+    seeded = seeded_database(args.scale, args.seed, args.data_dir)
+    workdir = tempfile.mkdtemp()
+    path = os.path.join(workdir, 'bench.db')
+    # Scenarios write to the database: work on a copy so that the seeded one stays pristine
+    shutil.copyfile(seeded, path)
+    app = create_app(make_config(path))
+    missing = uncovered_routes(app)
+    for method, rule in missing:
+        print(f"warning: no scenario for {method} {rule}", file=sys.stderr)
+
+    queries = {'count': 0}
+    lock = threading.Lock()
+    with app.app_context():
+        engine = db.engine
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        with lock:
+            queries['count'] += 1
+
+    ctx = Context(app, max(args.requests, 20))
+    driver = HttpDriver(app) if args.http else TestClientDriver(app)
+    results = {}
+    try:
+        for scenario in SCENARIOS:
+            if args.only and not any(scenario.name.startswith(prefix) for prefix in args.only):
+                continue
+            results[scenario.name] = run_scenario(driver, ctx, scenario, args.requests, queries)
+            result = results[scenario.name]
+            print(f"{scenario.name:<22} p50 {result['p50_ms']:8.2f} ms  p95 {result['p95_ms']:8.2f} ms  "
+                  f"p99 {result['p99_ms']:8.2f} ms  {result['throughput_rps']:8.1f} req/s  "
+                  f"{result['queries_per_request']:5.1f} q/req  {result['errors']} errors", file=sys.stderr)
+    finally:
+        driver.close()
+        with app.app_context():
+            db.engine.dispose()
+        shutil.rmtree(workdir)
+
+    report = {
+        'meta': {
+            'scale': args.scale,
+            'rows': scale_rows(args.scale),
+            'seed': args.seed,
+            'mode': 'http' if args.http else 'test_client',
+            'requests': args.requests,
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'date': datetime.now().isoformat(timespec='seconds'),
+            'uncovered_routes': [f'{method} {rule}' for method, rule in missing],
+        },
+        'scenarios': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"results written to {args.output}", file=sys.stderr)
+    if args.compare:
+        with open(args.compare) as f:
+            return print_comparison(json.load(f), report, args.threshold, args.min_ms)
+    return 0
+
+
+# --- Comparing -----------------------------------------------------------
+
+def compare_reports(baseline, current, threshold=0.2, min_ms=1.0):
+    """Return (name, reasons) for every scenario of current that regressed against baseline.
+
+    A scenario regresses when its p95 grows by more than `threshold` (and by
+    more than `min_ms`, to ignore noise on sub-millisecond routes), when it
+    runs more queries per request, or when it returns more errors.
+    """
+    regressions = []
+    for name, result in current['scenarios'].items():
+        before = baseline['scenarios'].get(name)
+        if before is None:
+            continue
+        reasons = []
+        p95_delta = result['p95_ms'] - before['p95_ms']
+        if p95_delta > min_ms and result['p95_ms'] > before['p95_ms'] * (1 + threshold):
+            reasons.append(f"p95 {before['p95_ms']:.2f} -> {result['p95_ms']:.2f} ms")
+        if result['queries_per_request'] > before['queries_per_request']:
+            reasons.append(f"queries/request {before['queries_per_request']} -> {result['queries_per_request']}")
+        if result['errors'] > before['errors']:
+            reasons.append(f"errors {before['errors']} -> {result['errors']}")
+        if reasons:
+            regressions.append((name, reasons))
+    return regressions
+
+
+def print_comparison(baseline, current, threshold, min_ms):
+    if baseline['meta'].get('rows') != current['meta'].get('rows') or \
+            baseline['meta'].get('mode') != current['meta'].get('mode'):
+        print("warning: comparing runs with a different scale or mode", file=sys.stderr)
+    regressions = compare_reports(baseline, current, threshold, min_ms)
+    for name, reasons in regressions:
+        print(f"REGRESSION {name}: {'; '.join(reasons)}")
+    if not regressions:
+        print(f"no regression over {len(current['scenarios'])} scenarios")
+    return 1 if regressions else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.suite', description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='seed (once) and benchmark every route')
+    run_parser.add_argument('--scale', default='1k', help='1k, 100k, 1m or a number of rows (default: 1k)')
+    run_parser.add_argument('--seed', type=int, default=42)
+    run_parser.add_argument('--requests', type=int, default=200, help='requests per scenario (default: 200)')
+    run_parser.add_argument('--http', action='store_true', help='go through a real HTTP server')
+    run_parser.add_argument('--only', nargs='*', help='run the scenarios whose name starts with these prefixes')
+    run_parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR, help='where seeded databases are kept')
+    run_parser.add_argument('--output', default='benchmark-results.json')
+    run_parser.add_argument('--compare', help='baseline results to compare the run against')
+
+    compare_parser = commands.add_parser('compare', help='compare two results files')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+
+    for command_parser in (run_parser, compare_parser):
+        command_parser.add_argument('--threshold', type=float, default=0.2,
+                                    help='relative p95 increase counted as a regression (default: 0.2)')
+        command_parser.add_argument('--min-ms', type=float, default=1.0,
+                                    help='ignore p95 increases smaller than this (default: 1.0)')
+
+    args = parser.parse_args(argv)
+    if args.command == 'run':
+        return run(args)
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    return print_comparison(baseline, current, args.threshold, args.min_ms)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
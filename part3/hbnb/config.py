@@ -1,18 +1,79 @@
 import os
 
+def env_flag(name, default):
+    return os.getenv(name, default).lower() in ('1', 'true', 'yes')
+
 class Config:
     SECRET_KEY = os.getenv('SECRET_KEY', 'default_secret_key')
     DEBUG = False
+    # In-process read-through cache for get_user/get_amenity/get_place in the facade
+    ENTITY_CACHE_ENABLED = env_flag('ENTITY_CACHE_ENABLED', 'false')
+    ENTITY_CACHE_SIZE = int(os.getenv('ENTITY_CACHE_SIZE', '1024'))
+    ENTITY_CACHE_TTL = int(os.getenv('ENTITY_CACHE_TTL', '300'))
+    # bcrypt cost factor for new hashes; older hashes are upgraded on login
+    BCRYPT_LOG_ROUNDS = int(os.getenv('BCRYPT_LOG_ROUNDS', '12'))
+    # Processes used for password hashing (0 = hash on the request thread)
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', str(os.cpu_count() or 1)))
+    # Seconds a worker may take to enforce a token revoked by another worker process
+    JWT_REVOCATION_REFRESH_SECONDS = int(os.getenv('JWT_REVOCATION_REFRESH_SECONDS', '2'))
+    # Request, SQL and connection pool metrics served at /metrics
+    METRICS_ENABLED = env_flag('METRICS_ENABLED', 'true')
+    # Bearer token a scrape of /metrics must send (unset: no authentication)
+    METRICS_TOKEN = os.getenv('METRICS_TOKEN')
+    # Report repeated (N+1) and slow SQL statements per request; meant for development and canaries
+    QUERY_DETECTOR_ENABLED = env_flag('QUERY_DETECTOR_ENABLED', 'false')
+    QUERY_DETECTOR_REPEAT_THRESHOLD = int(os.getenv('QUERY_DETECTOR_REPEAT_THRESHOLD', '3'))
+    QUERY_DETECTOR_SLOW_MS = int(os.getenv('QUERY_DETECTOR_SLOW_MS', '100'))
+    # JSON lines file the reports are appended to, in addition to the log
+    QUERY_DETECTOR_REPORT = os.getenv('QUERY_DETECTOR_REPORT')
+    QUERY_DETECTOR_STRICT = env_flag('QUERY_DETECTOR_STRICT', 'false')
 
 class DevelopmentConfig(Config):
     DEBUG = True
+    QUERY_DETECTOR_ENABLED = env_flag('QUERY_DETECTOR_ENABLED', 'true')
     SQLALCHEMY_DATABASE_URI = 'sqlite:///development.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
 class TestingConfig(Config):
     TESTING = True
-    
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    BCRYPT_LOG_ROUNDS = 4
+    PASSWORD_HASH_WORKERS = 0
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # A request that runs an N+1 fails the test; slow statements are only reported
+    QUERY_DETECTOR_ENABLED = True
+    QUERY_DETECTOR_STRICT = True
+
+class ProductionConfig(Config):
+    # /metrics exposes routes, latencies and error counts: opt in, ideally with METRICS_TOKEN
+    METRICS_ENABLED = env_flag('METRICS_ENABLED', 'false')
+    SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', 'sqlite:///production.db')
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Set on every new SQLite connection, in this order (ignored on other databases)
+    SQLITE_PRAGMAS = {
+        # Readers see the last commit instead of waiting for the writer
+        'journal_mode': 'WAL',
+        # With WAL, only checkpoints fsync; a power loss can drop the last commits but never corrupts
+        'synchronous': 'NORMAL',
+        # Milliseconds a writer waits for the lock before "database is locked"
+        'busy_timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT', '5000')),
+        'mmap_size': int(os.getenv('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024))),
+        # Negative values are in KiB: 64 MiB of page cache per connection
+        'cache_size': -int(os.getenv('SQLITE_CACHE_SIZE_KIB', '65536')),
+        'foreign_keys': 'ON',
+    }
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': int(os.getenv('DB_POOL_SIZE', '10')),
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', '20')),
+        'pool_timeout': int(os.getenv('DB_POOL_TIMEOUT', '30')),
+        # Seconds after which a connection is replaced (-1 keeps connections forever)
+        'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', '1800')),
+        # Test connections with a cheap query on checkout and reconnect if they went stale
+        'pool_pre_ping': env_flag('DB_POOL_PRE_PING', 'true'),
+    }
+
 config = {
     'development': DevelopmentConfig,
+    'production': ProductionConfig,
     'default': DevelopmentConfig
 }
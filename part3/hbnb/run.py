@@ -1,9 +1,16 @@
+import os
+
 from app import create_app
 from app.models.user import User
 from app.services import facade
 from app.extensions import db
+from app.persistence.fulltext import create_fulltext_index
+from app.persistence.ratings import add_rating_columns
+from app.persistence.review_repository import add_review_unique_index
+from app.persistence.spatial import create_spatial_index
 
-app = create_app()
+# e.g. HBNB_CONFIG=config.ProductionConfig
+app = create_app(os.getenv('HBNB_CONFIG', 'config.DevelopmentConfig'))
 
 
 def init_admin_user():
@@ -15,6 +22,13 @@ def init_admin_user():
 with app.app_context():
     # Ensure all tables exist, then bootstrap the admin user.
     db.create_all()
+    # create_all() skips existing tables, so make sure older databases get the R*Tree,
+    # the full-text index, the rating columns and the one-review-per-place index too
+    with db.engine.begin() as connection:
+        create_spatial_index(connection)
+        create_fulltext_index(connection)
+        add_rating_columns(connection)
+        add_review_unique_index(connection)
     init_admin_user()
 
 
@@ -23,6 +23,9 @@ CREATE TABLE users (
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
 );
 
+-- Index for keyset pagination
+CREATE INDEX idx_users_created_at_id ON users(created_at, id);
+
 -- ============================================
 -- Amenities Table
 -- ============================================
@@ -33,6 +36,9 @@ CREATE TABLE amenities (
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
 );
 
+-- Index for keyset pagination
+CREATE INDEX idx_amenities_created_at_id ON amenities(created_at, id);
+
 -- ============================================
 -- Places Table
 -- ============================================
@@ -44,6 +50,9 @@ CREATE TABLE places (
     latitude FLOAT NOT NULL,
     longitude FLOAT NOT NULL,
     owner_id CHAR(36) NOT NULL,
+    review_count INT NOT NULL DEFAULT 0,
+    rating_sum INT NOT NULL DEFAULT 0,
+    average_rating FLOAT NOT NULL DEFAULT 0,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     CONSTRAINT fk_places_owner FOREIGN KEY (owner_id) REFERENCES users(id) ON DELETE CASCADE
@@ -52,6 +61,17 @@ CREATE TABLE places (
 -- Index for faster lookups by owner
 CREATE INDEX idx_places_owner_id ON places(owner_id);
 
+-- Index for keyset pagination
+CREATE INDEX idx_places_created_at_id ON places(created_at, id);
+
+-- Indexes for price filtering and price/title sorting
+CREATE INDEX idx_places_price_id ON places(price, id);
+CREATE INDEX idx_places_title_id ON places(title, id);
+
+-- Indexes for sorting by rating and by number of reviews
+CREATE INDEX idx_places_average_rating_id ON places(average_rating, id);
+CREATE INDEX idx_places_review_count_id ON places(review_count, id);
+
 -- ============================================
 -- Reviews Table
 -- ============================================
@@ -71,7 +91,8 @@ CREATE TABLE reviews (
 
 -- Indexes for faster lookups
 CREATE INDEX idx_reviews_user_id ON reviews(user_id);
-CREATE INDEX idx_reviews_place_id ON reviews(place_id);
+CREATE INDEX idx_reviews_place_id ON reviews(place_id, created_at, id);
+CREATE INDEX idx_reviews_created_at_id ON reviews(created_at, id);
 
 -- ============================================
 -- Place_Amenity Table (Many-to-Many)
@@ -83,3 +104,22 @@ CREATE TABLE place_amenity (
     CONSTRAINT fk_place_amenity_place FOREIGN KEY (place_id) REFERENCES places(id) ON DELETE CASCADE,
     CONSTRAINT fk_place_amenity_amenity FOREIGN KEY (amenity_id) REFERENCES amenities(id) ON DELETE CASCADE
 );
+
+-- Index for amenity filtering (the primary key only covers place_id first)
+CREATE INDEX idx_place_amenity_amenity_id ON place_amenity(amenity_id);
+
+-- ============================================
+-- Token_Revocations Table
+-- ============================================
+-- A revoked token (jti set) or every token of a user issued up to revoked_at (jti NULL);
+-- times are epoch seconds, like the JWT iat and exp claims
+CREATE TABLE token_revocations (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    jti CHAR(36),
+    user_id CHAR(36) NOT NULL,
+    revoked_at INTEGER NOT NULL,
+    expires_at INTEGER
+);
+
+CREATE INDEX idx_token_revocations_revoked_at ON token_revocations(revoked_at);
+CREATE INDEX idx_token_revocations_expires_at ON token_revocations(expires_at);
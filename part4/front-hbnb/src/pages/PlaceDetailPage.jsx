@@ -28,14 +28,25 @@ export default function PlaceDetailPage() {
   const [submitting, setSubmitting] = useState(false);
   const [deleting, setDeleting] = useState(false);
 
+  // Follow next_cursor until every review of this place is loaded
+  const fetchPlaceReviews = async () => {
+    const all = [];
+    let cursor = null;
+    do {
+      const res = await api.get(`/places/${id}/reviews`, { params: { limit: 100, cursor: cursor || undefined } });
+      all.push(...res.data.reviews);
+      cursor = res.data.next_cursor;
+    } while (cursor);
+    return all;
+  };
+
   const fetchData = async () => {
     try {
-      const [placeRes, reviewsRes] = await Promise.all([
+      const [placeRes, placeReviews] = await Promise.all([
         api.get(`/places/${id}`),
-        api.get('/reviews'),
+        fetchPlaceReviews(),
       ]);
       setPlace(placeRes.data);
-      const placeReviews = reviewsRes.data.filter((r) => r.place_id === id);
       setReviews(placeReviews);
     } catch {
       toast.error('Logement introuvable');
@@ -12,6 +12,8 @@ const SORT_OPTIONS = [
   { value: 'price_asc', label: 'Prix croissant' },
   { value: 'price_desc', label: 'Prix décroissant' },
   { value: 'title', label: 'Alphabétique' },
+  { value: 'rating_desc', label: 'Mieux notés' },
+  { value: 'reviews_desc', label: "Plus d'avis" },
 ];
 
 export default function PlacesPage() {
@@ -30,32 +32,31 @@ export default function PlacesPage() {
   const [filterOpen, setFilterOpen] = useState(false);
 
   useEffect(() => {
-    Promise.all([
-      api.get('/places'),
-      api.get('/amenities'),
-    ]).then(([placesRes, amenitiesRes]) => {
-      setPlaces(placesRes.data);
-      setAmenities(amenitiesRes.data?.amenities || amenitiesRes.data || []);
-    }).catch(() => {}).finally(() => setLoading(false));
+    api.get('/amenities')
+      .then((res) => setAmenities(res.data?.amenities || res.data || []))
+      .catch(() => {});
   }, []);
 
-  const filtered = places
-    .filter((p) => {
-      if (search && !p.title.toLowerCase().includes(search.toLowerCase()) && !p.description?.toLowerCase().includes(search.toLowerCase())) return false;
-      if (minPrice && p.price < parseFloat(minPrice)) return false;
-      if (maxPrice && p.price > parseFloat(maxPrice)) return false;
-      if (selectedAmenities.length > 0) {
-        const placeAmenityIds = (p.amenities || []).map((a) => a.id);
-        if (!selectedAmenities.every((id) => placeAmenityIds.includes(id))) return false;
-      }
-      return true;
-    })
-    .sort((a, b) => {
-      if (sort === 'price_asc') return a.price - b.price;
-      if (sort === 'price_desc') return b.price - a.price;
-      if (sort === 'title') return a.title.localeCompare(b.title);
-      return 0;
-    });
+  // Filtering and sorting run on the server; refetch when a filter changes
+  useEffect(() => {
+    const params = {};
+    if (search) params.q = search;
+    if (minPrice) params.min_price = minPrice;
+    if (maxPrice) params.max_price = maxPrice;
+    if (selectedAmenities.length > 0) params.amenities = selectedAmenities.join(',');
+    if (sort !== 'default') params.sort = sort;
+
+    let cancelled = false;
+    const timer = setTimeout(() => {
+      api.get('/places', { params })
+        .then((res) => { if (!cancelled) setPlaces(res.data); })
+        .catch(() => {})
+        .finally(() => { if (!cancelled) setLoading(false); });
+    }, 250);
+    return () => { cancelled = true; clearTimeout(timer); };
+  }, [search, minPrice, maxPrice, selectedAmenities, sort]);
+
+  const filtered = places;
 
   const toggleAmenity = (id) => {
     setSelectedAmenities((prev) =>